@@ -0,0 +1,79 @@
+# File: bench_batch_totals.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_batch_totals.py
+
+"""
+Benchmark for CalculationEngine.calculate_batch_totals()
+Prices random invoices one at a time with calculate_invoice_totals(), then in
+one batch on the pure-Python and NumPy paths, and checks the three agree.
+
+Usage: python benchmarks/bench_batch_totals.py [--invoices N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.calculations import CalculationEngine, _load_numpy
+
+def random_invoices(count: int, seed: int = 7):
+    """Column-wise line items for count invoices of 0-12 items, with per-invoice tax rates"""
+    rng = random.Random(seed)
+    quantities, rates_cents, offsets, tax_rates = [], [], [0], []
+    for _ in range(count):
+        for _ in range(rng.randint(0, 12)):
+            quantities.append(round(rng.uniform(0.25, 40), rng.randint(0, 2)))
+            rates_cents.append(rng.randint(100, 250000))
+        offsets.append(len(quantities))
+        tax_rates.append(rng.choice([0.0, 0.05, 0.0825, 0.2]))
+    return quantities, rates_cents, offsets, tax_rates
+
+def scalar_totals(quantities, rates_cents, offsets, tax_rates):
+    """Per-invoice totals, the way invoices were priced before the batch API"""
+    totals = []
+    for n, tax_rate in enumerate(tax_rates):
+        items = [{'quantity': quantities[i], 'rate_cents': rates_cents[i]}
+                 for i in range(offsets[n], offsets[n + 1])]
+        totals.append(CalculationEngine.calculate_invoice_totals(items, tax_rate)['total_cents'])
+    return totals
+
+def best_time(function, repeat: int):
+    """Fastest of repeat runs in milliseconds, and the last result"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=100000, help="invoices per run (default 100000)")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per variant; the best is reported")
+    args = parser.parse_args()
+    
+    invoices = random_invoices(args.invoices)
+    print(f"{args.invoices} invoices, {len(invoices[0])} line items, best of {args.repeat}")
+    
+    scalar_ms, expected = best_time(lambda: scalar_totals(*invoices), args.repeat)
+    print(f"  per-invoice scalar  {scalar_ms:8.1f} ms")
+    
+    python_ms, totals = best_time(
+        lambda: CalculationEngine.calculate_batch_totals(*invoices, use_numpy=False), args.repeat)
+    assert totals['total_cents'] == expected, "pure-Python batch disagrees with the scalar totals"
+    print(f"  batch, pure Python  {python_ms:8.1f} ms  ({scalar_ms / python_ms:.1f}x)")
+    
+    if _load_numpy() is None:
+        print("  batch, NumPy        skipped (NumPy is not installed)")
+        return
+    numpy_ms, totals = best_time(
+        lambda: CalculationEngine.calculate_batch_totals(*invoices, use_numpy=True), args.repeat)
+    assert totals['total_cents'] == expected, "NumPy batch disagrees with the scalar totals"
+    print(f"  batch, NumPy        {numpy_ms:8.1f} ms  ({scalar_ms / numpy_ms:.1f}x)")
+
+if __name__ == "__main__":
+    main()
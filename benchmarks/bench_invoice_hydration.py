@@ -0,0 +1,76 @@
+# File: bench_invoice_hydration.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_invoice_hydration.py
+
+"""
+Benchmark for get_all_invoices() hydrating clients from one JOIN
+Compares it with the older approach of reading the invoices and then calling
+get_client() for each one, at several database sizes, and checks both attach
+the same clients. get_client() reuses the thread's pooled connection, so the
+gap is smaller than it was when every lookup opened a new connection.
+
+Usage: python benchmarks/bench_invoice_hydration.py [--sizes 1000,10000,100000] [--clients N] [--repeat N]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.models import LazyInvoice
+from sample_data import populate
+
+def per_invoice_lookup(db: DatabaseManager) -> list:
+    """(invoice id, client) pairs the way list queries built them before the JOIN"""
+    with db.get_connection() as conn:
+        cursor = conn.execute("SELECT * FROM invoices ORDER BY created_date DESC")
+        read_invoice = LazyInvoice.row_reader([description[0] for description in cursor.description])
+        invoices = [read_invoice(row) for row in cursor]
+    for invoice in invoices:
+        invoice.client = db.get_client(invoice.client_id)
+    return [(invoice.id, invoice.client) for invoice in invoices]
+
+def joined(db: DatabaseManager) -> list:
+    """(invoice id, client) pairs from get_all_invoices()"""
+    return [(invoice.id, invoice.client) for invoice in db.get_all_invoices()]
+
+def best_ms(function, repeat: int):
+    """Fastest of repeat runs in milliseconds, and the last result"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help="comma-separated invoice counts")
+    parser.add_argument('--clients', type=int, default=200, help="clients the invoices are spread over (default 200)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per variant; the best is reported")
+    args = parser.parse_args()
+    
+    print(f"{args.clients} clients, one line item per invoice, best of {args.repeat}")
+    for size in (int(count) for count in args.sizes.split(',')):
+        work_dir = tempfile.mkdtemp(prefix="hydration_bench_")
+        try:
+            db = DatabaseManager(os.path.join(work_dir, "bench.db"))
+            populate(db, args.clients, size)
+            
+            lookup_ms, expected = best_ms(lambda: per_invoice_lookup(db), args.repeat)
+            joined_ms, result = best_ms(lambda: joined(db), args.repeat)
+            if sorted(result, key=lambda pair: pair[0]) != sorted(expected, key=lambda pair: pair[0]):
+                raise SystemExit("get_all_invoices() attached different clients")
+            print(f"  {size:>7,} invoices: get_client() per invoice {lookup_ms:8.0f} ms, "
+                  f"JOIN {joined_ms:8.0f} ms ({lookup_ms / joined_ms:.1f}x)")
+            db.close()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# File: bench_invoice_numbers.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_invoice_numbers.py
+
+"""
+Benchmark for invoice number allocation under parallel load
+Several processes save new invoices into one throwaway database, each
+numbered by save_invoice(), then reserve numbers in blocks with
+allocate_invoice_numbers(). Every run checks that no number was issued twice.
+
+Usage: python benchmarks/bench_invoice_numbers.py [--processes N] [--invoices N] [--numbers N] [--blocks 1,100]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.models import Client, Invoice, InvoiceItem
+
+def save_invoices(db_path: str, client_id: int, count: int) -> list:
+    """Save count new invoices in this process; returns their numbers"""
+    db = DatabaseManager(db_path)
+    try:
+        numbers = []
+        for _ in range(count):
+            invoice = Invoice(client_id=client_id, items=[InvoiceItem(description="Consulting", rate_cents=12500)])
+            numbers.append(db.save_invoice(invoice).invoice_number)
+        return numbers
+    finally:
+        db.close()
+
+def allocate_numbers(db_path: str, count: int, block: int) -> list:
+    """Reserve count numbers block at a time in this process; returns them"""
+    db = DatabaseManager(db_path)
+    try:
+        numbers = []
+        while len(numbers) < count:
+            numbers.extend(db.allocate_invoice_numbers(min(block, count - len(numbers))))
+        return numbers
+    finally:
+        db.close()
+
+def run_parallel(function, processes: int, *args):
+    """Run function(*args) in each of processes worker processes; returns (seconds, all numbers)"""
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(function, *args) for _ in range(processes)]
+        numbers = [number for future in futures for number in future.result()]
+        return time.perf_counter() - start, numbers
+
+def check_distinct(numbers: list, label: str):
+    """Exit with an error if any number was issued more than once"""
+    duplicates = len(numbers) - len(set(numbers))
+    if duplicates:
+        raise SystemExit(f"{label}: {duplicates} invoice numbers were issued twice")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4, help="writer processes (default 4)")
+    parser.add_argument('--invoices', type=int, default=300, help="invoices saved per process (default 300)")
+    parser.add_argument('--numbers', type=int, default=1000, help="numbers reserved per process (default 1000)")
+    parser.add_argument('--blocks', default='1,100', help="comma-separated block sizes (default 1,100)")
+    args = parser.parse_args()
+    
+    work_dir = tempfile.mkdtemp(prefix="invoice_numbers_bench_")
+    try:
+        db_path = os.path.join(work_dir, "bench.db")
+        db = DatabaseManager(db_path)
+        client_id = db.save_client(Client(name="Benchmark Client")).id
+        db.close()
+        print(f"{args.processes} processes, {os.cpu_count()} CPUs")
+        
+        elapsed, numbers = run_parallel(save_invoices, args.processes, db_path, client_id, args.invoices)
+        check_distinct(numbers, "save_invoice")
+        print(f"  save_invoice, {args.invoices} each          {len(numbers) / elapsed:9,.0f} invoices/s, "
+              f"all {len(numbers)} distinct")
+        
+        issued = numbers
+        for block in (int(size) for size in args.blocks.split(',')):
+            elapsed, numbers = run_parallel(allocate_numbers, args.processes, db_path, args.numbers, block)
+            issued += numbers
+            check_distinct(issued, f"allocate_invoice_numbers, block={block}")
+            print(f"  allocate_invoice_numbers, block={block:<4} {len(numbers) / elapsed:9,.0f} numbers/s, "
+                  f"all {len(issued)} issued so far distinct")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# File: bench_model_memory.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_model_memory.py
+
+"""
+Benchmark for the memory and time of hydrating invoices into slotted models
+Loads every invoice of a throwaway database through get_all_invoices() under
+tracemalloc and reports the time, retained and peak memory. Also compares
+instance sizes of the slotted models with plain (__dict__) dataclasses of the
+same fields.
+
+Usage: python benchmarks/bench_model_memory.py [--invoices N] [--clients N] [--repeat N]
+"""
+
+import argparse
+import dataclasses
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.models import Client, Invoice, InvoiceItem
+from sample_data import populate
+
+def instance_bytes(obj) -> int:
+    """Size of an instance plus its __dict__, if it has one"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def unslotted(cls):
+    """A dataclass with cls's fields but an ordinary __dict__"""
+    return dataclasses.make_dataclass(f"Plain{cls.__name__}", [
+        (f.name, f.type, dataclasses.field(default=None)) for f in dataclasses.fields(cls)
+    ])
+
+def measure_load(db: DatabaseManager):
+    """(ms, retained bytes, peak bytes) for loading every invoice"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    invoices = db.get_all_invoices()
+    elapsed = (time.perf_counter() - start) * 1000
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del invoices
+    return elapsed, retained, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=100000, help="invoices to load (default 100000)")
+    parser.add_argument('--clients', type=int, default=500, help="clients the invoices are spread over (default 500)")
+    parser.add_argument('--repeat', type=int, default=3, help="loads; the fastest is reported")
+    args = parser.parse_args()
+    
+    print("Instance size, slotted vs __dict__ dataclass of the same fields:")
+    for cls in (Client, InvoiceItem, Invoice):
+        fields = {f.name: None for f in dataclasses.fields(cls)}
+        slotted = cls.__new__(cls)
+        plain = unslotted(cls)(**fields)
+        print(f"  {cls.__name__:<12} {instance_bytes(slotted):4d} B vs {instance_bytes(plain):4d} B")
+    
+    work_dir = tempfile.mkdtemp(prefix="model_memory_bench_")
+    try:
+        db = DatabaseManager(os.path.join(work_dir, "bench.db"))
+        populate(db, args.clients, args.invoices)
+        
+        runs = [measure_load(db) for _ in range(args.repeat)]
+        elapsed, retained, peak = min(runs)
+        print(f"get_all_invoices(), {args.invoices:,} invoices, {args.clients} clients, best of {args.repeat}:")
+        print(f"  {elapsed:.0f} ms, {retained / 1e6:.1f} MB retained, {peak / 1e6:.1f} MB peak")
+        db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
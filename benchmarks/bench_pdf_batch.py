@@ -0,0 +1,97 @@
+# File: bench_pdf_batch.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_pdf_batch.py
+
+"""
+Benchmark for generate_invoices_batch() scaling with worker processes
+Renders the same invoices with a serial loop, then as a batch with 1, 2, 4...
+workers up to the CPU count, into a throwaway database and output folder.
+The PDF cache is turned off so every run renders.
+
+Usage: python benchmarks/bench_pdf_batch.py [--invoices N] [--items N] [--workers 1,2,4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.db_manager import DatabaseManager
+from database.models import Client, Invoice, InvoiceItem
+from pdf_generator import invoice_pdf
+from pdf_generator.batch import generate_invoices_batch
+
+def create_invoices(db: DatabaseManager, count: int, item_count: int) -> list:
+    """Save count invoices of item_count items each; returns their ids"""
+    client = db.save_client(Client(name="Benchmark Client", email="billing@example.com",
+                                   address="1 Main Street", city="Springfield", state="IL"))
+    ids = []
+    for n in range(count):
+        invoice = Invoice(client_id=client.id, client=client, tax_rate=0.0875,
+                          company_name="Your Business Name", notes="Thank you for your business.")
+        for i in range(item_count):
+            invoice.add_item(InvoiceItem(description=f"Consulting services, phase {i + 1}",
+                                         quantity=1 + (n + i) % 10, rate_cents=12500 + 100 * i))
+        ids.append(db.save_invoice(invoice).id)
+    return ids
+
+def default_workers() -> list:
+    """1, 2, 4... up to and including the CPU count"""
+    cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 < cpus:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cpus:
+        workers.append(cpus)
+    return workers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--invoices', type=int, default=96, help="invoices per run (default 96)")
+    parser.add_argument('--items', type=int, default=5, help="line items per invoice (default 5)")
+    parser.add_argument('--workers', help="comma-separated worker counts (default 1, 2, 4... up to the CPU count)")
+    args = parser.parse_args()
+    workers = [int(count) for count in args.workers.split(',')] if args.workers else default_workers()
+    
+    # Workers must inherit the disabled cache, so they are forked where possible
+    if 'fork' in multiprocessing.get_all_start_methods():
+        multiprocessing.set_start_method('fork')
+    else:
+        print("Note: workers are not forked here, so batch runs may be served from the PDF cache")
+    invoice_pdf.PDF_CACHE_ENABLED = False
+    
+    work_dir = tempfile.mkdtemp(prefix="pdf_batch_bench_")
+    try:
+        db_path = os.path.join(work_dir, "bench.db")
+        db = DatabaseManager(db_path)
+        ids = create_invoices(db, args.invoices, args.items)
+        print(f"{len(ids)} invoices of {args.items} items, {os.cpu_count()} CPUs")
+        
+        invoices = db.get_invoices_by_ids(ids)
+        output_dir = os.path.join(work_dir, "serial")
+        os.makedirs(output_dir)
+        start = time.perf_counter()
+        for invoice in invoices:
+            invoice_pdf.generate_invoice_pdf(invoice, os.path.join(output_dir, f"{invoice.id}.pdf"))
+        serial = time.perf_counter() - start
+        print(f"  serial loop        {serial:7.2f} s")
+        db.close()
+        
+        for count in workers:
+            start = time.perf_counter()
+            result = generate_invoices_batch(ids, output_dir=os.path.join(work_dir, f"batch_{count}"),
+                                             db_path=db_path, max_workers=count)
+            elapsed = time.perf_counter() - start
+            if result.failed:
+                raise SystemExit(f"{len(result.failed)} invoices failed, e.g. {result.failed[0]}")
+            print(f"  batch, {count:2d} worker{'s' if count > 1 else ' '} {elapsed:7.2f} s  "
+                  f"({serial / elapsed:.2f}x serial)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
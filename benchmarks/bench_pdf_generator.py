@@ -0,0 +1,86 @@
+# File: bench_pdf_generator.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_pdf_generator.py
+
+"""
+Benchmark for the per-invoice setup cost of InvoicePDFGenerator
+Times building a generator (styles and logo), then rendering with a new
+generator per invoice, as generate_invoice_pdf() used to, against rendering
+through the shared instance from get_pdf_generator(). Renders are in memory
+and skip the PDF cache.
+
+Usage: python benchmarks/bench_pdf_generator.py [--runs N] [--items N] [--logo PATH | --no-logo]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.models import Client, Invoice, InvoiceItem
+from pdf_generator import invoice_pdf
+
+def sample_invoice(item_count: int) -> Invoice:
+    """An unsaved invoice with a client and item_count line items"""
+    client = Client(name="Benchmark Client", email="billing@example.com", address="1 Main Street",
+                    city="Springfield", state="IL", zip_code="62701")
+    invoice = Invoice(invoice_number="INV-0001", client=client, tax_rate=0.0875,
+                      company_name="Your Business Name", company_address="123 Your Street",
+                      notes="Thank you for your business.")
+    for i in range(item_count):
+        invoice.add_item(InvoiceItem(description=f"Consulting services, phase {i + 1}",
+                                     quantity=i + 1, rate_cents=12500 + 100 * i))
+    return invoice
+
+def make_logo(directory: str) -> str:
+    """Write a 600x300 PNG logo; returns its path"""
+    from PIL import Image
+    
+    path = os.path.join(directory, "logo.png")
+    Image.new("RGB", (600, 300), (32, 96, 160)).save(path)
+    return path
+
+def mean_ms(function, runs: int) -> float:
+    """Mean time of runs calls in milliseconds, after one warm-up call"""
+    function()
+    start = time.perf_counter()
+    for _ in range(runs):
+        function()
+    return (time.perf_counter() - start) * 1000 / runs
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=200, help="renders per variant (default 200)")
+    parser.add_argument('--items', type=int, default=5, help="line items on the invoice (default 5)")
+    parser.add_argument('--logo', help="logo image to use (default: a generated 600x300 PNG)")
+    parser.add_argument('--no-logo', action='store_true', help="render without a logo")
+    args = parser.parse_args()
+    
+    work_dir = tempfile.mkdtemp(prefix="pdf_generator_bench_")
+    try:
+        if args.no_logo:
+            invoice_pdf.DEFAULT_LOGO_PATH = os.path.join(work_dir, "missing.png")
+        else:
+            invoice_pdf.DEFAULT_LOGO_PATH = args.logo or make_logo(work_dir)
+        
+        invoice = sample_invoice(args.items)
+        shared = invoice_pdf.get_pdf_generator()
+        if shared.render_invoice_pdf(invoice) != invoice_pdf.InvoicePDFGenerator().render_invoice_pdf(invoice):
+            raise SystemExit("A new generator and the shared one render different PDFs")
+        
+        logo = "no logo" if args.no_logo else os.path.basename(invoice_pdf.DEFAULT_LOGO_PATH)
+        print(f"{args.items}-item invoice, {logo}, mean of {args.runs} runs")
+        construct = mean_ms(invoice_pdf.InvoicePDFGenerator, args.runs)
+        print(f"  InvoicePDFGenerator()           {construct:7.2f} ms")
+        fresh = mean_ms(lambda: invoice_pdf.InvoicePDFGenerator().render_invoice_pdf(invoice), args.runs)
+        print(f"  render, new generator each time {fresh:7.2f} ms")
+        reused = mean_ms(lambda: shared.render_invoice_pdf(invoice), args.runs)
+        print(f"  render, shared generator        {reused:7.2f} ms  ({fresh - reused:.2f} ms saved per invoice)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
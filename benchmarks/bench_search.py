@@ -0,0 +1,84 @@
+# File: bench_search.py
+# Location: InvoiceGeneratorPro/benchmarks/bench_search.py
+
+"""
+Benchmark for full-text client search against the LIKE scan it replaced
+Fills a throwaway database, then times the old LIKE '%term%' query on name
+and email, the FTS5 search_clients() and search_clients_with_stats() over the
+same random prefixes of name words, and typing a word one keystroke at a time.
+
+Usage: python benchmarks/bench_search.py [--clients N] [--invoices N] [--queries N]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SEARCH_RESULT_LIMIT
+from database.db_manager import DatabaseManager
+from database.models import Client
+from sample_data import company_word, populate
+
+def like_search(db: DatabaseManager, term: str, limit=None) -> list:
+    """search_clients() as it was: a LIKE scan over name and email"""
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        pattern = f"%{term}%"
+        cursor.execute("SELECT * FROM clients WHERE name LIKE ? OR email LIKE ? ORDER BY name LIMIT ?",
+                       (pattern, pattern, -1 if limit is None else limit))
+        return [Client.from_row(row) for row in cursor.fetchall()]
+
+def mean_ms(search, terms: list) -> float:
+    """Mean time per search over terms in milliseconds"""
+    start = time.perf_counter()
+    for term in terms:
+        search(term)
+    return (time.perf_counter() - start) * 1000 / len(terms)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=100000, help="clients in the database (default 100000)")
+    parser.add_argument('--invoices', type=int, default=20000, help="invoices in the database (default 20000)")
+    parser.add_argument('--queries', type=int, default=50, help="random terms per variant (default 50)")
+    args = parser.parse_args()
+    
+    # What users type: the start of a word in a client's name
+    rng = random.Random(3)
+    terms = [company_word(rng).lower()[:rng.randint(2, 6)] for _ in range(args.queries)]
+    word = company_word(rng).lower()
+    keystrokes = [word[:length] for length in range(1, len(word) + 1)]
+    
+    work_dir = tempfile.mkdtemp(prefix="search_bench_")
+    try:
+        db = DatabaseManager(os.path.join(work_dir, "bench.db"))
+        start = time.perf_counter()
+        populate(db, args.clients, args.invoices)
+        print(f"{args.clients:,} clients, {args.invoices:,} invoices (filled in {time.perf_counter() - start:.1f} s), "
+              f"{args.queries} random 2-6 letter prefixes")
+        
+        variants = [
+            ("LIKE scan (old search_clients)", lambda term: like_search(db, term)),
+            (f"LIKE scan, LIMIT {SEARCH_RESULT_LIMIT}", lambda term: like_search(db, term, SEARCH_RESULT_LIMIT)),
+            ("FTS search_clients()", db.search_clients),
+            (f"FTS search_clients(limit={SEARCH_RESULT_LIMIT})",
+             lambda term: db.search_clients(term, SEARCH_RESULT_LIMIT)),
+            ("FTS search_clients_with_stats()", db.search_clients_with_stats),
+        ]
+        for label, search in variants:
+            print(f"  {label:<34} {mean_ms(search, terms):8.2f} ms/query")
+        
+        print(f"  typing '{keystrokes[-1]}' one keystroke at a time: "
+              f"LIKE {mean_ms(lambda term: like_search(db, term, SEARCH_RESULT_LIMIT), keystrokes) * len(keystrokes):.0f} ms, "
+              f"FTS {mean_ms(db.search_clients_with_stats, keystrokes) * len(keystrokes):.0f} ms")
+        db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
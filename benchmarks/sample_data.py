@@ -0,0 +1,86 @@
+# File: sample_data.py
+# Location: InvoiceGeneratorPro/benchmarks/sample_data.py
+
+"""
+Synthetic clients and invoices for the benchmark scripts
+Rows go in through DatabaseManager's bulk import methods, so the triggers and
+indexes are exercised the same way as in a real import.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+CITIES = ["Springfield", "Riverside", "Franklin", "Greenville", "Bristol", "Clinton", "Fairview", "Salem"]
+WORDS = ["design", "hosting", "consulting", "support", "audit", "training", "license", "research",
+         "migration", "review", "setup", "maintenance", "analysis", "workshop", "report", "integration"]
+STATUSES = ["Draft", "Sent", "Paid", "Paid", "Paid", "Overdue"]
+SYLLABLES = ["ka", "lo", "mi", "ter", "vand", "or", "pel", "zu", "bri", "sto", "nax", "qui", "dra", "fen",
+             "gol", "har", "is", "jor", "wex", "yel"]
+
+def company_word(rng: random.Random) -> str:
+    """A made-up, capitalized word of two to four syllables"""
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+def client_rows(count: int, first: int = 0, seed: int = 1) -> list:
+    """count client dicts, numbered from first so names stay distinct, for DatabaseManager.import_clients()"""
+    rng = random.Random(seed + first)
+    rows = []
+    for n in range(first, first + count):
+        first_word, second_word = company_word(rng), company_word(rng)
+        rows.append({
+            'name': f"{first_word} {second_word} {n:06d}",
+            'email': f"billing{n}@{first_word.lower()}.example.com",
+            'phone': f"(555) {rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            'address': f"{rng.randint(1, 999)} Main Street",
+            'city': rng.choice(CITIES),
+            'state': "IL",
+            'zip_code': f"{rng.randint(10000, 99999)}",
+            'country': "USA",
+            'notes': " ".join(rng.choice(WORDS) for _ in range(4)),
+        })
+    return rows
+
+def invoice_rows(count: int, client_ids: list, items_per_invoice: int = 1, seed: int = 1) -> list:
+    """count invoice dicts with line items and totals, for DatabaseManager.import_invoices()"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    rows = []
+    for _ in range(count):
+        invoice_date = start + timedelta(days=rng.randint(0, 700), seconds=rng.randint(0, 86399))
+        items = []
+        for _ in range(items_per_invoice):
+            quantity, rate_cents = rng.randint(1, 20), rng.randint(1000, 50000)
+            items.append((f"{rng.choice(WORDS).title()} {rng.choice(WORDS)}", quantity, rate_cents,
+                          quantity * rate_cents))
+        subtotal_cents = sum(item[3] for item in items)
+        tax_amount_cents = round(subtotal_cents * 0.0875)
+        rows.append({
+            'client_id': rng.choice(client_ids),
+            'invoice_date': invoice_date.isoformat(),
+            'due_date': (invoice_date + timedelta(days=30)).isoformat(),
+            'status': rng.choice(STATUSES),
+            'subtotal_cents': subtotal_cents,
+            'tax_rate': 0.0875,
+            'tax_amount_cents': tax_amount_cents,
+            'total_cents': subtotal_cents + tax_amount_cents,
+            'notes': " ".join(rng.choice(WORDS) for _ in range(3)),
+            'payment_terms': "Net 30",
+            'currency': "USD",
+            'created_date': invoice_date.isoformat(),
+            'updated_date': invoice_date.isoformat(),
+            'items': items,
+        })
+    return rows
+
+def populate(db, clients: int, invoices: int, items_per_invoice: int = 1,
+             batch_size: int = 10000, seed: int = 1) -> list:
+    """Fill an empty database with clients and invoices; returns the client ids"""
+    for first in range(0, clients, batch_size):
+        db.import_clients(client_rows(min(batch_size, clients - first), first, seed))
+    with db.get_connection() as conn:
+        client_ids = [row[0] for row in conn.execute("SELECT id FROM clients ORDER BY id")]
+    
+    for first in range(0, invoices, batch_size):
+        db.import_invoices(invoice_rows(min(batch_size, invoices - first), client_ids,
+                                        items_per_invoice, seed + first))
+    return client_ids
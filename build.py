@@ -30,9 +30,14 @@ def clean_previous_builds():
         print(f"   ✓ Removed {spec_file}")
 
 def check_dependencies():
-    """Check if PyInstaller is available"""
+    """Check the Python version and that PyInstaller is available"""
     print("📦 Checking build dependencies...")
     
+    # The models are slotted dataclasses, which need Python 3.10
+    if sys.version_info < (3, 10):
+        print(f"   ❌ Python 3.10 or later required, found {sys.version.split()[0]}")
+        return False
+    
     try:
         subprocess.run(['pyinstaller', '--version'], capture_output=True, check=True)
         print("   ✓ PyInstaller found")
@@ -0,0 +1,467 @@
+# File: bulk_import.py
+# Location: InvoiceGeneratorPro/database/bulk_import.py
+
+"""
+Bulk import of clients and invoices from CSV or JSON Lines files.
+
+Records are read as a stream, validated in worker processes with the same
+FormValidator / ValidationEngine rules the forms use, and written with
+executemany in one transaction per batch. Rejected records are written to an
+error report instead of stopping the import.
+
+Command line:
+    python -m database.bulk_import clients clients.csv
+    python -m database.bulk_import invoices invoices.jsonl --report errors.csv
+
+Client records use the clients table field names (name, email, phone, address,
+city, state, zip_code, country, notes). Invoice records use invoice_number
+(optional - numbered from settings when blank), client (name) or client_id,
+invoice_date, due_date, status, payment_terms, currency, tax_rate (0.08 or
+"8%"), notes, company_* fields and either items (a JSON list of objects with
+description, quantity and rate) or single description/quantity/rate fields.
+Missing values fall back to the application settings.
+"""
+
+import argparse
+import csv
+import gzip
+import json
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .db_manager import DatabaseManager, IMPORT_CLIENT_COLUMNS
+from utils.validators import FormValidator
+from utils.calculations import CalculationEngine, CurrencyFormatter, DateCalculator, ValidationEngine, to_cents
+from config import DATABASE_PATH, IMPORT_BATCH_SIZE, IMPORT_VALIDATION_CHUNK_SIZE
+
+IMPORT_KINDS = ('clients', 'invoices')
+
+ERROR_REPORT_HEADER = ['line', 'errors', 'record']
+
+# Alternative column names accepted in input files, e.g. our own CSV export headers
+FIELD_ALIASES = {
+    'zip': 'zip_code',
+    'client_name': 'client',
+    'date': 'invoice_date',
+    'number': 'invoice_number',
+}
+
+COMPANY_FIELDS = ('company_name', 'company_address', 'company_phone', 'company_email', 'company_website')
+
+# progress(label, records_processed, total_records) - total is None when unknown
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+
+@dataclass
+class ImportResult:
+    """Outcome of a bulk import"""
+    kind: str
+    imported: int = 0
+    rejected: int = 0
+    report_path: Optional[str] = None  # Set only when something was rejected
+    
+    @property
+    def processed(self) -> int:
+        """Number of records read"""
+        return self.imported + self.rejected
+
+# ---------------------------------------------------------------------------
+# Reading
+
+def read_records(path: str) -> Iterator[Tuple[int, dict]]:
+    """Stream (line number, record) pairs from a CSV or JSON Lines file
+    
+    The format follows the extension (.csv, .jsonl/.ndjson, optionally .gz).
+    A JSON line that does not parse yields a record holding only '_error'.
+    """
+    base, extension = os.path.splitext(path.lower())
+    compressed = extension == '.gz'
+    if compressed:
+        extension = os.path.splitext(base)[1]
+    
+    if compressed:
+        f = gzip.open(path, 'rt', newline='', encoding='utf-8-sig')
+    else:
+        f = open(path, newline='', encoding='utf-8-sig')
+    
+    with f:
+        if extension in ('.jsonl', '.ndjson', '.json'):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_no, {'_error': f"Invalid JSON: {e}", '_raw': line.rstrip('\n')}
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, {'_error': "Each line must be a JSON object", '_raw': line.rstrip('\n')}
+                    continue
+                yield line_no, _normalize_keys(record)
+        elif extension == '.csv':
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, _normalize_keys(record)
+        else:
+            raise ValueError(f"Unsupported import file type: {path}")
+
+def _normalize_keys(record: dict) -> dict:
+    """Lower-case field names with underscores, resolving FIELD_ALIASES"""
+    normalized = {}
+    for key, value in record.items():
+        if key is None:
+            continue  # Extra CSV cells beyond the header
+        name = key.strip().lower().replace(' ', '_')
+        normalized[FIELD_ALIASES.get(name, name)] = value
+    return normalized
+
+# ---------------------------------------------------------------------------
+# Validation (runs in worker processes, so everything here is module-level)
+
+def _text(value) -> str:
+    """A field value as a stripped string"""
+    if value is None:
+        return ''
+    return str(value).strip()
+
+def _parse_date(value: str, field_name: str) -> datetime:
+    """Parse YYYY-MM-DD or a full ISO timestamp"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{field_name} must be a date (YYYY-MM-DD)")
+
+def _parse_tax_rate(value) -> float:
+    """A decimal tax rate from 0.08, "0.08" or "8%" """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if value.endswith('%'):
+        return CurrencyFormatter.parse_percentage_input(value)
+    return float(value)
+
+def _parse_items(record: dict) -> List[dict]:
+    """Line items of an invoice record as dicts"""
+    items = record.get('items')
+    if items in (None, ''):
+        if not _text(record.get('description')):
+            return []
+        items = [{
+            'description': record.get('description'),
+            'quantity': record.get('quantity', 1),
+            'rate': record.get('rate', 0)
+        }]
+    elif isinstance(items, str):
+        try:
+            items = json.loads(items)
+        except ValueError as e:
+            raise ValueError(f"items is not valid JSON: {e}")
+    
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError("items must be a list of objects")
+    return items
+
+def _validate_client(record: dict) -> Tuple[Optional[dict], List[str]]:
+    """Validate one client record; returns (row, errors)"""
+    row = {column: _text(record.get(column)) for column in IMPORT_CLIENT_COLUMNS if column != 'created_date'}
+    
+    is_valid, errors = FormValidator.validate_client_form(dict(row, website=_text(record.get('website'))))
+    return (row, []) if is_valid else (None, errors)
+
+def _validate_invoice(record: dict, defaults: dict) -> Tuple[Optional[dict], List[str]]:
+    """Validate one invoice record; returns (row without totals, errors)"""
+    errors = []
+    try:
+        items = _parse_items(record)
+    except ValueError as e:
+        return None, [str(e)]
+    
+    invoice_number = _text(record.get('invoice_number'))
+    client = _text(record.get('client'))
+    client_id = _text(record.get('client_id'))
+    row = {
+        'invoice_number': invoice_number,
+        'client': client,
+        'client_id': None,
+        'status': _text(record.get('status')) or 'Draft',
+        'payment_terms': _text(record.get('payment_terms')) or defaults['payment_terms'],
+        'currency': _text(record.get('currency')) or defaults['currency'],
+        'notes': _text(record.get('notes')),
+    }
+    for field_name in COMPANY_FIELDS:
+        row[field_name] = _text(record.get(field_name)) or defaults[field_name]
+    
+    # Numbers left blank are assigned at insert time, so only given ones are checked
+    is_valid, form_errors = FormValidator.validate_invoice_form({
+        'invoice_number': invoice_number or 'AUTO',
+        'client_id': client_id or client,
+        'payment_terms': row['payment_terms'],
+        'status': row['status'],
+        'items': [{'description': _text(item.get('description'))} for item in items],
+    })
+    errors.extend(form_errors)
+    
+    if client_id:
+        if client_id.isdigit():
+            row['client_id'] = int(client_id)
+        else:
+            errors.append("client_id must be a number")
+    
+    try:
+        tax_rate = record.get('tax_rate')
+        row['tax_rate'] = defaults['tax_rate'] if tax_rate in (None, '') else _parse_tax_rate(tax_rate)
+        is_valid, error = ValidationEngine.validate_tax_rate(row['tax_rate'])
+        if not is_valid:
+            errors.append(error)
+    except ValueError:
+        errors.append("Invalid tax rate format")
+    
+    try:
+        invoice_date = _parse_date(_text(record.get('invoice_date')), "invoice_date") \
+            if _text(record.get('invoice_date')) else datetime.now()
+        due_date = _parse_date(_text(record.get('due_date')), "due_date") \
+            if _text(record.get('due_date')) else DateCalculator.calculate_due_date(invoice_date, row['payment_terms'])
+        row['invoice_date'] = invoice_date.isoformat()
+        row['due_date'] = due_date.isoformat()
+    except ValueError as e:
+        errors.append(str(e))
+    
+    row['items'] = []
+    for i, item in enumerate(items, 1):
+        quantity = item.get('quantity', 1)
+        rate = item.get('rate', 0)
+        is_valid, error = ValidationEngine.validate_quantity(quantity)
+        if not is_valid:
+            errors.append(f"Item {i}: {error}")
+            continue
+        is_valid, error = ValidationEngine.validate_amount(rate)
+        if not is_valid:
+            errors.append(f"Item {i}: {error}")
+            continue
+        
+        rate_cents = to_cents(re.sub(r'[^\d.-]', '', rate) if isinstance(rate, str) else rate)
+        row['items'].append((_text(item.get('description')), float(quantity), rate_cents))
+    
+    return (row, []) if not errors else (None, errors)
+
+def _validate_chunk(kind: str, chunk: List[Tuple[int, dict]], defaults: dict) -> List[Tuple[Optional[dict], List[str]]]:
+    """Validate a chunk of records; returns (row, errors) per record, in order
+    
+    Invoice totals for the whole chunk are calculated in one batch.
+    """
+    if kind == 'invoices':
+        validate = lambda record: _validate_invoice(record, defaults)
+    else:
+        validate = _validate_client
+    results = []
+    for _, record in chunk:
+        if '_error' in record:
+            results.append((None, [record['_error']]))
+            continue
+        try:
+            results.append(validate(record))
+        except Exception as e:
+            results.append((None, [str(e) or type(e).__name__]))
+    
+    if kind == 'invoices':
+        _calculate_totals([row for row, _ in results if row is not None])
+    return results
+
+def _calculate_totals(invoices: List[dict]):
+    """Fill in item amounts and invoice totals with one batch calculation"""
+    if not invoices:
+        return
+    
+    quantities = []
+    rates_cents = []
+    offsets = [0]
+    for invoice in invoices:
+        for _, quantity, rate_cents in invoice['items']:
+            quantities.append(quantity)
+            rates_cents.append(rate_cents)
+        offsets.append(len(quantities))
+    
+    totals = CalculationEngine.calculate_batch_totals(
+        quantities, rates_cents, offsets, [invoice['tax_rate'] for invoice in invoices])
+    
+    line_totals = totals['line_totals_cents']
+    for n, invoice in enumerate(invoices):
+        invoice['items'] = [item + (amount,) for item, amount in
+                            zip(invoice['items'], line_totals[offsets[n]:offsets[n + 1]])]
+        invoice['subtotal_cents'] = totals['subtotal_cents'][n]
+        invoice['tax_amount_cents'] = totals['tax_amount_cents'][n]
+        invoice['total_cents'] = totals['total_cents'][n]
+
+def _validated_chunks(kind: str, records: Iterable[Tuple[int, dict]], defaults: dict,
+                      workers: int, chunk_size: int) -> Iterator[Tuple[List[Tuple[int, dict]], list]]:
+    """Yield (chunk, results) in input order, validating chunks across worker processes
+    
+    Only a few chunks per worker are in flight at once, so memory stays bounded
+    however large the input is.
+    """
+    records = iter(records)
+    chunks = iter(lambda: list(islice(records, chunk_size)), [])
+    
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, _validate_chunk(kind, chunk, defaults)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_validate_chunk, kind, chunk, defaults)))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+# ---------------------------------------------------------------------------
+# Importing
+
+class _ErrorReport:
+    """CSV of rejected records, created when the first one arrives"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._writer = None
+    
+    def add(self, line_no: int, errors: List[str], record: dict):
+        if self._writer is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(ERROR_REPORT_HEADER)
+        raw = record.get('_raw') if '_error' in record else json.dumps(record, ensure_ascii=False, default=str)
+        self._writer.writerow([line_no, '; '.join(errors), raw])
+    
+    @property
+    def written(self) -> bool:
+        return self._writer is not None
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+def default_report_path(path: str) -> str:
+    """Error report path next to the input file"""
+    base = path[:-3] if path.lower().endswith('.gz') else path
+    return f"{os.path.splitext(base)[0]}_errors.csv"
+
+def _import_defaults(db_manager: DatabaseManager) -> dict:
+    """Values used for fields an invoice record leaves blank"""
+    settings = db_manager.get_app_settings()
+    defaults = {field_name: getattr(settings, field_name) or '' for field_name in COMPANY_FIELDS}
+    defaults.update(
+        payment_terms=settings.default_payment_terms,
+        currency=settings.default_currency,
+        tax_rate=settings.default_tax_rate or 0.0,
+    )
+    return defaults
+
+def import_records(db_manager: DatabaseManager, kind: str, records: Iterable[Tuple[int, dict]],
+                   report_path: str, workers: Optional[int] = None,
+                   batch_size: int = IMPORT_BATCH_SIZE,
+                   chunk_size: int = IMPORT_VALIDATION_CHUNK_SIZE,
+                   progress: Optional[ProgressCallback] = None) -> ImportResult:
+    """Validate and insert (line number, record) pairs; returns the counts
+    
+    Valid records are inserted batch_size at a time, each batch in its own
+    transaction, so an interrupted import keeps the batches already committed.
+    Rejected records, with the reasons, go to report_path.
+    """
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"Unknown import kind: {kind}")
+    
+    insert = db_manager.import_clients if kind == 'clients' else db_manager.import_invoices
+    workers = workers or os.cpu_count() or 1
+    defaults = _import_defaults(db_manager)
+    result = ImportResult(kind)
+    report = _ErrorReport(report_path)
+    
+    batch = []
+    sources = []
+    
+    try:
+        for chunk, results in _validated_chunks(kind, records, defaults, workers, chunk_size):
+            for (line_no, record), (row, errors) in zip(chunk, results):
+                if errors:
+                    report.add(line_no, errors, record)
+                    result.rejected += 1
+                    continue
+                batch.append(row)
+                sources.append((line_no, record))
+            
+            if len(batch) >= batch_size:
+                _insert_batch(insert, batch, sources, report, result)
+                batch, sources = [], []
+                if progress is not None:
+                    progress(kind, result.processed, None)
+        
+        if batch:
+            _insert_batch(insert, batch, sources, report, result)
+            if progress is not None:
+                progress(kind, result.processed, None)
+    finally:
+        report.close()
+    
+    if report.written:
+        result.report_path = report_path
+    return result
+
+def _insert_batch(insert, batch: List[dict], sources: List[Tuple[int, dict]],
+                  report: _ErrorReport, result: ImportResult):
+    """Insert one batch, reporting the rows the database turned away"""
+    rejected = insert(batch)
+    for index, error in rejected:
+        line_no, record = sources[index]
+        report.add(line_no, [error], record)
+    result.rejected += len(rejected)
+    result.imported += len(batch) - len(rejected)
+
+def import_file(db_manager: DatabaseManager, kind: str, path: str, report_path: Optional[str] = None,
+                workers: Optional[int] = None, batch_size: int = IMPORT_BATCH_SIZE,
+                progress: Optional[ProgressCallback] = None) -> ImportResult:
+    """Import clients or invoices from a CSV or JSON Lines file
+    
+    The error report defaults to <input>_errors.csv next to the input file.
+    """
+    return import_records(db_manager, kind, read_records(path), report_path or default_report_path(path),
+                          workers=workers, batch_size=batch_size, progress=progress)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Bulk import clients or invoices from CSV or JSON Lines")
+    parser.add_argument('kind', choices=IMPORT_KINDS)
+    parser.add_argument('path', help="input file (.csv or .jsonl, optionally .gz)")
+    parser.add_argument('--db', default=DATABASE_PATH, help="database file")
+    parser.add_argument('--report', help="error report path (default: <input>_errors.csv)")
+    parser.add_argument('--workers', type=int, help="validation processes (default: CPU count)")
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                        help="records inserted per transaction")
+    args = parser.parse_args(argv)
+    
+    def report_progress(label, processed, total):
+        print(f"\r{label}: {processed:,} records processed", end='', file=sys.stderr, flush=True)
+    
+    started = datetime.now()
+    result = import_file(DatabaseManager(args.db), args.kind, args.path, args.report,
+                         workers=args.workers, batch_size=args.batch_size, progress=report_progress)
+    elapsed = (datetime.now() - started).total_seconds()
+    
+    print(file=sys.stderr)
+    print(f"Imported {result.imported:,} {args.kind}, rejected {result.rejected:,} in {elapsed:.1f}s")
+    if result.report_path:
+        print(f"Rejected records written to {result.report_path}")
+    return 1 if result.rejected else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
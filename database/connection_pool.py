@@ -0,0 +1,145 @@
+# File: connection_pool.py
+# Location: InvoiceGeneratorPro/database/connection_pool.py
+
+import atexit
+import sqlite3
+import threading
+import weakref
+from typing import Dict, Tuple
+
+from config import DATABASE_CACHE_SIZE_KB, DATABASE_MMAP_SIZE
+
+# Pools still alive, closed at interpreter exit. Weak, so short-lived pools are collected.
+_open_pools: "weakref.WeakSet[ConnectionPool]" = weakref.WeakSet()
+
+@atexit.register
+def _close_open_pools():
+    """Close the connections of every pool still alive"""
+    for pool in list(_open_pools):
+        pool.close_all()
+
+class ConnectionPool:
+    """Keeps one persistent SQLite connection per thread.
+    
+    Connections are opened lazily the first time a thread asks for one, reused
+    for every later request from that thread and closed when the pool is closed
+    (or at interpreter exit). Reuse costs no query: a connection is only probed
+    after an sqlite3.Error was reported on it (see report_error()).
+    """
+    
+    def __init__(self, db_path: str, tuning: bool = False,
+                 cache_size_kb: int = DATABASE_CACHE_SIZE_KB,
+                 mmap_size: int = DATABASE_MMAP_SIZE):
+        self.db_path = db_path
+        self.tuning = tuning
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection]] = {}
+        
+        _open_pools.add(self)
+    
+    def acquire(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening or replacing it if needed"""
+        conn = getattr(self._local, 'connection', None)
+        if conn is not None and self._needs_replacing(conn):
+            self._discard(conn)
+            conn = None
+        
+        if conn is None:
+            conn = self._connect()
+        return conn
+    
+    def report_error(self):
+        """Have this thread's next acquire() check its connection before reusing it"""
+        self._local.suspect = True
+    
+    def close_all(self):
+        """Close every pooled connection"""
+        with self._lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        
+        for _, conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+    
+    @property
+    def size(self) -> int:
+        """Number of open pooled connections"""
+        with self._lock:
+            return len(self._connections)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection for the current thread"""
+        # Connections are only ever used by the thread that opened them; sharing is
+        # allowed so close_all() can run from whichever thread shuts the app down
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable dict-like access
+        self._configure(conn)
+        
+        thread = threading.current_thread()
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[thread.ident] = (thread, conn)
+        self._local.connection = conn
+        return conn
+    
+    def _configure(self, conn: sqlite3.Connection):
+        """Apply per-connection PRAGMAs"""
+        # Needed for invoice_items to cascade when an invoice is deleted
+        conn.execute("PRAGMA foreign_keys = ON")
+        
+        if not self.tuning:
+            return
+        
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        # Negative cache_size is interpreted by SQLite as KiB rather than pages
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+    
+    def _needs_replacing(self, conn: sqlite3.Connection) -> bool:
+        """Whether this thread's connection is closed, or broken after a reported error"""
+        try:
+            conn.in_transaction  # Raises once closed, without running a query
+        except sqlite3.ProgrammingError:
+            return True
+        
+        if getattr(self._local, 'suspect', False):
+            self._local.suspect = False
+            return not self._is_healthy(conn)
+        return False
+    
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        """Check that a pooled connection is still usable"""
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _discard(self, conn: sqlite3.Connection):
+        """Drop this thread's connection from the pool"""
+        with self._lock:
+            self._connections.pop(threading.get_ident(), None)
+        self._local.connection = None
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    
+    def _prune_dead_threads(self):
+        """Close connections owned by threads that have exited (lock must be held)"""
+        for ident, (thread, conn) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
@@ -1,141 +1,139 @@
 # File: db_manager.py
 # Location: InvoiceGeneratorPro/database/db_manager.py
 
+import json
+import os
+import re
 import sqlite3
+import threading
 from datetime import datetime
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
 from contextlib import contextmanager
 
-from .models import Client, Invoice, AppSettings
-from config import DATABASE_PATH, ERROR_MESSAGES
+from .connection_pool import ConnectionPool
+from .migrations import ProgressCallback, migrate
+from .models import Client, ClientStats, Invoice, InvoiceItem, LazyInvoice, AppSettings
+from utils.calculations import from_cents
+from config import (
+    DATABASE_PATH, DATABASE_TUNING_ENABLED, ERROR_MESSAGES, LIST_PAGE_SIZE, SEARCH_RESULT_LIMIT,
+    EXPORT_BATCH_SIZE
+)
+
+# Column order of the clients table, used when selecting clients alongside invoices
+CLIENT_COLUMNS = (
+    'id', 'name', 'email', 'phone', 'address', 'city', 'state',
+    'zip_code', 'country', 'created_date', 'notes'
+)
+
+INSERT_ITEM_SQL = """
+    INSERT INTO invoice_items (invoice_id, position, description, quantity, rate_cents, amount_cents)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Columns written by the bulk import methods, in insert order
+IMPORT_CLIENT_COLUMNS = (
+    'name', 'email', 'phone', 'address', 'city', 'state',
+    'zip_code', 'country', 'notes', 'created_date'
+)
+
+IMPORT_INVOICE_COLUMNS = (
+    'id', 'invoice_number', 'client_id', 'invoice_date', 'due_date', 'status',
+    'subtotal_cents', 'tax_rate', 'tax_amount_cents', 'total_cents', 'notes',
+    'payment_terms', 'currency', 'created_date', 'updated_date', 'company_name',
+    'company_address', 'company_phone', 'company_email', 'company_website'
+)
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """UPDATE statement setting the given columns of one row by id
+    
+    Cached so a given set of changed fields always yields the same string,
+    which sqlite3 finds in its per-connection statement cache instead of
+    preparing it again.
+    """
+    set_clause = ', '.join(f"{column} = ?" for column in columns)
+    return f"UPDATE {table} SET {set_clause} WHERE id = ?"
+
 class DatabaseManager:
     """Handles all database operations for Invoice Generator Pro"""
     
-    def __init__(self, db_path: str = DATABASE_PATH):
+    def __init__(self, db_path: str = DATABASE_PATH, tuning: bool = DATABASE_TUNING_ENABLED,
+                 migration_progress: Optional[ProgressCallback] = None):
         self.db_path = db_path
-        self.init_database()
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.pool = ConnectionPool(db_path, tuning=tuning)
+        self._depth = threading.local()
+        self.init_database(migration_progress)
     
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
+        """Context manager for database connections
+        
+        Yields this thread's pooled connection. Nested uses share it; when the
+        outermost block exits, any transaction left open (on error, or because
+        nothing committed it) is rolled back so the connection goes back clean.
+        """
+        conn = self.pool.acquire()
+        depth = getattr(self._depth, 'value', 0)
+        self._depth.value = depth + 1
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Enable dict-like access
             yield conn
-        except sqlite3.Error as e:
-            if conn:
+        except Exception as e:
+            if isinstance(e, sqlite3.Error):
+                self.pool.report_error()
+            if conn.in_transaction:
                 conn.rollback()
-            raise e
+            raise
         finally:
-            if conn:
-                conn.close()
-    
-    def init_database(self):
-        """Initialize database with required tables"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            # Create clients table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS clients (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE,
-                    email TEXT,
-                    phone TEXT,
-                    address TEXT,
-                    city TEXT,
-                    state TEXT,
-                    zip_code TEXT,
-                    country TEXT,
-                    created_date TEXT,
-                    notes TEXT
-                )
-            ''')
-            
-            # Create invoices table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS invoices (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    invoice_number TEXT UNIQUE NOT NULL,
-                    client_id INTEGER NOT NULL,
-                    invoice_date TEXT,
-                    due_date TEXT,
-                    status TEXT DEFAULT 'Draft',
-                    items TEXT,
-                    subtotal REAL DEFAULT 0.0,
-                    tax_rate REAL DEFAULT 0.0,
-                    tax_amount REAL DEFAULT 0.0,
-                    total REAL DEFAULT 0.0,
-                    notes TEXT,
-                    payment_terms TEXT DEFAULT 'Net 30',
-                    currency TEXT DEFAULT 'USD',
-                    created_date TEXT,
-                    updated_date TEXT,
-                    company_name TEXT,
-                    company_address TEXT,
-                    company_phone TEXT,
-                    company_email TEXT,
-                    company_website TEXT,
-                    FOREIGN KEY (client_id) REFERENCES clients (id)
-                )
-            ''')
-            
-            # Create app_settings table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS app_settings (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    company_name TEXT,
-                    company_address TEXT,
-                    company_phone TEXT,
-                    company_email TEXT,
-                    company_website TEXT,
-                    default_currency TEXT DEFAULT 'USD',
-                    default_tax_rate REAL DEFAULT 0.0,
-                    default_payment_terms TEXT DEFAULT 'Net 30',
-                    invoice_number_format TEXT DEFAULT 'INV-{:04d}',
-                    next_invoice_number INTEGER DEFAULT 1,
-                    auto_backup INTEGER DEFAULT 1,
-                    backup_frequency INTEGER DEFAULT 7,
-                    last_backup TEXT
-                )
-            ''')
-            
-            # Create indexes for better performance
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_client_name ON clients (name)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoice_number ON invoices (invoice_number)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoice_client ON invoices (client_id)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoice_status ON invoices (status)')
-            cursor.execute('CREATE INDEX IF NOT EXISTS idx_invoice_date ON invoices (invoice_date)')
-            
-            conn.commit()
-            
-            # Initialize default settings if not exists
-            self._init_default_settings()
+            self._depth.value = depth
+            if depth == 0 and conn.in_transaction:
+                conn.rollback()
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.pool.close_all()
+    
+    def init_database(self, progress: Optional[ProgressCallback] = None):
+        """Bring the schema up to date by applying pending migrations
+        
+        A database that is already current costs one PRAGMA read. progress is
+        passed to migrate() for steps that rewrite large tables.
+        """
+        with self.get_connection() as conn:
+            if migrate(conn, progress):
+                self._init_default_settings()
     
     def _init_default_settings(self):
         """Initialize default app settings"""
         settings = self.get_app_settings()
-        if not settings:
+        if settings.id is None:
             default_settings = AppSettings()
             self.save_app_settings(default_settings)
     
     # CLIENT OPERATIONS
     
     def save_client(self, client: Client) -> Client:
-        """Save or update a client"""
+        """Save or update a client
+        
+        An existing client is updated with only the fields changed since it was
+        loaded or last saved; an unchanged one is not written at all.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            client_data = client.to_dict()
-            client_data.pop('id', None)  # Remove id for insert/update
-            
             if client.id:
-                # Update existing client
-                set_clause = ', '.join([f"{key} = ?" for key in client_data.keys()])
-                query = f"UPDATE clients SET {set_clause} WHERE id = ?"
+                # Update the changed columns of an existing client
+                client_data = client.changes()
+                if not client_data:
+                    return client
+                query = _update_sql('clients', tuple(client_data))
                 values = list(client_data.values()) + [client.id]
             else:
+                client_data = client.to_dict()
+                client_data.pop('id', None)  # Remove id for insert
                 # Insert new client
                 columns = ', '.join(client_data.keys())
                 placeholders = ', '.join(['?' for _ in client_data])
@@ -148,6 +146,7 @@ class DatabaseManager:
                 
                 if not client.id:
                     client.id = cursor.lastrowid
+                client.mark_saved()
                 
                 return client
             except sqlite3.IntegrityError:
@@ -161,7 +160,7 @@ class DatabaseManager:
             row = cursor.fetchone()
             
             if row:
-                return Client.from_dict(dict(row))
+                return Client.from_row(row)
             return None
     
     def get_client_by_name(self, name: str) -> Optional[Client]:
@@ -172,7 +171,7 @@ class DatabaseManager:
             row = cursor.fetchone()
             
             if row:
-                return Client.from_dict(dict(row))
+                return Client.from_row(row)
             return None
     
     def get_all_clients(self) -> List[Client]:
@@ -182,22 +181,203 @@ class DatabaseManager:
             cursor.execute("SELECT * FROM clients ORDER BY name")
             rows = cursor.fetchall()
             
-            return [Client.from_dict(dict(row)) for row in rows]
+            return [Client.from_row(row) for row in rows]
     
-    def search_clients(self, search_term: str) -> List[Client]:
-        """Search clients by name or email"""
+    def get_clients_page(self, after: Optional[Tuple[str, int]] = None,
+                         limit: int = LIST_PAGE_SIZE) -> Tuple[List[Client], Optional[Tuple[str, int]]]:
+        """Get one page of clients ordered by name
+        
+        Pages are keyed on (name, id) rather than OFFSET, so every page costs the
+        same however deep the user scrolls. Pass the returned cursor as ``after``
+        to get the next page; it is None once the last page has been returned.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            query = """
-                SELECT * FROM clients 
-                WHERE name LIKE ? OR email LIKE ? 
-                ORDER BY name
-            """
-            search_pattern = f"%{search_term}%"
-            cursor.execute(query, (search_pattern, search_pattern))
+            if after is None:
+                cursor.execute("SELECT * FROM clients ORDER BY name, id LIMIT ?", (limit + 1,))
+            else:
+                cursor.execute("""
+                    SELECT * FROM clients
+                    WHERE (name, id) > (?, ?)
+                    ORDER BY name, id
+                    LIMIT ?
+                """, (*after, limit + 1))
             rows = cursor.fetchall()
             
-            return [Client.from_dict(dict(row)) for row in rows]
+            clients = [Client.from_row(row) for row in rows[:limit]]
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = (clients[-1].name, clients[-1].id)
+            return clients, next_cursor
+    
+    def get_clients_with_stats(self, after: Optional[Tuple[str, int]] = None,
+                               limit: int = LIST_PAGE_SIZE) -> Tuple[List[ClientStats], Optional[Tuple[str, int]]]:
+        """Get one page of clients with their invoice count, paid revenue and last invoice date
+        
+        Paging works as in get_clients_page(). The figures come from one GROUP BY
+        over the page.
+        """
+        if after is None:
+            page_query = "SELECT * FROM clients ORDER BY name, id LIMIT ?"
+            params = (limit + 1,)
+        else:
+            page_query = "SELECT * FROM clients WHERE (name, id) > (?, ?) ORDER BY name, id LIMIT ?"
+            params = (*after, limit + 1)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            stats = self._fetch_clients_with_stats(cursor, page_query, params, order_by="c.name, c.id")
+            
+            next_cursor = None
+            if len(stats) > limit:
+                stats = stats[:limit]
+                next_cursor = (stats[-1].client.name, stats[-1].client.id)
+            return stats, next_cursor
+    
+    def get_client_stats(self, client_id: int) -> Optional[ClientStats]:
+        """Get a client with its invoice count, paid revenue and last invoice date"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            stats = self._fetch_clients_with_stats(cursor, "SELECT * FROM clients WHERE id = ?", (client_id,))
+            return stats[0] if stats else None
+    
+    def search_clients_with_stats(self, search_term: str, limit: int = SEARCH_RESULT_LIMIT) -> List[ClientStats]:
+        """Full-text search for clients, best matches first, with their invoice stats"""
+        return self._search_clients_with_stats(search_term, limit, 0)
+    
+    def search_clients_with_stats_page(self, search_term: str, after: Optional[int] = None,
+                                       limit: int = LIST_PAGE_SIZE) -> Tuple[List[ClientStats], Optional[int]]:
+        """Get one page of search_clients_with_stats() matches
+        
+        Paging works as in get_clients_with_stats(), except that the cursor is the
+        number of matches already returned: ranking has to visit every match on
+        each page anyway, so an offset costs no more than a keyset would.
+        """
+        offset = after or 0
+        stats = self._search_clients_with_stats(search_term, limit + 1, offset)
+        if len(stats) > limit:
+            return stats[:limit], offset + limit
+        return stats, None
+    
+    def _search_clients_with_stats(self, search_term: str, limit: int, offset: int) -> List[ClientStats]:
+        """Ranked client matches with their invoice stats, skipping the first offset"""
+        match = self._match_expression(search_term)
+        if match is None:
+            return []
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            return self._fetch_clients_with_stats(cursor, """
+                SELECT clients.*, clients_fts.rank AS search_rank
+                FROM clients_fts
+                JOIN clients ON clients.id = clients_fts.rowid
+                WHERE clients_fts MATCH ?
+                ORDER BY clients_fts.rank, clients.id
+                LIMIT ? OFFSET ?
+            """, (match, limit, offset), order_by="c.search_rank, c.id")
+    
+    def _fetch_clients_with_stats(self, cursor, page_query: str, params: tuple,
+                                  order_by: str = "c.name, c.id") -> List[ClientStats]:
+        """Select a page of clients, then aggregate their invoices in one GROUP BY
+        
+        page_query selects the clients (already limited) so the aggregate only
+        touches invoices of the clients being returned.
+        """
+        client_columns = ', '.join(f"c.{column}" for column in CLIENT_COLUMNS)
+        cursor.execute(f"""
+            WITH page AS ({page_query})
+            SELECT {client_columns},
+                   COUNT(i.id) AS invoice_count,
+                   COALESCE(SUM(CASE WHEN i.status = 'Paid' THEN i.total_cents END), 0) AS paid_revenue_cents,
+                   MAX(i.created_date) AS last_invoice_date
+            FROM page c
+            LEFT JOIN invoices i ON i.client_id = c.id
+            GROUP BY c.id
+            ORDER BY {order_by}
+        """, params)
+        
+        stats = []
+        for row in cursor.fetchall():
+            client = Client.from_row(row)
+            last_invoice_date = row['last_invoice_date']
+            stats.append(ClientStats(
+                client=client,
+                invoice_count=row['invoice_count'],
+                paid_revenue_cents=row['paid_revenue_cents'],
+                last_invoice_date=datetime.fromisoformat(last_invoice_date) if last_invoice_date else None
+            ))
+        return stats
+    
+    def search_clients(self, search_term: str, limit: Optional[int] = None) -> List[Client]:
+        """Search clients by name, email, city or notes, best matches first
+        
+        Every match is returned unless a limit is given.
+        """
+        match = self._match_expression(search_term)
+        if match is None:
+            return []
+        
+        with self.get_connection() as conn:
+            return self._search_clients(conn.cursor(), match, limit)
+    
+    def search(self, search_term: str, limit: int = SEARCH_RESULT_LIMIT) -> dict:
+        """Full-text search over clients and invoices
+        
+        Every word of search_term is matched as a prefix against client name, email,
+        city and notes, and invoice number, notes and item descriptions. Returns
+        {'clients': [...], 'invoices': [...]}, each ranked best first and capped at
+        limit. Invoices come without items, as with the other list queries.
+        """
+        match = self._match_expression(search_term)
+        if match is None:
+            return {'clients': [], 'invoices': []}
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            clients = self._search_clients(cursor, match, limit)
+            
+            cursor.execute("""
+                SELECT rowid FROM invoices_fts
+                WHERE invoices_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            """, (match, limit))
+            ranked_ids = [row[0] for row in cursor.fetchall()]
+            
+            invoices = []
+            if ranked_ids:
+                placeholders = ', '.join('?' for _ in ranked_ids)
+                invoices = self._fetch_invoices_with_clients(
+                    cursor, f"WHERE i.id IN ({placeholders})", tuple(ranked_ids)
+                )
+                position = {invoice_id: index for index, invoice_id in enumerate(ranked_ids)}
+                invoices.sort(key=lambda invoice: position[invoice.id])
+            
+            return {'clients': clients, 'invoices': invoices}
+    
+    def _search_clients(self, cursor, match: str, limit: Optional[int]) -> List[Client]:
+        """Clients matching an FTS5 expression, best first; no cap when limit is None"""
+        cursor.execute("""
+            SELECT clients.*
+            FROM clients_fts
+            JOIN clients ON clients.id = clients_fts.rowid
+            WHERE clients_fts MATCH ?
+            ORDER BY clients_fts.rank
+            LIMIT ?
+        """, (match, -1 if limit is None else limit))  # LIMIT -1 is no limit
+        return [Client.from_row(row) for row in cursor.fetchall()]
+    
+    @staticmethod
+    def _match_expression(search_term: str) -> Optional[str]:
+        """Turn user input into an FTS5 query matching every word as a prefix
+        
+        Words are quoted so FTS5 operators typed by the user are taken literally.
+        Returns None when the input has no searchable words.
+        """
+        words = re.findall(r'\w+', search_term)
+        if not words:
+            return None
+        return ' '.join(f'"{word}"*' for word in words)
     
     def delete_client(self, client_id: int) -> bool:
         """Delete a client (only if no invoices exist)"""
@@ -219,149 +399,344 @@ class DatabaseManager:
     # INVOICE OPERATIONS
     
     def save_invoice(self, invoice: Invoice) -> Invoice:
-        """Save or update an invoice"""
+        """Save or update an invoice
+        
+        A new invoice without a number is numbered from the settings counter
+        inside the same write transaction as the insert, so concurrent savers
+        never receive the same number.
+        
+        An existing invoice is updated with only the fields changed since it was
+        loaded or last saved, and only its added, edited or removed line items
+        are written; an unchanged one is not written at all. An invoice from a
+        list query whose items were never loaded keeps its stored items and
+        subtotal.
+        """
+        if not invoice.items_loaded and invoice.items:
+            invoice.require_items()  # Items were set without the stored ones; saving would drop those
+        
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            # Take the write lock up front: the counter read, insert and commit happen as one unit
+            cursor.execute("BEGIN IMMEDIATE")
+            
+            # Recalculate totals; updated_date is only stamped if something is written
+            updated_date = invoice.updated_date
+            invoice.calculate_totals()
+            invoice.updated_date = updated_date
+            
+            invoice_data = invoice.changes() if invoice.id else None
             
             # Ensure we have a valid client
-            if not invoice.client_id or not self.get_client(invoice.client_id):
-                raise ValueError("Valid client is required")
+            if invoice_data is None or 'client_id' in invoice_data:
+                if not invoice.client_id or not self._existing_values(cursor, 'clients', 'id', [invoice.client_id]):
+                    raise ValueError("Valid client is required")
             
             # Generate invoice number if new invoice
             if not invoice.id and not invoice.invoice_number:
-                settings = self.get_app_settings()
-                invoice.invoice_number = settings.get_next_invoice_number()
-                self.save_app_settings(settings)
-            
-            # Recalculate totals
-            invoice.calculate_totals()
-            
-            invoice_data = invoice.to_dict()
-            invoice_data.pop('id', None)  # Remove id for insert/update
-            
-            if invoice.id:
-                # Update existing invoice
-                set_clause = ', '.join([f"{key} = ?" for key in invoice_data.keys()])
-                query = f"UPDATE invoices SET {set_clause} WHERE id = ?"
-                values = list(invoice_data.values()) + [invoice.id]
-            else:
-                # Insert new invoice
-                columns = ', '.join(invoice_data.keys())
-                placeholders = ', '.join(['?' for _ in invoice_data])
-                query = f"INSERT INTO invoices ({columns}) VALUES ({placeholders})"
-                values = list(invoice_data.values())
+                invoice.invoice_number = self._allocate_invoice_numbers(cursor, 1)[0]
             
             try:
-                cursor.execute(query, values)
-                conn.commit()
-                
-                if not invoice.id:
+                if invoice.id:
+                    items_written = self._save_invoice_items(cursor, invoice)
+                    invoice_data.pop('updated_date', None)
+                    if not invoice_data and not items_written:
+                        conn.rollback()  # Nothing changed
+                        return invoice
+                    
+                    # Update the changed columns of the existing invoice
+                    invoice.updated_date = datetime.now()
+                    invoice_data['updated_date'] = invoice.updated_date.isoformat()
+                    cursor.execute(_update_sql('invoices', tuple(invoice_data)),
+                                   list(invoice_data.values()) + [invoice.id])
+                else:
+                    # Insert new invoice
+                    invoice.updated_date = datetime.now()
+                    invoice_data = invoice.to_dict()
+                    invoice_data.pop('id', None)
+                    columns = ', '.join(invoice_data.keys())
+                    placeholders = ', '.join(['?' for _ in invoice_data])
+                    cursor.execute(f"INSERT INTO invoices ({columns}) VALUES ({placeholders})",
+                                   list(invoice_data.values()))
                     invoice.id = cursor.lastrowid
+                    self._save_invoice_items(cursor, invoice)
+                
+                conn.commit()
+                invoice.mark_saved()
                 
                 return invoice
             except sqlite3.IntegrityError:
                 raise ValueError("Invoice number must be unique")
     
+    def allocate_invoice_numbers(self, count: int = 1) -> List[str]:
+        """Reserve a block of count invoice numbers for the caller to use
+        
+        The numbers are taken from the settings counter in their own short
+        transaction and will not be handed out again, e.g. to a worker that
+        numbers invoices itself before saving them.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            numbers = self._allocate_invoice_numbers(cursor, count)
+            conn.commit()
+            return numbers
+    
+    def peek_next_invoice_number(self) -> str:
+        """The number the next new invoice will most likely get, without reserving it"""
+        return self.get_app_settings().get_next_invoice_number()
+    
+    def _save_invoice_items(self, cursor, invoice: Invoice) -> bool:
+        """Write an invoice's added, edited and removed line items; returns whether anything was written
+        
+        Items that were never loaded are left alone. When it is not known what
+        is stored (a new invoice, or one built with Invoice.from_dict) the
+        stored items are replaced.
+        """
+        if not invoice.items_loaded:
+            return False
+        
+        saved_ids = invoice.saved_item_ids
+        if saved_ids is None:
+            cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice.id,))
+            for position, item in enumerate(invoice.items):
+                cursor.execute(INSERT_ITEM_SQL, (
+                    invoice.id, position, item.description, item.quantity, item.rate_cents, item.total_cents
+                ))
+                item.id = cursor.lastrowid
+            return True
+        
+        written = False
+        removed = saved_ids - {item.id for item in invoice.items}
+        if removed:
+            cursor.execute("DELETE FROM invoice_items WHERE id IN (SELECT value FROM json_each(?))",
+                           (json.dumps(sorted(removed)),))
+            written = True
+        
+        for position, item in enumerate(invoice.items):
+            if item.id not in saved_ids:
+                cursor.execute(INSERT_ITEM_SQL, (
+                    invoice.id, position, item.description, item.quantity, item.rate_cents, item.total_cents
+                ))
+                item.id = cursor.lastrowid
+                written = True
+                continue
+            
+            item_data = item.changes(position)
+            if item_data:
+                cursor.execute(_update_sql('invoice_items', tuple(item_data)),
+                               list(item_data.values()) + [item.id])
+                written = True
+        return written
+    
     def get_invoice(self, invoice_id: int) -> Optional[Invoice]:
         """Get invoice by ID with client information"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM invoices WHERE id = ?", (invoice_id,))
-            row = cursor.fetchone()
-            
-            if row:
-                invoice = Invoice.from_dict(dict(row))
-                # Load client information
-                invoice.client = self.get_client(invoice.client_id)
-                return invoice
-            return None
+            invoices = self._fetch_invoices_with_clients(cursor, "WHERE i.id = ?", (invoice_id,))
+            self._attach_items(cursor, invoices)
+            return invoices[0] if invoices else None
     
     def get_invoice_by_number(self, invoice_number: str) -> Optional[Invoice]:
         """Get invoice by invoice number"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM invoices WHERE invoice_number = ?", (invoice_number,))
-            row = cursor.fetchone()
-            
-            if row:
-                invoice = Invoice.from_dict(dict(row))
-                invoice.client = self.get_client(invoice.client_id)
-                return invoice
-            return None
+            invoices = self._fetch_invoices_with_clients(cursor, "WHERE i.invoice_number = ?", (invoice_number,))
+            self._attach_items(cursor, invoices)
+            return invoices[0] if invoices else None
     
     def get_all_invoices(self) -> List[Invoice]:
         """Get all invoices with client information"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT i.*, c.name as client_name 
-                FROM invoices i 
-                JOIN clients c ON i.client_id = c.id 
-                ORDER BY i.created_date DESC
-            """)
-            rows = cursor.fetchall()
-            
-            invoices = []
-            for row in rows:
-                row_dict = dict(row)
-                # Remove client_name from invoice data
-                row_dict.pop('client_name', None)
-                invoice = Invoice.from_dict(row_dict)
-                invoice.client = self.get_client(invoice.client_id)
-                invoices.append(invoice)
+            return self._fetch_invoices_with_clients(cursor, order_by="i.created_date DESC", join="JOIN")
+    
+    def get_invoices_page(self, after: Optional[Tuple[Optional[str], int]] = None, limit: int = LIST_PAGE_SIZE,
+                          status: Optional[str] = None) -> Tuple[List[Invoice], Optional[Tuple[Optional[str], int]]]:
+        """Get one page of invoices, newest first, optionally filtered by status
+        
+        Pages are keyed on (created_date, id) rather than OFFSET, so every page
+        costs the same however deep the user scrolls. Pass the returned cursor as
+        ``after`` to get the next page; it is None once the last page has been
+        returned. Items are not loaded, as with the other list queries.
+        
+        The cursor holds created_date as stored, so it compares exactly against
+        the column whatever ISO form the date was written in. Invoices without a
+        created_date sort last.
+        """
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("i.status = ?")
+            params.append(status)
+        if after is not None:
+            created_date, invoice_id = after
+            if created_date is None:
+                conditions.append("i.created_date IS NULL AND i.id < ?")
+                params.append(invoice_id)
+            else:
+                conditions.append("((i.created_date, i.id) < (?, ?) OR i.created_date IS NULL)")
+                params.extend(after)
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            invoices = self._fetch_invoices_with_clients(
+                cursor, where_clause, tuple(params), order_by="i.created_date DESC, i.id DESC",
+                limit=limit + 1
+            )
             
-            return invoices
+            next_cursor = None
+            if len(invoices) > limit:
+                invoices = invoices[:limit]
+                last = invoices[-1]
+                next_cursor = (last.stored_value('created_date'), last.id)
+            return invoices, next_cursor
+    
+    def get_invoices_by_ids(self, invoice_ids: List[int]) -> List[Invoice]:
+        """Get several invoices, with clients and items, in the order given
+        
+        Ids that do not exist are skipped.
+        """
+        invoices_by_id = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(invoice_ids), 500):
+                chunk = list(invoice_ids[start:start + 500])
+                placeholders = ', '.join('?' for _ in chunk)
+                invoices = self._fetch_invoices_with_clients(cursor, f"WHERE i.id IN ({placeholders})", tuple(chunk))
+                self._attach_items(cursor, invoices)
+                invoices_by_id.update((invoice.id, invoice) for invoice in invoices)
+        
+        return [invoices_by_id[invoice_id] for invoice_id in invoice_ids if invoice_id in invoices_by_id]
+    
+    def get_invoice_ids(self, status: Optional[str] = None) -> List[int]:
+        """Get the ids of all invoices, newest first, optionally filtered by status"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if status is None:
+                cursor.execute("SELECT id FROM invoices ORDER BY created_date DESC, id DESC")
+            else:
+                cursor.execute(
+                    "SELECT id FROM invoices WHERE status = ? ORDER BY created_date DESC, id DESC", (status,)
+                )
+            return [row[0] for row in cursor.fetchall()]
     
     def get_invoices_by_status(self, status: str) -> List[Invoice]:
         """Get invoices by status"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM invoices WHERE status = ? ORDER BY created_date DESC", (status,))
-            rows = cursor.fetchall()
-            
-            invoices = []
-            for row in rows:
-                invoice = Invoice.from_dict(dict(row))
-                invoice.client = self.get_client(invoice.client_id)
-                invoices.append(invoice)
-            
-            return invoices
+            return self._fetch_invoices_with_clients(
+                cursor, "WHERE i.status = ?", (status,), order_by="i.created_date DESC"
+            )
     
     def get_invoices_by_client(self, client_id: int) -> List[Invoice]:
         """Get all invoices for a specific client"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM invoices WHERE client_id = ? ORDER BY created_date DESC", (client_id,))
-            rows = cursor.fetchall()
-            
-            invoices = []
-            for row in rows:
-                invoice = Invoice.from_dict(dict(row))
-                invoice.client = self.get_client(invoice.client_id)
-                invoices.append(invoice)
-            
-            return invoices
+            return self._fetch_invoices_with_clients(
+                cursor, "WHERE i.client_id = ?", (client_id,), order_by="i.created_date DESC"
+            )
     
     def get_overdue_invoices(self) -> List[Invoice]:
         """Get all overdue invoices"""
         today = datetime.now().date().isoformat()
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM invoices 
-                WHERE status = 'Sent' AND due_date < ? 
-                ORDER BY due_date ASC
-            """, (today,))
-            rows = cursor.fetchall()
-            
-            invoices = []
-            for row in rows:
-                invoice = Invoice.from_dict(dict(row))
-                invoice.client = self.get_client(invoice.client_id)
-                invoices.append(invoice)
-            
+            return self._fetch_invoices_with_clients(
+                cursor, "WHERE i.status = 'Sent' AND i.due_date < ?", (today,), order_by="i.due_date ASC"
+            )
+    
+    def load_invoice_items(self, invoices: List[Invoice]) -> List[Invoice]:
+        """Fill in line items for invoices returned by the list queries
+        
+        List queries leave Invoice.items empty; this loads the items of all given
+        invoices with one query.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            self._attach_items(cursor, invoices)
             return invoices
     
+    def _attach_items(self, cursor, invoices: List[Invoice]):
+        """Load items for a batch of invoices with a single IN (...) query"""
+        by_id = {invoice.id: invoice for invoice in invoices if invoice.id is not None}
+        if not by_id:
+            return
+        
+        for invoice in by_id.values():
+            invoice.items = []
+            invoice.items_loaded = True
+        
+        # Stay well below SQLite's bound-parameter limit
+        invoice_ids = list(by_id)
+        for start in range(0, len(invoice_ids), 500):
+            chunk = invoice_ids[start:start + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            cursor.execute(f"""
+                SELECT id, invoice_id, description, quantity, rate_cents
+                FROM invoice_items
+                WHERE invoice_id IN ({placeholders})
+                ORDER BY invoice_id, position
+            """, chunk)
+            for row in cursor.fetchall():
+                by_id[row['invoice_id']].items.append(InvoiceItem.from_row(row))
+        
+        for invoice in by_id.values():
+            invoice.mark_items_saved()
+    
+    def get_invoices_containing_item(self, description: str) -> List[Invoice]:
+        """Get invoices that have a line item with the given description"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            return self._fetch_invoices_with_clients(
+                cursor,
+                "WHERE i.id IN (SELECT invoice_id FROM invoice_items WHERE description = ?)",
+                (description,),
+                order_by="i.created_date DESC"
+            )
+    
+    def _fetch_invoices_with_clients(self, cursor, where_clause: str = "", params: tuple = (),
+                                     order_by: str = "", join: str = "LEFT JOIN",
+                                     limit: Optional[int] = None) -> List[Invoice]:
+        """Run an invoice query and hydrate each invoice's client from the same JOIN.
+        
+        Client columns are selected under a ``client__`` prefix so every row carries
+        its client, avoiding a separate get_client() lookup per invoice. A LEFT JOIN
+        keeps invoices whose client row is missing (client is left as None).
+        Invoices are LazyInvoice, whose dates are parsed only when first read.
+        """
+        client_columns = ', '.join(f"c.{column} AS client__{column}" for column in CLIENT_COLUMNS)
+        query = f"""
+            SELECT i.*, {client_columns}
+            FROM invoices i
+            {join} clients c ON i.client_id = c.id
+            {where_clause}
+        """
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        if limit is not None:
+            query += " LIMIT ?"
+            params = tuple(params) + (limit,)
+        cursor.execute(query, params)
+        
+        columns = [description[0] for description in cursor.description]
+        read_invoice = LazyInvoice.row_reader(columns)
+        client_id_column = columns.index('client__id')
+        
+        invoices = []
+        clients = {}  # Share one Client object per client_id, as get_client() results are equal
+        for row in cursor:  # Rows are hydrated as they are stepped, not all held at once
+            client = None
+            client_id = row[client_id_column]
+            if client_id is not None:
+                client = clients.get(client_id)
+                if client is None:
+                    client = clients[client_id] = Client.from_row(row, prefix='client__')
+            invoices.append(read_invoice(row, client))
+        
+        return invoices
+    
     def update_invoice_status(self, invoice_id: int, status: str) -> bool:
         """Update invoice status"""
         with self.get_connection() as conn:
@@ -379,11 +754,37 @@ class DatabaseManager:
         """Delete an invoice"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute("DELETE FROM invoice_items WHERE invoice_id = ?", (invoice_id,))
             cursor.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
             conn.commit()
             
             return cursor.rowcount > 0
     
+    def get_revenue_by_item(self, status: Optional[str] = 'Paid') -> List[dict]:
+        """Get quantity and revenue per item description, optionally for one invoice status"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            where_clause = "WHERE i.status = ?" if status else ""
+            params = (status,) if status else ()
+            cursor.execute(f"""
+                SELECT it.description,
+                       COUNT(DISTINCT it.invoice_id) AS invoice_count,
+                       SUM(it.quantity) AS total_quantity,
+                       SUM(it.amount_cents) AS revenue_cents
+                FROM invoice_items it
+                JOIN invoices i ON it.invoice_id = i.id
+                {where_clause}
+                GROUP BY it.description
+                ORDER BY revenue_cents DESC
+            """, params)
+            
+            results = []
+            for row in cursor.fetchall():
+                result = dict(row)
+                result['revenue'] = from_cents(result['revenue_cents'])
+                results.append(result)
+            return results
+    
     # APP SETTINGS OPERATIONS
     
     def get_app_settings(self) -> AppSettings:
@@ -399,7 +800,12 @@ class DatabaseManager:
                 return AppSettings()
     
     def save_app_settings(self, settings: AppSettings) -> AppSettings:
-        """Save application settings"""
+        """Save application settings
+        
+        Existing settings keep their stored next_invoice_number: only the
+        invoice number allocator moves the counter, so saving settings read
+        before invoices were numbered cannot hand those numbers out again.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
@@ -412,6 +818,7 @@ class DatabaseManager:
             if existing:
                 # Update existing settings
                 settings_data.pop('id', None)
+                settings_data.pop('next_invoice_number', None)
                 set_clause = ', '.join([f"{key} = ?" for key in settings_data.keys()])
                 query = f"UPDATE app_settings SET {set_clause} WHERE id = ?"
                 values = list(settings_data.values()) + [existing[0]]
@@ -435,45 +842,328 @@ class DatabaseManager:
     # DASHBOARD & ANALYTICS
     
     def get_dashboard_stats(self) -> dict:
-        """Get dashboard statistics"""
+        """Get dashboard statistics
+        
+        Counts and revenue come from the trigger-maintained dashboard_summary
+        table; only the overdue count, which depends on today's date, is queried,
+        and that is an index range count.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
+            cursor.execute("SELECT metric, value FROM dashboard_summary")
+            summary = dict(cursor.fetchall())
+            
+            invoice_counts = {}
+            status_cents = {}
+            for metric, value in summary.items():
+                kind, _, status = metric.partition(':')
+                if kind == 'invoices':
+                    invoice_counts[status] = value
+                elif kind == 'total_cents':
+                    status_cents[status] = value
+            
             stats = {}
+            stats['total_clients'] = summary.get('clients', 0)
+            stats['total_invoices'] = sum(invoice_counts.values())
+            stats['draft_invoices'] = invoice_counts.get('Draft', 0)
+            stats['sent_invoices'] = invoice_counts.get('Sent', 0)
+            stats['paid_invoices'] = invoice_counts.get('Paid', 0)
+            stats['overdue_invoices'] = self._count_overdue_invoices(cursor)
+            
+            # Revenue is summed in integer cents, so it is exact
+            stats['total_revenue'] = from_cents(status_cents.get('Paid', 0))
+            stats['pending_revenue'] = from_cents(status_cents.get('Sent', 0) + status_cents.get('Draft', 0))
+            
+            return stats
+    
+    def _count_overdue_invoices(self, cursor) -> int:
+        """Count overdue invoices with a range scan of idx_invoice_status_due"""
+        today = datetime.now().date().isoformat()
+        cursor.execute("SELECT COUNT(*) FROM invoices WHERE status = 'Sent' AND due_date < ?", (today,))
+        return cursor.fetchone()[0]
+    
+    # IMPORT OPERATIONS
+    
+    def import_clients(self, rows: List[dict]) -> List[Tuple[int, str]]:
+        """Insert many clients in one transaction; returns (index, error) for rows skipped
+        
+        rows are dicts keyed by IMPORT_CLIENT_COLUMNS (created_date may be left
+        out). Rows whose name is already taken, in the database or earlier in
+        rows, are skipped rather than failing the batch.
+        """
+        rejected = []
+        now = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            existing = self._existing_values(cursor, 'clients', 'name', [row['name'] for row in rows])
+            
+            values = []
+            for index, row in enumerate(rows):
+                if row['name'] in existing:
+                    rejected.append((index, ERROR_MESSAGES["duplicate_client"]))
+                    continue
+                existing.add(row['name'])
+                values.append(tuple(row.get(column) or (now if column == 'created_date' else '')
+                                    for column in IMPORT_CLIENT_COLUMNS))
+            
+            cursor.executemany(f"""
+                INSERT INTO clients ({', '.join(IMPORT_CLIENT_COLUMNS)})
+                VALUES ({', '.join('?' for _ in IMPORT_CLIENT_COLUMNS)})
+            """, values)
+            conn.commit()
+        return rejected
+    
+    def import_invoices(self, invoices: List[dict]) -> List[Tuple[int, str]]:
+        """Insert many invoices and their items in one transaction; returns (index, error) for skipped ones
+        
+        Each invoice is a dict keyed by IMPORT_INVOICE_COLUMNS (id, client_id,
+        invoice_number and the timestamps may be left out) plus 'client', a
+        client name used when client_id is missing, and 'items', a list of
+        (description, quantity, rate_cents, amount_cents). Totals must already
+        be calculated. Invoices without a number get one from a block reserved
+        from the settings counter inside the same transaction. The assigned id
+        and invoice_number are written back into each imported dict.
+        """
+        rejected = []
+        now = datetime.now().isoformat()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
             
-            # Total clients
-            cursor.execute("SELECT COUNT(*) FROM clients")
-            stats['total_clients'] = cursor.fetchone()[0]
+            client_names = {invoice['client'] for invoice in invoices
+                            if not invoice.get('client_id') and invoice.get('client')}
+            client_ids = self._client_ids_by_name(cursor, client_names)
+            known_ids = self._existing_values(cursor, 'clients', 'id', [
+                invoice['client_id'] for invoice in invoices if invoice.get('client_id')])
+            taken = self._existing_values(cursor, 'invoices', 'invoice_number', [
+                invoice['invoice_number'] for invoice in invoices if invoice.get('invoice_number')])
             
-            # Total invoices
-            cursor.execute("SELECT COUNT(*) FROM invoices")
-            stats['total_invoices'] = cursor.fetchone()[0]
+            accepted = []
+            unnumbered = []
+            for index, invoice in enumerate(invoices):
+                client_id = invoice.get('client_id') or client_ids.get(invoice.get('client'))
+                if not client_id or (invoice.get('client_id') and client_id not in known_ids):
+                    rejected.append((index, "Valid client is required"))
+                    continue
+                
+                number = invoice.get('invoice_number')
+                if number:
+                    if number in taken:
+                        rejected.append((index, "Invoice number must be unique"))
+                        continue
+                    taken.add(number)
+                else:
+                    unnumbered.append(invoice)
+                invoice['client_id'] = client_id
+                accepted.append(invoice)
             
-            # Invoices by status
-            cursor.execute("SELECT status, COUNT(*) FROM invoices GROUP BY status")
-            status_counts = dict(cursor.fetchall())
-            stats['draft_invoices'] = status_counts.get('Draft', 0)
-            stats['sent_invoices'] = status_counts.get('Sent', 0)
-            stats['paid_invoices'] = status_counts.get('Paid', 0)
-            stats['overdue_invoices'] = len(self.get_overdue_invoices())
+            for invoice, number in zip(unnumbered, self._allocate_invoice_numbers(cursor, len(unnumbered), taken)):
+                invoice['invoice_number'] = number
             
-            # Total revenue
-            cursor.execute("SELECT SUM(total) FROM invoices WHERE status = 'Paid'")
-            result = cursor.fetchone()[0]
-            stats['total_revenue'] = result if result else 0.0
+            # Ids are assigned up front so line items can be inserted with executemany too
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'invoices'")
+            row = cursor.fetchone()
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM invoices")
+            next_id = max(row[0] if row else 0, cursor.fetchone()[0]) + 1
             
-            # Pending revenue
-            cursor.execute("SELECT SUM(total) FROM invoices WHERE status IN ('Sent', 'Draft')")
-            result = cursor.fetchone()[0]
-            stats['pending_revenue'] = result if result else 0.0
+            invoice_rows = []
+            item_rows = []
+            for invoice_id, invoice in enumerate(accepted, next_id):
+                invoice['id'] = invoice_id
+                invoice.setdefault('created_date', now)
+                invoice.setdefault('updated_date', now)
+                invoice_rows.append(tuple(invoice.get(column) for column in IMPORT_INVOICE_COLUMNS))
+                item_rows.extend((invoice_id, position, *item) for position, item in enumerate(invoice['items']))
             
-            return stats
+            cursor.executemany(f"""
+                INSERT INTO invoices ({', '.join(IMPORT_INVOICE_COLUMNS)})
+                VALUES ({', '.join('?' for _ in IMPORT_INVOICE_COLUMNS)})
+            """, invoice_rows)
+            cursor.executemany(INSERT_ITEM_SQL, item_rows)
+            conn.commit()
+        return rejected
+    
+    def _allocate_invoice_numbers(self, cursor, count: int, taken: set = frozenset()) -> List[str]:
+        """Take count unused invoice numbers from the settings counter
+        
+        Must run inside a write transaction (BEGIN IMMEDIATE), which keeps the
+        counter update and the rows using the numbers atomic. Numbers already in
+        use, or in taken, are skipped so they are never handed out twice.
+        """
+        numbers = []
+        while len(numbers) < count:
+            wanted = count - len(numbers)
+            cursor.execute("""
+                UPDATE app_settings SET next_invoice_number = next_invoice_number + ?
+                WHERE id = (SELECT MIN(id) FROM app_settings)
+                RETURNING next_invoice_number - ?, invoice_number_format
+            """, (wanted, wanted))
+            start, number_format = cursor.fetchone()
+            
+            candidates = [number_format.format(n) for n in range(start, start + wanted)]
+            in_use = self._existing_values(cursor, 'invoices', 'invoice_number', candidates)
+            numbers.extend(number for number in candidates if number not in in_use and number not in taken)
+        return numbers
+    
+    def _client_ids_by_name(self, cursor, names) -> dict:
+        """Map client names to ids for the names that exist"""
+        cursor.execute("""
+            SELECT name, id FROM clients
+            WHERE name IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(names)),))
+        return {row['name']: row['id'] for row in cursor.fetchall()}
+    
+    def _existing_values(self, cursor, table: str, column: str, values: list) -> set:
+        """The subset of values present in table.column, looked up in one query"""
+        if not values:
+            return set()
+        cursor.execute(f"""
+            SELECT {column} FROM {table}
+            WHERE {column} IN (SELECT value FROM json_each(?))
+        """, (json.dumps(values),))
+        return {row[0] for row in cursor.fetchall()}
+    
+    # EXPORT OPERATIONS
+    
+    def iter_invoice_export_rows(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[tuple]:
+        """Stream every invoice, newest first, as a plain tuple
+        
+        Yields (invoice_number, client_name, invoice_date, due_date, total_cents,
+        status) with dates as YYYY-MM-DD. Rows are read batch_size at a time from
+        one cursor, so memory stays flat however many invoices there are.
+        """
+        yield from self._iter_rows("""
+            SELECT COALESCE(NULLIF(i.invoice_number, ''), printf('INV-%04d', i.id)),
+                   COALESCE(c.name, 'Unknown'),
+                   substr(i.invoice_date, 1, 10),
+                   substr(i.due_date, 1, 10),
+                   i.total_cents,
+                   i.status
+            FROM invoices i
+            LEFT JOIN clients c ON i.client_id = c.id
+            ORDER BY i.created_date DESC, i.id DESC
+        """, batch_size=batch_size)
+    
+    def iter_client_export_rows(self, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[tuple]:
+        """Stream every client, by name, as a plain tuple
+        
+        Yields (name, email, phone, address, city, state, zip_code, country).
+        """
+        yield from self._iter_rows("""
+            SELECT name, email, phone, address, city, state, zip_code, country
+            FROM clients
+            ORDER BY name, id
+        """, batch_size=batch_size)
+    
+    def iter_invoice_analytics_batches(self, updated_after: Optional[str] = None,
+                                       batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Stream invoices by id in lists of up to batch_size typed tuples
+        
+        Each tuple is (id, invoice_number, client_id, invoice_date, due_date,
+        status, subtotal_cents, tax_rate, tax_amount_cents, total_cents, currency,
+        payment_terms, created_date, updated_date); invoice and due dates are
+        YYYY-MM-DD, the other dates ISO timestamps. With updated_after (an ISO
+        timestamp), only invoices saved since then are returned.
+        """
+        where_clause, params = ("WHERE updated_date > ?", (updated_after,)) if updated_after else ("", ())
+        yield from self._iter_batches(f"""
+            SELECT id, invoice_number, client_id,
+                   substr(invoice_date, 1, 10), substr(due_date, 1, 10), status,
+                   subtotal_cents, tax_rate, tax_amount_cents, total_cents,
+                   currency, payment_terms, created_date, updated_date
+            FROM invoices
+            {where_clause}
+            ORDER BY id
+        """, params, batch_size)
+    
+    def iter_line_item_analytics_batches(self, updated_after: Optional[str] = None,
+                                         batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Stream line items by invoice in lists of up to batch_size tuples
+        
+        Each tuple is (id, invoice_id, position, description, quantity,
+        rate_cents, amount_cents). updated_after selects the items of the same
+        invoices as iter_invoice_analytics_batches.
+        """
+        where_clause, params = ("WHERE i.updated_date > ?", (updated_after,)) if updated_after else ("", ())
+        yield from self._iter_batches(f"""
+            SELECT it.id, it.invoice_id, it.position, it.description,
+                   it.quantity, it.rate_cents, it.amount_cents
+            FROM invoice_items it
+            JOIN invoices i ON it.invoice_id = i.id
+            {where_clause}
+            ORDER BY it.invoice_id, it.position
+        """, params, batch_size)
+    
+    def iter_client_analytics_batches(self, updated_after: Optional[str] = None,
+                                      batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Stream clients by id in lists of up to batch_size tuples
+        
+        Each tuple is (id, name, email, phone, address, city, state, zip_code,
+        country, created_date, updated_date). With updated_after (an ISO
+        timestamp), only clients added or changed since then.
+        """
+        where_clause, params = ("WHERE u.updated_date > ?", (updated_after,)) if updated_after else ("", ())
+        yield from self._iter_batches(f"""
+            SELECT c.id, c.name, c.email, c.phone, c.address, c.city, c.state, c.zip_code, c.country,
+                   c.created_date, u.updated_date
+            FROM clients c
+            LEFT JOIN client_updates u ON u.client_id = c.id
+            {where_clause}
+            ORDER BY c.id
+        """, params, batch_size)
+    
+    def iter_deletion_analytics_batches(self, after_id: Optional[int] = None,
+                                        batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Stream recorded invoice and client deletions by id in lists of up to batch_size tuples
+        
+        Each tuple is (id, table_name, row_id, deleted_date). With after_id, only
+        deletions recorded after that id.
+        """
+        where_clause, params = ("WHERE id > ?", (after_id,)) if after_id is not None else ("", ())
+        yield from self._iter_batches(f"""
+            SELECT id, table_name, row_id, deleted_date
+            FROM deletions
+            {where_clause}
+            ORDER BY id
+        """, params, batch_size)
+    
+    def get_last_deletion_id(self) -> Optional[int]:
+        """Id of the most recently recorded deletion, or None if there are none"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT MAX(id) FROM deletions")
+            return cursor.fetchone()[0]
+    
+    def _iter_rows(self, query: str, params: tuple = (), batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[tuple]:
+        """Run query and yield its rows as tuples, fetching batch_size rows at a time"""
+        for rows in self._iter_batches(query, params, batch_size):
+            yield from rows
+    
+    def _iter_batches(self, query: str, params: tuple = (),
+                      batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[tuple]]:
+        """Run query and yield its rows in lists of up to batch_size tuples"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None  # Plain tuples; no sqlite3.Row per row
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
     
     def backup_database(self, backup_path: str) -> bool:
         """Create a backup of the database"""
         try:
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # Use the online backup API so pages still in the WAL are included
+            with self.get_connection() as conn:
+                backup_conn = sqlite3.connect(backup_path)
+                try:
+                    conn.backup(backup_conn)
+                finally:
+                    backup_conn.close()
             
             # Update last backup time
             settings = self.get_app_settings()
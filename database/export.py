@@ -0,0 +1,385 @@
+# File: export.py
+# Location: InvoiceGeneratorPro/database/export.py
+
+import csv
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .db_manager import DatabaseManager
+from utils.calculations import from_cents
+from config import EXPORT_BATCH_SIZE, ANALYTICS_BATCH_SIZE, ANALYTICS_SNAPSHOT_PAGES
+
+INVOICE_CSV_HEADER = ['Invoice Number', 'Client', 'Date', 'Due Date', 'Amount', 'Status']
+CLIENT_CSV_HEADER = ['Name', 'Email', 'Phone', 'Address', 'City', 'State', 'ZIP', 'Country']
+
+# progress(label, rows_written, total_rows) - total_rows may be None when unknown
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+
+def write_csv(path: str, header: List[str], rows: Iterable[tuple], compress: bool = False,
+              batch_size: int = EXPORT_BATCH_SIZE, label: str = '', total: Optional[int] = None,
+              progress: Optional[ProgressCallback] = None) -> int:
+    """Write rows to a CSV file batch_size rows at a time; returns the row count
+    
+    rows may be any iterable, e.g. a DatabaseManager row generator, and is
+    consumed lazily. With compress=True the file is gzip-compressed.
+    """
+    if compress:
+        f = gzip.open(path, 'wt', newline='', encoding='utf-8')
+    else:
+        f = open(path, 'w', newline='', encoding='utf-8')
+    
+    written = 0
+    with f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            writer.writerows(batch)
+            written += len(batch)
+            if progress is not None:
+                progress(label, written, total)
+    
+    return written
+
+def _invoice_csv_rows(db_manager: DatabaseManager, batch_size: int):
+    """Invoice export rows with the amount formatted as a decimal"""
+    for number, client_name, invoice_date, due_date, total_cents, status in \
+            db_manager.iter_invoice_export_rows(batch_size):
+        yield number, client_name, invoice_date, due_date, f"{from_cents(total_cents):.2f}", status
+
+def export_csv(db_manager: DatabaseManager, export_dir: str, compress: bool = False,
+               batch_size: int = EXPORT_BATCH_SIZE, progress: Optional[ProgressCallback] = None) -> List[str]:
+    """Export invoices and clients as CSV files in export_dir; returns the file paths
+    
+    Rows stream from SQLite to disk without building model objects, so this is
+    safe to run on a background thread against databases of any size.
+    """
+    os.makedirs(export_dir, exist_ok=True)
+    date_str = datetime.now().strftime('%Y%m%d')
+    extension = '.csv.gz' if compress else '.csv'
+    stats = db_manager.get_dashboard_stats()
+    
+    invoice_file = os.path.join(export_dir, f"invoices_export_{date_str}{extension}")
+    write_csv(invoice_file, INVOICE_CSV_HEADER, _invoice_csv_rows(db_manager, batch_size),
+              compress=compress, batch_size=batch_size, label='invoices',
+              total=stats['total_invoices'], progress=progress)
+    
+    client_file = os.path.join(export_dir, f"clients_export_{date_str}{extension}")
+    write_csv(client_file, CLIENT_CSV_HEADER, db_manager.iter_client_export_rows(batch_size),
+              compress=compress, batch_size=batch_size, label='clients',
+              total=stats['total_clients'], progress=progress)
+    
+    return [invoice_file, client_file]
+
+# ---------------------------------------------------------------------------
+# Columnar (analytics) export. pyarrow is optional and only imported here.
+
+ANALYTICS_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Remembers how far incremental exports have got, per export directory
+ANALYTICS_STATE_FILE = '_export_state.json'
+
+# Column names and kinds, in the order the DatabaseManager analytics queries return them.
+# Money columns arrive as integer cents and are written as exact decimals.
+INVOICE_ANALYTICS_COLUMNS = [
+    ('id', 'int'), ('invoice_number', 'string'), ('client_id', 'int'),
+    ('invoice_date', 'date'), ('due_date', 'date'), ('status', 'string'),
+    ('subtotal', 'money'), ('tax_rate', 'float'), ('tax_amount', 'money'), ('total', 'money'),
+    ('currency', 'string'), ('payment_terms', 'string'),
+    ('created_date', 'timestamp'), ('updated_date', 'timestamp'),
+]
+
+LINE_ITEM_ANALYTICS_COLUMNS = [
+    ('id', 'int'), ('invoice_id', 'int'), ('position', 'int'), ('description', 'string'),
+    ('quantity', 'float'), ('rate', 'money'), ('amount', 'money'),
+]
+
+CLIENT_ANALYTICS_COLUMNS = [
+    ('id', 'int'), ('name', 'string'), ('email', 'string'), ('phone', 'string'),
+    ('address', 'string'), ('city', 'string'), ('state', 'string'), ('zip_code', 'string'),
+    ('country', 'string'), ('created_date', 'timestamp'), ('updated_date', 'timestamp'),
+]
+
+DELETION_ANALYTICS_COLUMNS = [
+    ('id', 'int'), ('table_name', 'string'), ('row_id', 'int'), ('deleted_date', 'timestamp'),
+]
+
+_pyarrow = None
+
+def _load_pyarrow():
+    """Import pyarrow on first use; returns None when it is not installed"""
+    global _pyarrow
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.ipc
+            import pyarrow.parquet
+            _pyarrow = pyarrow
+        except ImportError:
+            _pyarrow = False
+    return _pyarrow or None
+
+def _arrow_type(pa, kind: str):
+    """Arrow type for a column kind"""
+    return {
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'string': pa.string(),
+        'date': pa.date32(),
+        'timestamp': pa.timestamp('us'),
+        'money': pa.decimal128(19, 2),  # Any int64 number of cents fits
+    }[kind]
+
+def _arrow_schema(pa, columns: List[Tuple[str, str]]):
+    """Arrow schema for a column list"""
+    return pa.schema([(name, _arrow_type(pa, kind)) for name, kind in columns])
+
+def _record_batch(pa, schema, columns: List[Tuple[str, str]], rows: List[tuple]):
+    """Convert a list of row tuples into a typed Arrow record batch"""
+    arrays = []
+    for (name, kind), values in zip(columns, zip(*rows)):
+        if kind in ('date', 'timestamp'):
+            # Stored as ISO strings; Arrow parses them in bulk
+            arrays.append(pa.array(values, pa.string()).cast(_arrow_type(pa, kind)))
+        elif kind == 'money':
+            cents = pa.array(values, pa.int64()).cast(pa.decimal128(19, 0))
+            amounts = pa.compute.multiply(cents, pa.scalar(Decimal('0.01'), pa.decimal128(3, 2)))
+            arrays.append(amounts.cast(_arrow_type(pa, kind)))
+        else:
+            arrays.append(pa.array(values, _arrow_type(pa, kind)))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def _open_writer(pa, path: str, schema, fmt: str):
+    """Columnar file writer for fmt"""
+    if fmt == 'parquet':
+        return pa.parquet.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
+
+def write_columnar(path: str, columns: List[Tuple[str, str]], batches: Iterator[List[tuple]],
+                   fmt: str = 'parquet', label: str = '',
+                   progress: Optional[ProgressCallback] = None) -> int:
+    """Write batches of row tuples to one Parquet or Arrow IPC file; returns the row count
+    
+    Each batch becomes one row group (Parquet) or record batch (Arrow). The file
+    is written under a temporary name and only appears once complete; nothing is
+    written when there are no rows.
+    """
+    pa = _load_pyarrow()
+    if pa is None:
+        raise ImportError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)")
+    if fmt not in ANALYTICS_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    
+    schema = _arrow_schema(pa, columns)
+    temp_path = f"{path}.tmp"
+    writer = None
+    written = 0
+    try:
+        for rows in batches:
+            if writer is None:
+                writer = _open_writer(pa, temp_path, schema, fmt)
+            writer.write_batch(_record_batch(pa, schema, columns, rows))
+            written += len(rows)
+            if progress is not None:
+                progress(label, written, None)
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    if writer is not None:
+        os.replace(temp_path, path)
+    return written
+
+def _read_analytics_state(export_dir: str) -> dict:
+    """Watermarks left by the previous incremental export, if any"""
+    try:
+        with open(os.path.join(export_dir, ANALYTICS_STATE_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def _write_analytics_state(export_dir: str, state: dict):
+    """Save the watermarks for the next incremental export, replacing the file atomically"""
+    path = os.path.join(export_dir, ANALYTICS_STATE_FILE)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, path)
+
+def _remove_earlier_runs(export_dir: str, tables: List[str], run: str):
+    """Delete every partition of tables except those of run"""
+    for table in tables:
+        table_dir = os.path.join(export_dir, table)
+        if not os.path.isdir(table_dir):
+            continue
+        for name in os.listdir(table_dir):
+            if name != f"run={run}":
+                shutil.rmtree(os.path.join(table_dir, name))
+
+def _uses_wal(db_manager: DatabaseManager) -> bool:
+    """Whether the database is in WAL mode, where readers never block writers"""
+    with db_manager.get_connection() as conn:
+        return conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+
+@contextmanager
+def _read_snapshot(db_manager: DatabaseManager) -> Iterator[DatabaseManager]:
+    """Yield a DatabaseManager whose reads all see the same snapshot of the database
+    
+    In WAL mode a read transaction gives that without blocking writers. With a
+    rollback journal the same transaction would hold a SHARED lock for the
+    whole export, so every save would wait and then fail with "database is
+    locked"; instead the database is copied with the backup API, a few pages
+    per step so saves can get in between steps, and the copy is read.
+    """
+    if _uses_wal(db_manager):
+        with db_manager.get_connection() as conn:
+            conn.execute("BEGIN")
+            yield db_manager
+            conn.rollback()
+        return
+    
+    with tempfile.TemporaryDirectory(prefix='export-') as temp_dir:
+        snapshot_path = os.path.join(temp_dir, 'snapshot.db')
+        target = sqlite3.connect(snapshot_path)
+        try:
+            with db_manager.get_connection() as conn:
+                conn.backup(target, pages=ANALYTICS_SNAPSHOT_PAGES, sleep=0.01)
+        finally:
+            target.close()
+        
+        snapshot = DatabaseManager(snapshot_path, tuning=False)
+        try:
+            yield snapshot
+        finally:
+            snapshot.close()
+
+def export_analytics(db_manager: DatabaseManager, export_dir: str, fmt: str = 'parquet',
+                     incremental: bool = True, batch_size: int = ANALYTICS_BATCH_SIZE,
+                     progress: Optional[ProgressCallback] = None) -> Dict[str, Optional[str]]:
+    """Export invoices, line items and clients as typed columnar datasets
+    
+    Each run writes one partition per table, export_dir/<table>/run=<timestamp>/,
+    readable as a hive-partitioned dataset. A full run (incremental=False)
+    replaces all earlier partitions. With incremental=True a run only writes
+    what changed since the previous one:
+    
+    - invoices saved since then, each with its complete current set of line
+      items (possibly none), so edited and removed items are covered;
+    - clients added or edited since then;
+    - a deletions table of invoices and clients deleted since then, as
+      (table_name, row_id) pairs.
+    
+    To read the current state, the latest partition per invoice id wins: take
+    each invoice, and all of its line items, from the latest run that exported
+    that invoice, ignoring its line items from earlier runs. Clients likewise
+    take their latest row per id. Then drop invoices and clients listed in
+    deletions; ids are never reused. Returns the file written per table, or None
+    for tables with nothing new.
+    
+    Unless the database is in WAL mode, an incremental run after the first
+    reads its changed rows into memory in one short transaction; other runs
+    export from a copy of the database so saves are not blocked meanwhile.
+    """
+    extension = ANALYTICS_FORMATS.get(fmt)
+    if extension is None:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if _load_pyarrow() is None:
+        raise ImportError("pyarrow is required for Parquet/Arrow export (pip install pyarrow)")
+    
+    state = _read_analytics_state(export_dir) if incremental else {}
+    updated_after = state.get('invoices_updated_after')
+    clients_updated_after = state.get('clients_updated_after')
+    deletions_after_id = state.get('deletions_after_id')
+    
+    run = datetime.now().strftime('%Y%m%dT%H%M%S%f')
+    new_state = dict(state)
+    new_state.pop('clients_after_id', None)  # Older watermark, replaced by clients_updated_after
+    
+    def track(batches, key, pick):
+        """Pass batches through, recording the watermark for the next run"""
+        for rows in batches:
+            value = max(pick(row) for row in rows)
+            if value and (new_state.get(key) is None or value > new_state[key]):
+                new_state[key] = value
+            yield rows
+    
+    table_names = ['invoices', 'line_items', 'clients']
+    if incremental:
+        # A full run has nothing to delete from, as it replaces the earlier partitions
+        table_names.append('deletions')
+    
+    def read_tables(source):
+        """The row batches to export per table, read lazily from source"""
+        tables = [
+            ('invoices', INVOICE_ANALYTICS_COLUMNS,
+             track(source.iter_invoice_analytics_batches(updated_after, batch_size),
+                   'invoices_updated_after', lambda row: row[-1] or '')),
+            ('line_items', LINE_ITEM_ANALYTICS_COLUMNS,
+             source.iter_line_item_analytics_batches(updated_after, batch_size)),
+            ('clients', CLIENT_ANALYTICS_COLUMNS,
+             track(source.iter_client_analytics_batches(clients_updated_after, batch_size),
+                   'clients_updated_after', lambda row: row[-1] or '')),
+        ]
+        if incremental:
+            tables.append(('deletions', DELETION_ANALYTICS_COLUMNS,
+                           track(source.iter_deletion_analytics_batches(deletions_after_id, batch_size),
+                                 'deletions_after_id', lambda row: row[0])))
+        else:
+            new_state['deletions_after_id'] = source.get_last_deletion_id()
+        return tables
+    
+    files = {}
+    
+    def write_tables(tables):
+        """Write one partition per table"""
+        for table, columns, batches in tables:
+            partition_dir = os.path.join(export_dir, table, f"run={run}")
+            os.makedirs(partition_dir, exist_ok=True)
+            path = os.path.join(partition_dir, f"part-0{extension}")
+            if write_columnar(path, columns, batches, fmt=fmt, label=table, progress=progress):
+                files[table] = path
+            else:
+                os.rmdir(partition_dir)
+                files[table] = None
+    
+    try:
+        # Every table comes from the same snapshot
+        if incremental and state and not _uses_wal(db_manager):
+            # Only rows changed since the last run are needed: read them in one
+            # short transaction, then write them, rather than copy the database
+            with db_manager.get_connection() as conn:
+                conn.execute("BEGIN")
+                tables = [(table, columns, list(batches)) for table, columns, batches in read_tables(db_manager)]
+                conn.rollback()
+            write_tables(tables)
+        else:
+            with _read_snapshot(db_manager) as source:
+                write_tables(read_tables(source))
+    except BaseException:
+        # Leave the dataset as the previous run left it
+        for table in table_names:
+            shutil.rmtree(os.path.join(export_dir, table, f"run={run}"), ignore_errors=True)
+        raise
+    
+    # A full run replaces earlier partitions only once all of its own are on disk
+    if not incremental:
+        _remove_earlier_runs(export_dir, table_names + ['deletions'], run)
+    
+    # Only move the watermarks once every table of this run is on disk
+    _write_analytics_state(export_dir, new_state)
+    
+    return files
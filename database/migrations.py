@@ -0,0 +1,671 @@
+# File: migrations.py
+# Location: InvoiceGeneratorPro/database/migrations.py
+
+import json
+import sqlite3
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Callable, Dict, List, Optional
+
+from config import MIGRATION_CHUNK_SIZE
+
+# progress(label, rows_done, total_rows) - label is the running step's description
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+
+class MigrationError(Exception):
+    """A migration step could not be applied; the database keeps its previous version"""
+
+# Table definitions, shared by the create and rebuild steps. Money columns hold
+# integer cents.
+INVOICES_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        invoice_number TEXT UNIQUE NOT NULL,
+        client_id INTEGER NOT NULL,
+        invoice_date TEXT,
+        due_date TEXT,
+        status TEXT DEFAULT 'Draft',
+        items TEXT,  -- Legacy JSON line items, moved to invoice_items
+        subtotal_cents INTEGER DEFAULT 0,
+        tax_rate REAL DEFAULT 0.0,
+        tax_amount_cents INTEGER DEFAULT 0,
+        total_cents INTEGER DEFAULT 0,
+        notes TEXT,
+        payment_terms TEXT DEFAULT 'Net 30',
+        currency TEXT DEFAULT 'USD',
+        created_date TEXT,
+        updated_date TEXT,
+        company_name TEXT,
+        company_address TEXT,
+        company_phone TEXT,
+        company_email TEXT,
+        company_website TEXT,
+        FOREIGN KEY (client_id) REFERENCES clients (id)
+    )
+'''
+
+INVOICE_ITEMS_TABLE_SQL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        invoice_id INTEGER NOT NULL,
+        position INTEGER NOT NULL DEFAULT 0,
+        description TEXT,
+        quantity REAL DEFAULT 1.0,
+        rate_cents INTEGER DEFAULT 0,
+        amount_cents INTEGER DEFAULT 0,
+        FOREIGN KEY (invoice_id) REFERENCES invoices (id) ON DELETE CASCADE
+    )
+'''
+
+# Full-text search index. clients_fts reads its text from the clients table;
+# invoices_fts stores invoice number, notes and the item descriptions joined
+# together, so one MATCH covers an invoice and its lines. Triggers keep both
+# in sync with the base tables.
+SEARCH_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS clients_fts USING fts5(
+        name, email, city, notes,
+        content='clients', content_rowid='id'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS invoices_fts USING fts5(
+        invoice_number, notes, items
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clients_fts_insert AFTER INSERT ON clients BEGIN
+        INSERT INTO clients_fts (rowid, name, email, city, notes)
+        VALUES (new.id, new.name, new.email, new.city, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clients_fts_delete AFTER DELETE ON clients BEGIN
+        INSERT INTO clients_fts (clients_fts, rowid, name, email, city, notes)
+        VALUES ('delete', old.id, old.name, old.email, old.city, old.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS clients_fts_update AFTER UPDATE ON clients BEGIN
+        INSERT INTO clients_fts (clients_fts, rowid, name, email, city, notes)
+        VALUES ('delete', old.id, old.name, old.email, old.city, old.notes);
+        INSERT INTO clients_fts (rowid, name, email, city, notes)
+        VALUES (new.id, new.name, new.email, new.city, new.notes);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS invoices_fts_insert AFTER INSERT ON invoices BEGIN
+        INSERT INTO invoices_fts (rowid, invoice_number, notes, items)
+        VALUES (new.id, new.invoice_number, new.notes,
+                (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = new.id));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS invoices_fts_delete AFTER DELETE ON invoices BEGIN
+        DELETE FROM invoices_fts WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS invoices_fts_update AFTER UPDATE OF invoice_number, notes ON invoices BEGIN
+        UPDATE invoices_fts SET invoice_number = new.invoice_number, notes = new.notes
+        WHERE rowid = new.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS invoice_items_fts_insert AFTER INSERT ON invoice_items BEGIN
+        UPDATE invoices_fts
+        SET items = (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = new.invoice_id)
+        WHERE rowid = new.invoice_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS invoice_items_fts_delete AFTER DELETE ON invoice_items BEGIN
+        UPDATE invoices_fts
+        SET items = (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = old.invoice_id)
+        WHERE rowid = old.invoice_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS invoice_items_fts_update AFTER UPDATE OF description, invoice_id ON invoice_items BEGIN
+        UPDATE invoices_fts
+        SET items = (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = old.invoice_id)
+        WHERE rowid = old.invoice_id;
+        UPDATE invoices_fts
+        SET items = (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = new.invoice_id)
+        WHERE rowid = new.invoice_id;
+    END
+    """,
+]
+
+# Running totals behind the dashboard, one row per metric:
+#   'clients'               number of clients
+#   'invoices:<status>'     number of invoices with that status
+#   'total_cents:<status>'  sum of their totals
+# Triggers apply each insert, update and delete as a delta, so reading the
+# dashboard never scans the base tables.
+DASHBOARD_SUMMARY_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS dashboard_summary (
+        metric TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dashboard_client_insert AFTER INSERT ON clients BEGIN
+        INSERT INTO dashboard_summary (metric, value) VALUES ('clients', 1)
+        ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dashboard_client_delete AFTER DELETE ON clients BEGIN
+        INSERT INTO dashboard_summary (metric, value) VALUES ('clients', -1)
+        ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dashboard_invoice_insert AFTER INSERT ON invoices BEGIN
+        INSERT INTO dashboard_summary (metric, value)
+        VALUES ('invoices:' || COALESCE(new.status, ''), 1),
+               ('total_cents:' || COALESCE(new.status, ''), COALESCE(new.total_cents, 0))
+        ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dashboard_invoice_delete AFTER DELETE ON invoices BEGIN
+        INSERT INTO dashboard_summary (metric, value)
+        VALUES ('invoices:' || COALESCE(old.status, ''), -1),
+               ('total_cents:' || COALESCE(old.status, ''), -COALESCE(old.total_cents, 0))
+        ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS dashboard_invoice_update AFTER UPDATE OF status, total_cents ON invoices BEGIN
+        INSERT INTO dashboard_summary (metric, value)
+        VALUES ('invoices:' || COALESCE(old.status, ''), -1),
+               ('total_cents:' || COALESCE(old.status, ''), -COALESCE(old.total_cents, 0))
+        ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value;
+        INSERT INTO dashboard_summary (metric, value)
+        VALUES ('invoices:' || COALESCE(new.status, ''), 1),
+               ('total_cents:' || COALESCE(new.status, ''), COALESCE(new.total_cents, 0))
+        ON CONFLICT (metric) DO UPDATE SET value = value + excluded.value;
+    END
+    """,
+]
+
+# Deleted invoices and clients, one row per delete, so incremental analytics
+# exports can pass deletions on. Line items go with their invoice and are not
+# recorded separately.
+DELETIONS_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS deletions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        deleted_date TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deletions_invoice AFTER DELETE ON invoices BEGIN
+        INSERT INTO deletions (table_name, row_id, deleted_date)
+        VALUES ('invoices', old.id, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS deletions_client AFTER DELETE ON clients BEGIN
+        INSERT INTO deletions (table_name, row_id, deleted_date)
+        VALUES ('clients', old.id, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'));
+    END
+    """,
+]
+
+# When each client was last added or changed, kept by triggers so incremental
+# analytics exports can find edited clients. It is a side table rather than a
+# clients column because a trigger stamping clients itself would re-fire the
+# clients_fts update trigger.
+CLIENT_UPDATES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS client_updates (
+        client_id INTEGER PRIMARY KEY,
+        updated_date TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_client_updates_date ON client_updates (updated_date)",
+    """
+    CREATE TRIGGER IF NOT EXISTS client_updates_insert AFTER INSERT ON clients BEGIN
+        INSERT OR REPLACE INTO client_updates (client_id, updated_date)
+        VALUES (new.id, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS client_updates_update AFTER UPDATE ON clients BEGIN
+        INSERT OR REPLACE INTO client_updates (client_id, updated_date)
+        VALUES (new.id, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'));
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS client_updates_delete AFTER DELETE ON clients BEGIN
+        DELETE FROM client_updates WHERE client_id = old.id;
+    END
+    """,
+]
+
+# Line item insert as of the JSON migration; kept here so later changes to the
+# application's own SQL cannot alter what an old step does
+_INSERT_ITEM_SQL = """
+    INSERT INTO invoice_items (invoice_id, position, description, quantity, rate_cents, amount_cents)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Smallest SQLite integer, used as the starting point of id-ordered chunking
+_MIN_ROWID = -2 ** 63
+
+class MigrationContext:
+    """What a migration step works with: a cursor inside the step's transaction
+    and helpers that rewrite large tables in id-ordered chunks, reporting progress
+    after each one.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, label: str, chunk_size: int = MIGRATION_CHUNK_SIZE,
+                 progress: Optional[ProgressCallback] = None):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.label = label
+        self.chunk_size = chunk_size
+        self.progress = progress
+    
+    def execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Run one statement on the step's cursor"""
+        return self.cursor.execute(sql, params)
+    
+    def report(self, done: int, total: Optional[int]):
+        """Pass progress for the running step to the callback, if any"""
+        if self.progress is not None:
+            self.progress(self.label, done, total)
+    
+    def table_exists(self, name: str) -> bool:
+        """Whether a table (or virtual table) exists"""
+        self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        return self.cursor.fetchone() is not None
+    
+    def table_columns(self, table: str) -> List[str]:
+        """Column names of a table"""
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in self.cursor.fetchall()]
+    
+    def count(self, table: str, where: str = "1") -> int:
+        """Number of rows in table matching where"""
+        self.cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}")
+        return self.cursor.fetchone()[0]
+    
+    def chunk_ids(self, table: str, where: str = "1"):
+        """Yield (first_id, last_id) ranges covering the matching rows chunk_size at a time
+        
+        Each range is read just before it is yielded, so the caller may change
+        the rows of one range before asking for the next.
+        """
+        last_id = _MIN_ROWID
+        while True:
+            self.cursor.execute(f"""
+                SELECT MIN(id), MAX(id) FROM (
+                    SELECT id FROM {table} WHERE id > ? AND ({where}) ORDER BY id LIMIT ?
+                )
+            """, (last_id, self.chunk_size))
+            first_id, last_id = self.cursor.fetchone()
+            if first_id is None:
+                return
+            yield first_id, last_id
+    
+    def add_column(self, table: str, column: str, definition: str, backfill: Optional[str] = None):
+        """Add a column if it is missing, then fill it from the SQL expression backfill in chunks"""
+        if column in self.table_columns(table):
+            return
+        self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        if backfill is not None:
+            self.update_in_chunks(table, f"{column} = {backfill}")
+    
+    def update_in_chunks(self, table: str, assignments: str, where: str = "1"):
+        """UPDATE table SET assignments for the rows matching where, chunk by chunk"""
+        total = self.count(table, where)
+        done = 0
+        for first_id, last_id in self.chunk_ids(table, where):
+            self.cursor.execute(f"""
+                UPDATE {table} SET {assignments}
+                WHERE id BETWEEN ? AND ? AND ({where})
+            """, (first_id, last_id))
+            done += self.cursor.rowcount
+            self.report(done, total)
+    
+    def rebuild_table(self, table: str, create_sql: str, expressions: Dict[str, str]):
+        """Recreate a table from create_sql, copying rows across in chunks
+        
+        Use for changes ALTER TABLE cannot make, such as column type changes.
+        Columns of the new table are filled from the SQL expression given in
+        expressions, else from the same-named old column; columns with neither
+        take their default. Indexes and triggers on the old table are dropped
+        with it, so a later step must recreate them. The step should set
+        foreign_keys_off, or dropping the old table cascades into child rows.
+        """
+        new_table = f"{table}_new"
+        old_columns = self.table_columns(table)
+        self.cursor.execute(f"DROP TABLE IF EXISTS {new_table}")
+        self.cursor.execute(create_sql.format(table=new_table))
+        
+        target_columns = []
+        source_expressions = []
+        for column in self.table_columns(new_table):
+            if column in expressions:
+                target_columns.append(column)
+                source_expressions.append(expressions[column])
+            elif column in old_columns:
+                target_columns.append(column)
+                source_expressions.append(column)
+        
+        total = self.count(table)
+        done = 0
+        for first_id, last_id in self.chunk_ids(table):
+            self.cursor.execute(f"""
+                INSERT INTO {new_table} ({', '.join(target_columns)})
+                SELECT {', '.join(source_expressions)} FROM {table}
+                WHERE id BETWEEN ? AND ?
+            """, (first_id, last_id))
+            done += self.cursor.rowcount
+            self.report(done, total)
+        
+        self.cursor.execute(f"DROP TABLE {table}")
+        self.cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step. apply(ctx) runs inside a transaction that also records version."""
+    version: int
+    description: str
+    apply: Callable[[MigrationContext], None]
+    foreign_keys_off: bool = False  # Needed by table rebuilds; toggled outside the transaction
+
+# ---------------------------------------------------------------------------
+# Steps. Databases created before versioning (user_version 0) may be in any
+# earlier state, so every step checks what is already there before acting.
+
+def _create_base_tables(ctx: MigrationContext):
+    """Clients, invoices, line items and settings"""
+    ctx.execute('''
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            email TEXT,
+            phone TEXT,
+            address TEXT,
+            city TEXT,
+            state TEXT,
+            zip_code TEXT,
+            country TEXT,
+            created_date TEXT,
+            notes TEXT
+        )
+    ''')
+    ctx.execute(INVOICES_TABLE_SQL.format(table='invoices'))
+    ctx.execute(INVOICE_ITEMS_TABLE_SQL.format(table='invoice_items'))
+    ctx.execute('''
+        CREATE TABLE IF NOT EXISTS app_settings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            company_name TEXT,
+            company_address TEXT,
+            company_phone TEXT,
+            company_email TEXT,
+            company_website TEXT,
+            default_currency TEXT DEFAULT 'USD',
+            default_tax_rate REAL DEFAULT 0.0,
+            default_payment_terms TEXT DEFAULT 'Net 30',
+            invoice_number_format TEXT DEFAULT 'INV-{:04d}',
+            next_invoice_number INTEGER DEFAULT 1,
+            auto_backup INTEGER DEFAULT 1,
+            backup_frequency INTEGER DEFAULT 7,
+            last_backup TEXT
+        )
+    ''')
+
+def _recompute_invoice_totals(ctx: MigrationContext, first_id: int, last_id: int):
+    """Set the totals of invoices in an id range from their converted line items
+    
+    Items and totals are rounded to the cent separately on conversion, so the
+    stored totals of an invoice with sub-cent rates can drift from its items.
+    Invoices without items keep their stored totals. Tax is the subtotal times
+    the rate (to 4 decimal places), rounded half-up, as the app calculates it.
+    """
+    ctx.execute("""
+        SELECT i.id, i.tax_rate, SUM(it.amount_cents)
+        FROM invoices i
+        JOIN invoice_items it ON it.invoice_id = i.id
+        WHERE i.id BETWEEN ? AND ?
+        GROUP BY i.id
+    """, (first_id, last_id))
+    
+    updates = []
+    for invoice_id, tax_rate, subtotal_cents in ctx.cursor.fetchall():
+        rate_units = round((tax_rate or 0.0) * 10000)
+        tax_units, remainder = divmod(abs(subtotal_cents * rate_units), 10000)
+        if remainder * 2 >= 10000:
+            tax_units += 1
+        tax_amount_cents = tax_units if subtotal_cents * rate_units >= 0 else -tax_units
+        updates.append((subtotal_cents, tax_amount_cents, subtotal_cents + tax_amount_cents, invoice_id))
+    
+    ctx.cursor.executemany("""
+        UPDATE invoices SET subtotal_cents = ?, tax_amount_cents = ?, total_cents = ?
+        WHERE id = ?
+    """, updates)
+
+def _money_to_cents(ctx: MigrationContext):
+    """Rebuild REAL money columns as integer cents"""
+    if 'subtotal' in ctx.table_columns('invoices'):
+        ctx.rebuild_table('invoices', INVOICES_TABLE_SQL, {
+            'subtotal_cents': 'CAST(ROUND(subtotal * 100) AS INTEGER)',
+            'tax_amount_cents': 'CAST(ROUND(tax_amount * 100) AS INTEGER)',
+            'total_cents': 'CAST(ROUND(total * 100) AS INTEGER)'
+        })
+    if 'rate' in ctx.table_columns('invoice_items'):
+        ctx.rebuild_table('invoice_items', INVOICE_ITEMS_TABLE_SQL, {
+            'rate_cents': 'CAST(ROUND(rate * 100) AS INTEGER)',
+            'amount_cents': 'CAST(ROUND(amount * 100) AS INTEGER)'
+        })
+        for first_id, last_id in ctx.chunk_ids('invoices'):
+            _recompute_invoice_totals(ctx, first_id, last_id)
+
+def _create_indexes(ctx: MigrationContext):
+    """Lookup, list paging and overdue indexes"""
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_client_name ON clients (name)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_number ON invoices (invoice_number)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_client ON invoices (client_id)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_status ON invoices (status)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_date ON invoices (invoice_date)')
+    # Keyset pagination seeks on (created_date, id); id rides along as the rowid
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_created ON invoices (created_date)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_status_created ON invoices (status, created_date)')
+    # Overdue lookups and counts range-scan on (status, due_date)
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_status_due ON invoices (status, due_date)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_items_invoice ON invoice_items (invoice_id, position)')
+    ctx.execute('CREATE INDEX IF NOT EXISTS idx_invoice_items_description ON invoice_items (description)')
+
+def _json_item_values(item_data: dict) -> tuple:
+    """(description, quantity, rate_cents, amount_cents) for one legacy JSON line item
+    
+    Kept here rather than going through the models so the step converts the
+    same way whatever the models become. Decimal rates round half-up to the cent;
+    the amount is quantity (to 4 decimal places) times rate, rounded half-up.
+    """
+    if 'rate_cents' in item_data:
+        rate_cents = item_data['rate_cents']
+    else:
+        try:
+            rate = Decimal(str(item_data.get('rate', 0.0)))
+            rate_cents = int(rate.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) * 100)
+        except (InvalidOperation, ValueError, TypeError):
+            rate_cents = 0
+    quantity = item_data.get('quantity', 1.0)
+    
+    quantity_units = round(quantity * 10000)
+    amount_units, remainder = divmod(abs(quantity_units * rate_cents), 10000)
+    if remainder * 2 >= 10000:
+        amount_units += 1
+    amount_cents = amount_units if quantity_units * rate_cents >= 0 else -amount_units
+    return item_data.get('description', ""), quantity, rate_cents, amount_cents
+
+def _move_items_json(ctx: MigrationContext):
+    """Move invoices.items JSON into the invoice_items table"""
+    total = ctx.count('invoices', "items IS NOT NULL")
+    done = 0
+    for first_id, last_id in ctx.chunk_ids('invoices', "items IS NOT NULL"):
+        ctx.execute("""
+            SELECT id, items FROM invoices
+            WHERE id BETWEEN ? AND ? AND items IS NOT NULL AND items NOT IN ('', '[]')
+        """, (first_id, last_id))
+        
+        item_rows = []
+        for invoice_id, items_json in ctx.cursor.fetchall():
+            for position, item_data in enumerate(json.loads(items_json)):
+                item_rows.append((invoice_id, position) + _json_item_values(item_data))
+        
+        ctx.cursor.executemany(_INSERT_ITEM_SQL, item_rows)
+        _recompute_invoice_totals(ctx, first_id, last_id)
+        ctx.execute("UPDATE invoices SET items = NULL WHERE id BETWEEN ? AND ? AND items IS NOT NULL",
+                    (first_id, last_id))
+        done += ctx.cursor.rowcount
+        ctx.report(done, total)
+
+def _create_search_index(ctx: MigrationContext):
+    """FTS5 search tables and their triggers, filled on first creation"""
+    clients_fts_exists = ctx.table_exists('clients_fts')
+    invoices_fts_exists = ctx.table_exists('invoices_fts')
+    
+    for statement in SEARCH_INDEX_SQL:
+        ctx.execute(statement)
+    
+    if not clients_fts_exists:
+        # Name matches outrank email, city and notes matches
+        ctx.execute("INSERT INTO clients_fts (clients_fts, rank) VALUES ('rank', 'bm25(10.0, 5.0, 2.0, 1.0)')")
+        ctx.execute("INSERT INTO clients_fts (clients_fts) VALUES ('rebuild')")
+    if not invoices_fts_exists:
+        ctx.execute("INSERT INTO invoices_fts (invoices_fts, rank) VALUES ('rank', 'bm25(10.0, 2.0, 1.0)')")
+        total = ctx.count('invoices')
+        done = 0
+        for first_id, last_id in ctx.chunk_ids('invoices'):
+            ctx.execute("""
+                INSERT INTO invoices_fts (rowid, invoice_number, notes, items)
+                SELECT i.id, i.invoice_number, i.notes,
+                       (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = i.id)
+                FROM invoices i
+                WHERE i.id BETWEEN ? AND ?
+            """, (first_id, last_id))
+            done += ctx.cursor.rowcount
+            ctx.report(done, total)
+
+def _create_dashboard_summary(ctx: MigrationContext):
+    """Dashboard summary table and triggers, filled on first creation"""
+    exists = ctx.table_exists('dashboard_summary')
+    
+    for statement in DASHBOARD_SUMMARY_SQL:
+        ctx.execute(statement)
+    
+    if not exists:
+        rebuild_dashboard_summary(ctx.cursor)
+
+def rebuild_dashboard_summary(cursor):
+    """Recompute every dashboard metric from the base tables"""
+    cursor.execute("DELETE FROM dashboard_summary")
+    cursor.execute("INSERT INTO dashboard_summary (metric, value) SELECT 'clients', COUNT(*) FROM clients")
+    cursor.execute("""
+        INSERT INTO dashboard_summary (metric, value)
+        SELECT 'invoices:' || COALESCE(status, ''), COUNT(*) FROM invoices GROUP BY status
+    """)
+    cursor.execute("""
+        INSERT INTO dashboard_summary (metric, value)
+        SELECT 'total_cents:' || COALESCE(status, ''), COALESCE(SUM(total_cents), 0) FROM invoices GROUP BY status
+    """)
+
+def _create_deletions(ctx: MigrationContext):
+    """Deletions table and the triggers that fill it"""
+    for statement in DELETIONS_SQL:
+        ctx.execute(statement)
+
+def _track_client_updates(ctx: MigrationContext):
+    """client_updates table and its triggers, filled from created_date on first creation"""
+    exists = ctx.table_exists('client_updates')
+    
+    for statement in CLIENT_UPDATES_SQL:
+        ctx.execute(statement)
+    
+    if not exists:
+        ctx.execute("""
+            INSERT INTO client_updates (client_id, updated_date)
+            SELECT id, COALESCE(created_date, strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'))
+            FROM clients
+        """)
+
+# Ordered by version. Append new steps with the next version; never edit or
+# renumber a step that has shipped.
+MIGRATIONS = [
+    Migration(1, "Create base tables", _create_base_tables),
+    Migration(2, "Store money as integer cents", _money_to_cents, foreign_keys_off=True),
+    Migration(3, "Create indexes", _create_indexes),
+    Migration(4, "Move line items out of invoices.items", _move_items_json),
+    Migration(5, "Create search index", _create_search_index),
+    Migration(6, "Create dashboard summary", _create_dashboard_summary),
+    Migration(7, "Record deletions", _create_deletions),
+    Migration(8, "Track client updates", _track_client_updates),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+# ---------------------------------------------------------------------------
+# Runner
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """The version recorded in the database (0 for a new or pre-versioning database)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def pending_migrations(conn: sqlite3.Connection) -> List[Migration]:
+    """Steps not yet applied to the database"""
+    version = schema_version(conn)
+    return [migration for migration in MIGRATIONS if migration.version > version]
+
+def migrate(conn: sqlite3.Connection, progress: Optional[ProgressCallback] = None,
+            chunk_size: int = MIGRATION_CHUNK_SIZE) -> List[Migration]:
+    """Apply pending steps in order; returns the steps applied
+    
+    conn must not be inside a transaction. A current database costs one PRAGMA
+    read. Each step runs in its own BEGIN IMMEDIATE transaction together with
+    the user_version update, so a failure leaves the database at the last
+    completed step, and a process that loses the race to migrate simply finds
+    the work already done.
+    """
+    version = schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return []
+    
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version > version and _apply(conn, migration, progress, chunk_size):
+            applied.append(migration)
+    return applied
+
+def _apply(conn: sqlite3.Connection, migration: Migration, progress: Optional[ProgressCallback],
+           chunk_size: int) -> bool:
+    """Run one step in its own transaction; returns False if another process already ran it"""
+    if migration.foreign_keys_off:
+        conn.execute("PRAGMA foreign_keys = OFF")  # Has no effect inside a transaction
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                return False
+            
+            migration.apply(MigrationContext(conn, migration.description, chunk_size, progress))
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            raise MigrationError(f"Migration {migration.version} ({migration.description}) failed: {e}") from e
+    finally:
+        if migration.foreign_keys_off:
+            conn.execute("PRAGMA foreign_keys = ON")
@@ -1,12 +1,57 @@
 # File: models.py
 # Location: InvoiceGeneratorPro/database/models.py
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
-from typing import List, Optional
+from operator import itemgetter
+from typing import Callable, List, Optional
 import json
 
-@dataclass
+from utils.calculations import CalculationEngine, from_cents, to_cents
+
+# Models are slotted: no per-instance __dict__, which matters when a list or an
+# export holds tens of thousands of them. Rows read from the database are built
+# with from_row() (LazyInvoice.row_reader() for invoices), which sets every slot
+# directly instead of going through __init__, so stored values (updated_date in
+# particular) are kept as they are.
+#
+# Client, InvoiceItem and Invoice also remember the values last read from or
+# written to the database (the _saved field, in to_dict() order). changes()
+# compares against it so DatabaseManager only writes what was edited.
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored ISO timestamp; empty values become None"""
+    return datetime.fromisoformat(value) if value else None
+
+def _same_datetime(value: Optional[str], stored: Optional[str]) -> bool:
+    """Whether two ISO timestamps name the same moment, e.g. '2025-01-02' and
+    '2025-01-02T00:00:00'"""
+    if not value or not stored:
+        return value == stored
+    try:
+        return datetime.fromisoformat(value) == datetime.fromisoformat(stored)
+    except (TypeError, ValueError):
+        return False
+
+def _changed_columns(data: dict, saved: Optional[tuple], date_columns: frozenset = frozenset()) -> dict:
+    """Entries of data (a to_dict() result) that differ from saved, without the id
+    
+    Everything counts as changed when nothing was saved. Snapshots taken from rows
+    hold the stored strings, so date_columns are compared as parsed timestamps;
+    otherwise a date stored in another ISO form would be rewritten on every save.
+    """
+    if saved is None:
+        changed = dict(data)
+    else:
+        changed = {column: value for (column, value), old in zip(data.items(), saved)
+                   if value != old and not (column in date_columns and _same_datetime(value, old))}
+    changed.pop('id', None)
+    return changed
+
+_CLIENT_DATE_COLUMNS = frozenset({'created_date'})
+_INVOICE_DATE_COLUMNS = frozenset({'invoice_date', 'due_date', 'created_date', 'updated_date'})
+
+@dataclass(slots=True)
 class Client:
     """Client/Customer data model"""
     id: Optional[int] = None
@@ -20,6 +65,13 @@ class Client:
     country: str = ""
     created_date: Optional[datetime] = None
     notes: str = ""
+    _saved: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Columns of the clients table, in to_dict() order
+    _COLUMNS = (
+        'id', 'name', 'email', 'phone', 'address', 'city', 'state',
+        'zip_code', 'country', 'created_date', 'notes'
+    )
     
     def __post_init__(self):
         if self.created_date is None:
@@ -71,25 +123,74 @@ class Client:
         if data.get('created_date'):
             client.created_date = datetime.fromisoformat(data['created_date'])
         return client
+    
+    @classmethod
+    def from_row(cls, row, prefix: str = "") -> 'Client':
+        """Build a client from a clients row without running __post_init__
+        
+        row is a sqlite3.Row or dict; prefix selects columns aliased in a JOIN,
+        e.g. 'client__'.
+        """
+        client = cls.__new__(cls)
+        client._saved = tuple(row[prefix + column] for column in cls._COLUMNS)
+        (client.id, client.name, client.email, client.phone, client.address, client.city,
+         client.state, client.zip_code, client.country, created_date, client.notes) = client._saved
+        client.created_date = _parse_datetime(created_date)
+        return client
+    
+    def changes(self) -> dict:
+        """Stored columns changed since the client was loaded or last saved"""
+        return _changed_columns(self.to_dict(), self._saved, _CLIENT_DATE_COLUMNS)
+    
+    def mark_saved(self):
+        """Record the current values as what is stored"""
+        self._saved = tuple(self.to_dict().values())
+
+@dataclass(slots=True)
+class ClientStats:
+    """A client together with aggregated figures from its invoices"""
+    client: Client
+    invoice_count: int = 0
+    paid_revenue_cents: int = 0
+    last_invoice_date: Optional[datetime] = None
+    
+    @property
+    def paid_revenue(self) -> float:
+        """Total of the client's paid invoices"""
+        return from_cents(self.paid_revenue_cents)
 
-@dataclass
+@dataclass(slots=True)
 class InvoiceItem:
     """Individual line item on an invoice"""
     id: Optional[int] = None
     description: str = ""
     quantity: float = 1.0
-    rate: float = 0.0
-    amount: float = 0.0
+    rate_cents: int = 0
+    _saved: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
-    def __post_init__(self):
-        # Auto-calculate amount if not provided
-        if self.amount == 0.0:
-            self.amount = self.quantity * self.rate
+    @property
+    def rate(self) -> float:
+        """Unit rate as a decimal amount"""
+        return from_cents(self.rate_cents)
+    
+    @rate.setter
+    def rate(self, value: float):
+        self.rate_cents = to_cents(value)
+    
+    @property
+    def total_cents(self) -> int:
+        """Calculate total for this line item in cents"""
+        return CalculationEngine.calculate_line_total_cents(self.quantity, self.rate_cents)
     
     @property
     def total(self) -> float:
         """Calculate total for this line item"""
-        return round(self.quantity * self.rate, 2)
+        return from_cents(self.total_cents)
+    
+    @property
+    def amount(self) -> float:
+        """Line amount (same as total)"""
+        return self.total
     
     def to_dict(self) -> dict:
         """Convert item to dictionary"""
@@ -97,16 +198,54 @@ class InvoiceItem:
             'id': self.id,
             'description': self.description,
             'quantity': self.quantity,
-            'rate': self.rate,
-            'amount': self.total
+            'rate_cents': self.rate_cents,
+            'amount_cents': self.total_cents
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'InvoiceItem':
         """Create item from dictionary"""
-        return cls(**data)
+        if 'rate_cents' in data:
+            rate_cents = data['rate_cents']
+        else:
+            rate_cents = to_cents(data.get('rate', 0.0))  # Legacy decimal rate
+        
+        return cls(
+            id=data.get('id'),
+            description=data.get('description', ""),
+            quantity=data.get('quantity', 1.0),
+            rate_cents=rate_cents
+        )
+    
+    @classmethod
+    def from_row(cls, row) -> 'InvoiceItem':
+        """Build an item from an invoice_items row"""
+        item = cls.__new__(cls)
+        item.id = row['id']
+        item.description = row['description']
+        item.quantity = row['quantity']
+        item.rate_cents = row['rate_cents']
+        item._saved = None
+        return item
+    
+    def changes(self, position: int) -> dict:
+        """Stored columns changed since the item was loaded or last saved, at position in its invoice"""
+        data = {
+            'position': position,
+            'description': self.description,
+            'quantity': self.quantity,
+            'rate_cents': self.rate_cents
+        }
+        changed = _changed_columns(data, self._saved)
+        if 'quantity' in changed or 'rate_cents' in changed:
+            changed['amount_cents'] = self.total_cents
+        return changed
+    
+    def mark_saved(self, position: int):
+        """Record the current values, at position in its invoice, as what is stored"""
+        self._saved = (position, self.description, self.quantity, self.rate_cents)
 
-@dataclass
+@dataclass(slots=True)
 class Invoice:
     """Main invoice data model"""
     id: Optional[int] = None
@@ -117,10 +256,10 @@ class Invoice:
     due_date: Optional[datetime] = None
     status: str = "Draft"
     items: List[InvoiceItem] = field(default_factory=list)
-    subtotal: float = 0.0
+    subtotal_cents: int = 0
     tax_rate: float = 0.0
-    tax_amount: float = 0.0
-    total: float = 0.0
+    tax_amount_cents: int = 0
+    total_cents: int = 0
     notes: str = ""
     payment_terms: str = "Net 30"
     currency: str = "USD"
@@ -134,6 +273,11 @@ class Invoice:
     company_email: str = ""
     company_website: str = ""
     
+    # False for invoices from list queries, which are returned without their items
+    items_loaded: bool = field(default=True, init=False, repr=False, compare=False)
+    _saved: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _saved_item_ids: Optional[frozenset] = field(default=None, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         if self.invoice_date is None:
             self.invoice_date = datetime.now()
@@ -149,22 +293,69 @@ class Invoice:
     
     def add_item(self, item: InvoiceItem):
         """Add an item to the invoice"""
+        self.require_items()
         self.items.append(item)
         self.calculate_totals()
     
     def remove_item(self, item_index: int):
         """Remove an item from the invoice"""
+        self.require_items()
         if 0 <= item_index < len(self.items):
             self.items.pop(item_index)
             self.calculate_totals()
     
+    def require_items(self):
+        """Raise ValueError unless items holds the invoice's line items"""
+        if not self.items_loaded:
+            raise ValueError("Invoice items were not loaded; use load_invoice_items() first")
+    
     def calculate_totals(self):
-        """Calculate subtotal, tax, and total amounts"""
-        self.subtotal = round(sum(item.total for item in self.items), 2)
-        self.tax_amount = round(self.subtotal * self.tax_rate, 2)
-        self.total = round(self.subtotal + self.tax_amount, 2)
+        """Calculate subtotal, tax, and total amounts
+        
+        An invoice whose items were not loaded keeps its stored subtotal.
+        """
+        if self.items_loaded:
+            self.subtotal_cents = sum(item.total_cents for item in self.items)
+        self.tax_amount_cents = CalculationEngine.calculate_tax_amount_cents(self.subtotal_cents, self.tax_rate)
+        self.total_cents = self.subtotal_cents + self.tax_amount_cents
         self.updated_date = datetime.now()
     
+    @property
+    def saved_item_ids(self) -> Optional[frozenset]:
+        """Ids of the items stored when last loaded or saved; None if not known"""
+        return self._saved_item_ids
+    
+    def changes(self) -> dict:
+        """Stored columns changed since the invoice was loaded or last saved"""
+        return _changed_columns(self.to_dict(), self._saved, _INVOICE_DATE_COLUMNS)
+    
+    def mark_saved(self):
+        """Record the current values, and the items if loaded, as what is stored"""
+        self._saved = tuple(self.to_dict().values())
+        if self.items_loaded:
+            self.mark_items_saved()
+    
+    def mark_items_saved(self):
+        """Record the current items as what is stored"""
+        self._saved_item_ids = frozenset(item.id for item in self.items)
+        for position, item in enumerate(self.items):
+            item.mark_saved(position)
+    
+    @property
+    def subtotal(self) -> float:
+        """Subtotal as a decimal amount"""
+        return from_cents(self.subtotal_cents)
+    
+    @property
+    def tax_amount(self) -> float:
+        """Tax amount as a decimal amount"""
+        return from_cents(self.tax_amount_cents)
+    
+    @property
+    def total(self) -> float:
+        """Total as a decimal amount"""
+        return from_cents(self.total_cents)
+    
     @property
     def is_overdue(self) -> bool:
         """Check if invoice is overdue"""
@@ -194,11 +385,10 @@ class Invoice:
             'invoice_date': self.invoice_date.isoformat() if self.invoice_date else None,
             'due_date': self.due_date.isoformat() if self.due_date else None,
             'status': self.status,
-            'items': json.dumps([item.to_dict() for item in self.items]),
-            'subtotal': self.subtotal,
+            'subtotal_cents': self.subtotal_cents,
             'tax_rate': self.tax_rate,
-            'tax_amount': self.tax_amount,
-            'total': self.total,
+            'tax_amount_cents': self.tax_amount_cents,
+            'total_cents': self.total_cents,
             'notes': self.notes,
             'payment_terms': self.payment_terms,
             'currency': self.currency,
@@ -220,19 +410,107 @@ class Invoice:
             if data.get(field_name):
                 data[field_name] = datetime.fromisoformat(data[field_name])
         
-        # Handle items JSON
-        items_data = data.pop('items', '[]')
+        # Items live in the invoice_items table; only legacy rows carry JSON here
+        items_data = data.pop('items', None)
         if isinstance(items_data, str):
             items_list = json.loads(items_data)
         else:
-            items_list = items_data
+            items_list = items_data or []
         
         invoice = cls(**data)
         invoice.items = [InvoiceItem.from_dict(item) for item in items_list]
+        if data.get('updated_date'):
+            invoice.updated_date = data['updated_date']  # __post_init__ stamps now()
         
         return invoice
 
-@dataclass
+def _lazy_date(name: str) -> property:
+    """Property over an Invoice date slot that may still hold the stored ISO string
+    
+    The string is parsed on first read and the datetime put back in the slot.
+    """
+    slot = Invoice.__dict__[name]
+    
+    def get(self):
+        value = slot.__get__(self, Invoice)
+        if value.__class__ is str:
+            value = _parse_datetime(value)
+            slot.__set__(self, value)
+        return value
+    
+    return property(get, slot.__set__)
+
+# Fields the Invoice dataclass __eq__ compares, in declaration order
+_INVOICE_COMPARED_FIELDS = tuple(f.name for f in fields(Invoice) if f.compare)
+
+class LazyInvoice(Invoice):
+    """An Invoice read from the database whose dates are parsed on first access
+    
+    Invoice queries return these. Fields are copied from the row by position
+    rather than by name, and the four dates stay as stored strings until read,
+    so a list showing a few columns of each invoice does no work for the rest.
+    Otherwise it is an Invoice: fields can be read and assigned as usual.
+    """
+    __slots__ = ()
+    
+    # Stored columns copied by row_reader(), in the order they are assigned there
+    # and in to_dict() order, which changes() relies on
+    _COLUMNS = (
+        'id', 'invoice_number', 'client_id', 'invoice_date', 'due_date', 'status',
+        'subtotal_cents', 'tax_rate', 'tax_amount_cents', 'total_cents', 'notes',
+        'payment_terms', 'currency', 'created_date', 'updated_date', 'company_name',
+        'company_address', 'company_phone', 'company_email', 'company_website'
+    )
+    
+    invoice_date = _lazy_date('invoice_date')
+    due_date = _lazy_date('due_date')
+    created_date = _lazy_date('created_date')
+    updated_date = _lazy_date('updated_date')
+    
+    def __eq__(self, other):
+        """Equal to any Invoice with the same field values
+        
+        The dataclass __eq__ only compares instances of exactly the same class,
+        which would make a LazyInvoice unequal to the same invoice built as an
+        Invoice.
+        """
+        if not isinstance(other, Invoice):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _INVOICE_COMPARED_FIELDS)
+    
+    @classmethod
+    def row_reader(cls, columns: List[str]) -> Callable[..., 'LazyInvoice']:
+        """Return read(row, client=None) building invoices from rows with these column names
+        
+        Column positions are looked up once here, so call it once per query.
+        Items are left empty and marked not loaded: they live in invoice_items
+        and are attached by the caller when needed. Nothing is defaulted or
+        recalculated.
+        """
+        stored_values = itemgetter(*(columns.index(column) for column in cls._COLUMNS))
+        
+        def read(row, client: Optional[Client] = None) -> 'LazyInvoice':
+            invoice = cls.__new__(cls)
+            invoice._saved = stored = stored_values(row)
+            invoice._saved_item_ids = None
+            (invoice.id, invoice.invoice_number, invoice.client_id, invoice.invoice_date,
+             invoice.due_date, invoice.status, invoice.subtotal_cents, invoice.tax_rate,
+             invoice.tax_amount_cents, invoice.total_cents, invoice.notes,
+             invoice.payment_terms, invoice.currency, invoice.created_date,
+             invoice.updated_date, invoice.company_name, invoice.company_address,
+             invoice.company_phone, invoice.company_email, invoice.company_website) = stored
+            invoice.client = client
+            invoice.items = []
+            invoice.items_loaded = False
+            return invoice
+        
+        return read
+    
+    def stored_value(self, column: str):
+        """The value of a stored column as last read or saved, e.g. a date as its stored string"""
+        return self._saved[self._COLUMNS.index(column)]
+
+@dataclass(slots=True)
 class AppSettings:
     """Application settings model"""
     id: Optional[int] = None
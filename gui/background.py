@@ -0,0 +1,160 @@
+# File: background.py
+# Location: InvoiceGeneratorPro/gui/background.py
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# How often the Tk thread checks for finished work while any is outstanding
+POLL_INTERVAL_MS = 30
+
+class BackgroundTasks:
+    """Runs blocking work (database queries) off the Tk thread
+    
+    Work is submitted under a key such as 'invoices' or 'dashboard'. Each submit
+    bumps the key's generation token and supersedes earlier work for that key:
+    
+    - at most one task per key runs at a time. Submitting while one runs only
+      records the new task, replacing any other still waiting, and it starts when
+      the running one finishes, so a burst of refreshes costs at most two queries.
+    - a result whose generation is no longer current is dropped.
+    
+    Callbacks always run on the Tk thread: workers only put results on a queue,
+    which the Tk thread drains with root.after() while work is outstanding.
+    on_activity(busy_keys) is called on the Tk thread whenever the set of keys
+    with running or waiting work changes, e.g. to drive a progress indicator.
+    
+    Long tasks can report progress: given on_progress, func is called with a
+    report(value) function it may call from the worker, and each value is passed
+    to on_progress on the Tk thread while the task is still current.
+    """
+    
+    def __init__(self, root, max_workers: int = 2,
+                 on_activity: Optional[Callable[[Set[str]], None]] = None):
+        self.root = root
+        self.on_activity = on_activity
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='gui-worker')
+        self._results: "queue.Queue" = queue.Queue()
+        self._progress: "queue.Queue" = queue.Queue()
+        self._generations: Dict[str, int] = {}
+        self._running: Set[str] = set()
+        self._waiting: Dict[str, Tuple[int, Callable, Callable, Optional[Callable], Optional[Callable]]] = {}
+        self._polling = False
+        self._closed = False
+    
+    @property
+    def busy_keys(self) -> Set[str]:
+        """Keys with work running or waiting to run"""
+        return self._running | set(self._waiting)
+    
+    def submit(self, key: str, func: Callable[..., Any], on_success: Callable[[Any], None],
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_progress: Optional[Callable[[Any], None]] = None) -> int:
+        """Run func() on a worker; deliver its result to on_success on the Tk thread
+        
+        With on_progress, func is called as func(report) instead. Returns the
+        generation token of this task. Any earlier task for the same key is
+        superseded.
+        """
+        if self._closed:
+            return 0
+        
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        
+        if key in self._running:
+            self._waiting[key] = (generation, func, on_success, on_error, on_progress)
+        else:
+            self._start(key, generation, func, on_success, on_error, on_progress)
+        self._activity_changed()
+        return generation
+    
+    def cancel(self, key: str):
+        """Drop waiting work for key and the result of any task still running"""
+        self._generations[key] = self._generations.get(key, 0) + 1
+        if self._waiting.pop(key, None) is not None:
+            self._activity_changed()
+    
+    def is_current(self, key: str, generation: int) -> bool:
+        """Whether generation is still the latest task for key"""
+        return self._generations.get(key) == generation
+    
+    def shutdown(self):
+        """Stop accepting work, discard anything not yet started and wait for running tasks
+        
+        Running tasks may still be using database connections (a settings save or
+        an export), so they are allowed to finish before the caller closes them.
+        """
+        self._closed = True
+        self._waiting.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _start(self, key, generation, func, on_success, on_error, on_progress=None):
+        """Hand a task to the thread pool"""
+        self._running.add(key)
+        self._executor.submit(self._run, key, generation, func, on_success, on_error, on_progress)
+        self._start_polling()
+    
+    def _run(self, key, generation, func, on_success, on_error, on_progress):
+        """Worker side: run func unless it was superseded while queued"""
+        if not self.is_current(key, generation):
+            self._results.put((key, generation, None, None))
+            return
+        
+        try:
+            if on_progress is not None:
+                report = lambda value: self._progress.put((key, generation, on_progress, value))
+                result = func(report)
+            else:
+                result = func()
+            self._results.put((key, generation, on_success, result))
+        except Exception as e:
+            self._results.put((key, generation, on_error, e))
+    
+    def _start_polling(self):
+        """Schedule result delivery on the Tk thread if not already scheduled"""
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+    
+    def _poll(self):
+        """Tk side: deliver progress and finished results whose generation is still current"""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                break
+        
+        # Workers report all progress before their result, so progress taken after
+        # the results never arrives after the result it belongs to
+        while True:
+            try:
+                key, generation, callback, value = self._progress.get_nowait()
+            except queue.Empty:
+                break
+            
+            if not self._closed and self.is_current(key, generation):
+                callback(value)
+        
+        for key, generation, callback, value in results:
+            self._running.discard(key)
+            waiting = self._waiting.pop(key, None)
+            if waiting is not None and not self._closed:
+                self._start(key, *waiting)
+            
+            if callback is not None and not self._closed and self.is_current(key, generation):
+                callback(value)
+        
+        if results:
+            self._activity_changed()
+        
+        if self._running and not self._closed:
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+        else:
+            self._polling = False
+    
+    def _activity_changed(self):
+        """Report the current busy keys to on_activity"""
+        if self.on_activity is not None and not self._closed:
+            self.on_activity(self.busy_keys)
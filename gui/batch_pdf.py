@@ -0,0 +1,148 @@
+# File: batch_pdf.py
+# Location: InvoiceGeneratorPro/gui/batch_pdf.py
+
+import queue
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import List
+
+from database.db_manager import DatabaseManager
+from pdf_generator.batch import generate_invoices_batch
+from config import HEADER_FONT, PRIMARY_COLOR, ERROR_COLOR
+
+# How often the window checks the batch thread for progress
+PROGRESS_POLL_MS = 100
+
+class BatchPDFWindow:
+    """Progress window for generating many invoice PDFs at once
+    
+    The batch runs on a background thread that drives a process pool; progress
+    is passed back through a queue and shown without blocking the main window.
+    """
+    
+    def __init__(self, parent, db_manager: DatabaseManager, invoice_ids: List[int],
+                 template_name: str, output_dir: str):
+        self.parent = parent
+        self.db_manager = db_manager
+        self.invoice_ids = invoice_ids
+        self.template_name = template_name
+        self.output_dir = output_dir
+        self.result = None
+        self._poll_id = None
+        
+        self._events: "queue.Queue" = queue.Queue()
+        self._cancel_event = threading.Event()
+        
+        # Create window
+        self.window = tk.Toplevel(parent)
+        self.window.title("Generate PDFs")
+        self.window.geometry("500x400")
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+        self._create_widgets()
+        self._start()
+    
+    def _create_widgets(self):
+        """Create and layout all widgets"""
+        main_frame = ttk.Frame(self.window, padding=20)
+        main_frame.pack(fill='both', expand=True)
+        
+        ttk.Label(main_frame, text="Generating Invoice PDFs", font=HEADER_FONT,
+                 foreground=PRIMARY_COLOR).pack(pady=(0, 15))
+        
+        self.progress_bar = ttk.Progressbar(main_frame, mode='determinate',
+                                            maximum=max(len(self.invoice_ids), 1))
+        self.progress_bar.pack(fill='x')
+        
+        self.status_var = tk.StringVar(value=f"0 of {len(self.invoice_ids)} invoices")
+        ttk.Label(main_frame, textvariable=self.status_var).pack(anchor='w', pady=(5, 10))
+        
+        # Per-invoice failures
+        errors_frame = ttk.LabelFrame(main_frame, text="Errors", padding=5)
+        errors_frame.pack(fill='both', expand=True)
+        
+        self.errors_list = tk.Listbox(errors_frame, foreground=ERROR_COLOR, height=8)
+        errors_scrollbar = ttk.Scrollbar(errors_frame, orient='vertical', command=self.errors_list.yview)
+        self.errors_list.configure(yscrollcommand=errors_scrollbar.set)
+        self.errors_list.pack(side='left', fill='both', expand=True)
+        errors_scrollbar.pack(side='right', fill='y')
+        
+        self.action_button = ttk.Button(main_frame, text="Cancel", command=self._cancel)
+        self.action_button.pack(side='right', pady=(15, 0))
+    
+    def _start(self):
+        """Run the batch on a background thread and start polling for progress"""
+        thread = threading.Thread(target=self._run_batch, name='batch-pdf', daemon=True)
+        thread.start()
+        self._poll_id = self.window.after(PROGRESS_POLL_MS, self._poll)
+    
+    def _run_batch(self):
+        """Background thread: generate the PDFs, reporting through the queue"""
+        try:
+            result = generate_invoices_batch(
+                self.invoice_ids,
+                template_name=self.template_name,
+                output_dir=self.output_dir,
+                db_path=self.db_manager.db_path,
+                progress=lambda *args: self._events.put(('progress', args)),
+                cancel_event=self._cancel_event
+            )
+            self._events.put(('done', result))
+        except Exception as e:
+            self._events.put(('error', e))
+    
+    def _poll(self):
+        """Tk side: apply queued progress and finish when the batch is done"""
+        while True:
+            try:
+                kind, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'progress':
+                self._show_progress(*value)
+            elif kind == 'done':
+                self._finish(value)
+                return
+            else:
+                self._finish(None, error=value)
+                return
+        
+        self._poll_id = self.window.after(PROGRESS_POLL_MS, self._poll)
+    
+    def _show_progress(self, done, total, invoice_id, error):
+        """Update the progress bar and list any failure"""
+        self.progress_bar['value'] = done
+        self.status_var.set(f"{done} of {total} invoices")
+        if error is not None:
+            self.errors_list.insert('end', f"Invoice {invoice_id}: {error}")
+    
+    def _finish(self, result, error=None):
+        """Show the outcome and turn Cancel into Close"""
+        self._poll_id = None
+        self.result = result
+        if error is not None:
+            self.status_var.set(f"Batch failed: {error}")
+        elif result.cancelled:
+            self.status_var.set(f"Cancelled after {result.processed} of {len(self.invoice_ids)} invoices "
+                                f"({len(result.generated)} generated)")
+        else:
+            self.status_var.set(f"{len(result.generated)} generated, {len(result.failed)} failed "
+                                f"- saved to {self.output_dir}")
+        
+        self.action_button.configure(text="Close", command=self.window.destroy, state='normal')
+    
+    def _cancel(self):
+        """Ask the batch to stop after the invoices already rendering"""
+        self._cancel_event.set()
+        self.status_var.set("Cancelling...")
+        self.action_button.configure(state='disabled')
+    
+    def _on_close(self):
+        """Closing the window cancels a running batch"""
+        self._cancel_event.set()
+        if self._poll_id is not None:
+            self.window.after_cancel(self._poll_id)
+        self.window.destroy()
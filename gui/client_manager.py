@@ -5,7 +5,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Optional
 import re
-from datetime import datetime
 
 from database.db_manager import DatabaseManager
 from database.models import Client
@@ -296,18 +295,17 @@ class ClientFormWindow:
             return
         
         try:
-            # Get client invoices
-            invoices = self.db_manager.get_invoices_by_client(self.client_id)
+            # Invoice count, paid revenue and last invoice date in one query
+            client_stats = self.db_manager.get_client_stats(self.client_id)
+            if not client_stats:
+                return
             
-            # Calculate stats
-            total_invoices = len(invoices)
-            total_revenue = sum(inv.total for inv in invoices if inv.status == "Paid")
+            total_invoices = client_stats.invoice_count
+            total_revenue = client_stats.paid_revenue
             last_invoice_date = "Never"
             
-            if invoices:
-                last_invoice = max(invoices, key=lambda x: x.created_date or datetime.min)
-                if last_invoice.created_date:
-                    last_invoice_date = last_invoice.created_date.strftime('%m/%d/%Y')
+            if client_stats.last_invoice_date:
+                last_invoice_date = client_stats.last_invoice_date.strftime('%m/%d/%Y')
             
             # Update stats display
             self.stats_vars['total_invoices'].set(str(total_invoices))
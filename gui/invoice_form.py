@@ -5,7 +5,6 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from typing import Optional, List
-from pdf_generator.invoice_pdf import InvoicePDFGenerator
 from tkinter import filedialog
 
 
@@ -13,7 +12,7 @@ from database.db_manager import DatabaseManager
 from database.models import Invoice, Client, InvoiceItem
 from utils.calculations import (
     CurrencyFormatter, DateCalculator, 
-    calculate_invoice_total
+    calculate_invoice_total, to_cents
 )
 from config import (
     DEFAULT_FONT, HEADER_FONT, BUTTON_FONT, PRIMARY_COLOR,
@@ -31,6 +30,7 @@ class InvoiceFormWindow:
         self.client_id = client_id
         self.invoice: Optional[Invoice] = None
         self.items: List[InvoiceItem] = []
+        self.suggested_invoice_number = ""  # Number shown to a new invoice before it is saved
         
         # Create window
         self.window = tk.Toplevel(parent)
@@ -389,10 +389,9 @@ class InvoiceFormWindow:
     
     def _setup_new_invoice(self):
         """Setup new invoice with defaults"""
-        # Generate invoice number
-        settings = self.db_manager.get_app_settings()
-        invoice_number = settings.get_next_invoice_number()
-        self.invoice_number_var.set(invoice_number)
+        # Suggest the next invoice number; it is only taken when the invoice is saved
+        self.suggested_invoice_number = self.db_manager.peek_next_invoice_number()
+        self.invoice_number_var.set(self.suggested_invoice_number)
         
         # Calculate due date based on default payment terms
         self._calculate_due_date()
@@ -463,7 +462,7 @@ class InvoiceFormWindow:
             for item in self.items:
                 items_data.append({
                     'quantity': item.quantity,
-                    'rate': item.rate
+                    'rate_cents': item.rate_cents
                 })
             
             totals = calculate_invoice_total(items_data, tax_rate)
@@ -518,7 +517,7 @@ class InvoiceFormWindow:
             item = InvoiceItem(
                 description=dialog.result['description'],
                 quantity=dialog.result['quantity'],
-                rate=dialog.result['rate']
+                rate_cents=to_cents(dialog.result['rate'])
             )
             self.items.append(item)
             self._refresh_items_display()
@@ -541,8 +540,7 @@ class InvoiceFormWindow:
             # Update item
             item.description = dialog.result['description']
             item.quantity = dialog.result['quantity']
-            item.rate = dialog.result['rate']
-            item.amount = item.quantity * item.rate  # Recalculate
+            item.rate = dialog.result['rate']  # Stored as cents; amount is derived
             
             self._refresh_items_display()
     
@@ -595,15 +593,12 @@ class InvoiceFormWindow:
             
             # Create or get invoice object
             invoice = self.invoice if self.invoice is not None else Invoice()
-
-            # If it's a new invoice, update settings with new invoice number
-            if self.invoice is None:
-                settings = self.db_manager.get_app_settings()
-                self.db_manager.save_app_settings(settings)
-
             
-            # Set invoice data
+            # Set invoice data. A new invoice still showing the suggested number is
+            # numbered by save_invoice, so two windows can never claim the same one
             invoice.invoice_number = self.invoice_number_var.get()
+            if self.invoice is None and invoice.invoice_number == self.suggested_invoice_number:
+                invoice.invoice_number = ""
             invoice.client_id = client.id
             invoice.client = client
             invoice.status = self.status_var.get()
@@ -640,6 +635,7 @@ class InvoiceFormWindow:
             saved_invoice = self.db_manager.save_invoice(invoice)
             self.invoice = saved_invoice
             self.invoice_id = saved_invoice.id
+            self.invoice_number_var.set(saved_invoice.invoice_number)
             
             messagebox.showinfo("Success", "Invoice saved successfully!")
             
@@ -692,8 +688,10 @@ class InvoiceFormWindow:
             )
 
             if output_path:
-                generator = InvoicePDFGenerator()
-                final_path = generator.generate_invoice_pdf(self.invoice, output_path)
+                # Loads reportlab, so it is imported on first use
+                from pdf_generator.invoice_pdf import generate_invoice_pdf
+                # Single exports keep the "Generated on" footer, so they bypass the PDF cache
+                final_path = generate_invoice_pdf(self.invoice, output_path, generated_at=datetime.now())
 
                 messagebox.showinfo("Success", f"PDF generated successfully!\nSaved to: {final_path}")
 
@@ -9,24 +9,29 @@ from typing import Optional
 
 from database.db_manager import DatabaseManager
 from database.models import Invoice, Client
-from pdf_generator.invoice_pdf import generate_invoice_pdf
-from pdf_generator.templates import generate_invoice_with_template
+from gui.background import BackgroundTasks
+from gui.paged_treeview import PagedTreeLoader
 from utils.calculations import CurrencyFormatter
 from config import (
     APP_NAME, APP_VERSION, WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_MIN_WIDTH, WINDOW_MIN_HEIGHT,
     PRIMARY_COLOR, SECONDARY_COLOR, BACKGROUND_COLOR, TEXT_COLOR, SUCCESS_COLOR, ERROR_COLOR,
-    DEFAULT_FONT, HEADER_FONT, TITLE_FONT, BUTTON_FONT, INVOICE_STATUSES, EXPORT_DIR
+    DEFAULT_FONT, HEADER_FONT, TITLE_FONT, BUTTON_FONT, INVOICE_STATUSES, EXPORT_DIR,
+    CLIENT_SEARCH_DEBOUNCE_MS
 )
 
 class MainWindow:
     """Main application window for Invoice Generator Pro"""
     
-    def __init__(self):
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
         self.root = tk.Tk()
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager or DatabaseManager()
         self.current_invoice: Optional[Invoice] = None
         self.current_client: Optional[Client] = None
         
+        # Database work for the GUI runs on worker threads
+        self.tasks = BackgroundTasks(self.root, on_activity=self._on_background_activity)
+        self._client_search_after_id = None
+        
         self._setup_window()
         self._setup_styles()
         self._create_widgets()
@@ -275,7 +280,14 @@ class MainWindow:
         
         # Scrollbar for invoices
         invoices_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.invoices_tree.yview)
-        self.invoices_tree.configure(yscrollcommand=invoices_scrollbar.set)
+        
+        # Rows are fetched a page at a time as the list is scrolled
+        self.invoices_loader = PagedTreeLoader(
+            self.invoices_tree, invoices_scrollbar, self._invoices_fetcher('All'), self._invoice_row_values,
+            on_error=lambda e: self._show_error(f"Error loading invoices: {str(e)}"),
+            tasks=self.tasks, key='invoices'
+        )
+        self.invoices_tree.tag_configure('overdue', foreground=ERROR_COLOR)
         
         # Pack invoices widgets
         self.invoices_tree.pack(side='left', fill='both', expand=True)
@@ -289,6 +301,8 @@ class MainWindow:
                   command=self._edit_selected_invoice).pack(side='left', padx=(0, 5))
         ttk.Button(invoice_actions_frame, text="Generate PDF", style='Success.TButton',
                   command=self._generate_invoice_pdf).pack(side='left', padx=(0, 5))
+        ttk.Button(invoice_actions_frame, text="Batch PDFs",
+                  command=self._generate_batch_pdfs).pack(side='left', padx=(0, 5))
         ttk.Button(invoice_actions_frame, text="Mark as Paid", 
                   command=self._mark_invoice_paid).pack(side='left', padx=(0, 5))
         ttk.Button(invoice_actions_frame, text="Delete", style='Danger.TButton',
@@ -346,7 +360,13 @@ class MainWindow:
         
         # Scrollbar for clients
         clients_scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.clients_tree.yview)
-        self.clients_tree.configure(yscrollcommand=clients_scrollbar.set)
+        
+        # Rows are fetched a page at a time as the list is scrolled
+        self.clients_loader = PagedTreeLoader(
+            self.clients_tree, clients_scrollbar, self.db_manager.get_clients_with_stats, self._client_row_values,
+            on_error=lambda e: self._show_error(f"Error loading clients: {str(e)}"),
+            tasks=self.tasks, key='clients'
+        )
         
         # Pack clients widgets
         self.clients_tree.pack(side='left', fill='both', expand=True)
@@ -437,8 +457,15 @@ class MainWindow:
     def _create_status_bar(self, parent):
         """Create status bar"""
         self.status_var = tk.StringVar(value="Ready")
-        status_bar = ttk.Label(parent, textvariable=self.status_var, relief='sunken', anchor='w')
-        status_bar.pack(side='bottom', fill='x')
+        status_frame = ttk.Frame(parent, relief='sunken')
+        status_frame.pack(side='bottom', fill='x')
+        
+        # Shown only while background loads are running
+        self.status_progress = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+        self._progress_visible = False
+        
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, anchor='w')
+        status_bar.pack(side='left', fill='x', expand=True)
     
     def _setup_menu(self):
         """Setup application menu"""
@@ -452,6 +479,8 @@ class MainWindow:
         file_menu.add_command(label="New Client", command=self._create_new_client)
         file_menu.add_separator()
         file_menu.add_command(label="Export Data", command=self._export_data)
+        file_menu.add_command(label="Export Data (gzip)", command=lambda: self._export_data(compress=True))
+        file_menu.add_command(label="Export Analytics (Parquet)", command=self._export_analytics)
         file_menu.add_command(label="Backup Database", command=self._backup_database)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
@@ -462,147 +491,128 @@ class MainWindow:
         help_menu.add_command(label="About", command=self._show_about)
     
     # Data loading methods
+    # Queries run on worker threads via self.tasks; the _show_* methods put the
+    # results on screen once they are delivered back on the Tk thread.
     def _load_dashboard_data(self):
         """Load and display dashboard data"""
-        try:
-            stats = self.db_manager.get_dashboard_stats()
-            
-            # Update stat cards
-            self.stats_vars['total_clients'].set(str(stats['total_clients']))
-            self.stats_vars['total_invoices'].set(str(stats['total_invoices']))
-            self.stats_vars['paid_invoices'].set(str(stats['paid_invoices']))
-            self.stats_vars['overdue_invoices'].set(str(stats['overdue_invoices']))
-            
-            # Update revenue
-            self.revenue_vars['total_revenue'].set(CurrencyFormatter.format_currency(stats['total_revenue']))
-            self.revenue_vars['pending_revenue'].set(CurrencyFormatter.format_currency(stats['pending_revenue']))
-            
-            # Load recent invoices
-            self._load_recent_invoices()
-            
-        except Exception as e:
-            self._show_error(f"Error loading dashboard data: {str(e)}")
+        self.tasks.submit(
+            'dashboard', self._query_dashboard_data, self._show_dashboard_data,
+            lambda e: self._show_error(f"Error loading dashboard data: {str(e)}")
+        )
     
-    def _load_recent_invoices(self):
-        """Load recent invoices for dashboard"""
-        try:
-            # Clear existing items
-            for item in self.recent_tree.get_children():
-                self.recent_tree.delete(item)
-            
-            # Get recent invoices (last 10)
-            all_invoices = self.db_manager.get_all_invoices()
-            recent_invoices = all_invoices[:10]  # Already sorted by created_date DESC
+    def _query_dashboard_data(self):
+        """Fetch dashboard stats and the 10 most recent invoices (worker thread)"""
+        stats = self.db_manager.get_dashboard_stats()
+        recent_invoices, _ = self.db_manager.get_invoices_page(limit=10)
+        return stats, recent_invoices
+    
+    def _show_dashboard_data(self, data):
+        """Display dashboard stats and recent invoices"""
+        stats, recent_invoices = data
+        
+        # Update stat cards
+        self.stats_vars['total_clients'].set(str(stats['total_clients']))
+        self.stats_vars['total_invoices'].set(str(stats['total_invoices']))
+        self.stats_vars['paid_invoices'].set(str(stats['paid_invoices']))
+        self.stats_vars['overdue_invoices'].set(str(stats['overdue_invoices']))
+        
+        # Update revenue
+        self.revenue_vars['total_revenue'].set(CurrencyFormatter.format_currency(stats['total_revenue']))
+        self.revenue_vars['pending_revenue'].set(CurrencyFormatter.format_currency(stats['pending_revenue']))
+        
+        # Show recent invoices
+        self._show_recent_invoices(recent_invoices)
+    
+    def _show_recent_invoices(self, recent_invoices):
+        """Display recent invoices on the dashboard"""
+        # Clear existing items
+        for item in self.recent_tree.get_children():
+            self.recent_tree.delete(item)
+        
+        for invoice in recent_invoices:
+            client_name = invoice.client.name if invoice.client else "Unknown"
+            amount = CurrencyFormatter.format_currency(invoice.total, invoice.currency)
+            date = invoice.invoice_date.strftime('%m/%d/%Y') if invoice.invoice_date else ""
             
-            for invoice in recent_invoices:
-                client_name = invoice.client.name if invoice.client else "Unknown"
-                amount = CurrencyFormatter.format_currency(invoice.total, invoice.currency)
-                date = invoice.invoice_date.strftime('%m/%d/%Y') if invoice.invoice_date else ""
-                
-                self.recent_tree.insert('', 'end', values=(
-                    invoice.formatted_invoice_number,
-                    client_name,
-                    amount,
-                    invoice.status,
-                    date
-                ), tags=(str(invoice.id),))
-                
-        except Exception as e:
-            self._show_error(f"Error loading recent invoices: {str(e)}")
+            self.recent_tree.insert('', 'end', values=(
+                invoice.formatted_invoice_number,
+                client_name,
+                amount,
+                invoice.status,
+                date
+            ), tags=(str(invoice.id),))
     
     def _load_invoices(self):
-        """Load invoices into treeview"""
-        try:
-            # Clear existing items
-            for item in self.invoices_tree.get_children():
-                self.invoices_tree.delete(item)
-            
-            # Get filter value
-            filter_status = self.invoice_filter.get()
-            
-            # Get invoices based on filter
-            if filter_status == 'All':
-                invoices = self.db_manager.get_all_invoices()
-            else:
-                invoices = self.db_manager.get_invoices_by_status(filter_status)
-            
-            for invoice in invoices:
-                client_name = invoice.client.name if invoice.client else "Unknown"
-                amount = CurrencyFormatter.format_currency(invoice.total, invoice.currency)
-                invoice_date = invoice.invoice_date.strftime('%m/%d/%Y') if invoice.invoice_date else ""
-                due_date = invoice.due_date.strftime('%m/%d/%Y') if invoice.due_date else ""
-                
-                # Color coding for overdue invoices
-                tags = [str(invoice.id)]
-                if invoice.is_overdue:
-                    tags.append('overdue')
-                
-                self.invoices_tree.insert('', 'end', values=(
-                    invoice.formatted_invoice_number,
-                    client_name,
-                    invoice_date,
-                    due_date,
-                    amount,
-                    invoice.status
-                ), tags=tuple(tags))
-            
-            # Configure tag colors
-            self.invoices_tree.tag_configure('overdue', foreground=ERROR_COLOR)
-            
-        except Exception as e:
-            self._show_error(f"Error loading invoices: {str(e)}")
+        """Load the first page of invoices into treeview; more load on scroll"""
+        self.invoices_loader.reload(self._invoices_fetcher(self.invoice_filter.get()))
+    
+    def _invoices_fetcher(self, filter_status):
+        """Page fetcher for the invoices list under a status filter
+        
+        The filter is read on the Tk thread and bound here, as pages are fetched
+        on worker threads that must not touch widgets.
+        """
+        status = None if filter_status == 'All' else filter_status
+        return lambda after, limit: self.db_manager.get_invoices_page(after=after, limit=limit, status=status)
+    
+    def _invoice_row_values(self, invoice):
+        """Treeview (iid, values, tags) for one invoice"""
+        client_name = invoice.client.name if invoice.client else "Unknown"
+        amount = CurrencyFormatter.format_currency(invoice.total, invoice.currency)
+        invoice_date = invoice.invoice_date.strftime('%m/%d/%Y') if invoice.invoice_date else ""
+        due_date = invoice.due_date.strftime('%m/%d/%Y') if invoice.due_date else ""
+        
+        # Color coding for overdue invoices
+        tags = [str(invoice.id)]
+        if invoice.is_overdue:
+            tags.append('overdue')
+        
+        return str(invoice.id), (
+            invoice.formatted_invoice_number,
+            client_name,
+            invoice_date,
+            due_date,
+            amount,
+            invoice.status
+        ), tuple(tags)
     
     def _load_clients(self):
-        """Load clients into treeview"""
-        try:
-            # Clear existing items
-            for item in self.clients_tree.get_children():
-                self.clients_tree.delete(item)
-            
-            # Get all clients
-            clients = self.db_manager.get_all_clients()
-            
-            for client in clients:
-                # Get invoice count for this client
-                if client.id is not None:
-                    client_invoices = self.db_manager.get_invoices_by_client(client.id)
-                else:
-                    client_invoices = []
-
-                invoice_count = len(client_invoices)
-                
-                self.clients_tree.insert('', 'end', values=(
-                    client.name,
-                    client.email or "",
-                    client.phone or "",
-                    client.city or "",
-                    invoice_count
-                ), tags=(str(client.id),))
-                
-        except Exception as e:
-            self._show_error(f"Error loading clients: {str(e)}")
+        """Load the first page of clients into treeview; more load on scroll"""
+        self.clients_loader.reload(self.db_manager.get_clients_with_stats)
+    
+    def _client_row_values(self, client_stats):
+        """Treeview (iid, values, tags) for one client, with its invoice count"""
+        client = client_stats.client
+        return str(client.id), (
+            client.name,
+            client.email or "",
+            client.phone or "",
+            client.city or "",
+            client_stats.invoice_count
+        ), (str(client.id),)
     
     def _load_settings(self):
         """Load current settings into form"""
-        try:
-            settings = self.db_manager.get_app_settings()
-            
-            # Load company settings
-            self.company_vars['company_name'].set(settings.company_name)
-            if isinstance(self.company_vars['company_address'], tk.Text):
-                self.company_vars['company_address'].delete('1.0', 'end')
-                self.company_vars['company_address'].insert('1.0', settings.company_address)
-            self.company_vars['company_phone'].set(settings.company_phone)
-            self.company_vars['company_email'].set(settings.company_email)
-            self.company_vars['company_website'].set(settings.company_website)
-            
-            # Load invoice settings
-            self.invoice_vars['default_currency'].set(settings.default_currency)
-            self.invoice_vars['default_tax_rate'].set(str(settings.default_tax_rate * 100))  # Convert to percentage
-            self.invoice_vars['default_payment_terms'].set(settings.default_payment_terms)
-            
-        except Exception as e:
-            self._show_error(f"Error loading settings: {str(e)}")
+        self.tasks.submit(
+            'settings', self.db_manager.get_app_settings, self._show_settings,
+            lambda e: self._show_error(f"Error loading settings: {str(e)}")
+        )
+    
+    def _show_settings(self, settings):
+        """Fill the settings form"""
+        # Load company settings
+        self.company_vars['company_name'].set(settings.company_name)
+        if isinstance(self.company_vars['company_address'], tk.Text):
+            self.company_vars['company_address'].delete('1.0', 'end')
+            self.company_vars['company_address'].insert('1.0', settings.company_address)
+        self.company_vars['company_phone'].set(settings.company_phone)
+        self.company_vars['company_email'].set(settings.company_email)
+        self.company_vars['company_website'].set(settings.company_website)
+        
+        # Load invoice settings
+        self.invoice_vars['default_currency'].set(settings.default_currency)
+        self.invoice_vars['default_tax_rate'].set(str(settings.default_tax_rate * 100))  # Convert to percentage
+        self.invoice_vars['default_payment_terms'].set(settings.default_payment_terms)
     
     # Filter and search methods
     def _filter_invoices(self, event=None):
@@ -610,39 +620,26 @@ class MainWindow:
         self._load_invoices()
     
     def _search_clients(self, *args):
-        """Search clients as user types"""
+        """Search clients as user types, once typing pauses"""
+        if self._client_search_after_id is not None:
+            self.root.after_cancel(self._client_search_after_id)
+        self._client_search_after_id = self.root.after(CLIENT_SEARCH_DEBOUNCE_MS, self._run_client_search)
+    
+    def _run_client_search(self):
+        """Reload the clients list for the current search text"""
+        self._client_search_after_id = None
         search_term = self.client_search_var.get()
+        
         if not search_term:
             self._load_clients()
             return
         
-        try:
-            # Clear existing items
-            for item in self.clients_tree.get_children():
-                self.clients_tree.delete(item)
-            
-            # Search clients
-            clients = self.db_manager.search_clients(search_term)
-            
-            for client in clients:
-                # Get invoice count for this client
-                if client.id is not None:
-                    client_invoices = self.db_manager.get_invoices_by_client(client.id)
-                else:
-                    client_invoices = []
-
-                invoice_count = len(client_invoices)
-                
-                self.clients_tree.insert('', 'end', values=(
-                    client.name,
-                    client.email or "",
-                    client.phone or "",
-                    client.city or "",
-                    invoice_count
-                ), tags=(str(client.id),))
-                
-        except Exception as e:
-            self._show_error(f"Error searching clients: {str(e)}")
+        # Ranked matches page in on scroll like the full list. The query runs on a
+        # worker under the clients list's key, so it supersedes (and is superseded
+        # by) any other load of that list
+        self.clients_loader.reload(
+            lambda after, limit: self.db_manager.search_clients_with_stats_page(search_term, after, limit)
+        )
     
     # Action methods
     def _create_new_invoice(self):
@@ -721,8 +718,11 @@ class MainWindow:
             if not template_choice:
                 return
             
+            # PDF modules load reportlab, so they are imported on first export
+            from pdf_generator.invoice_pdf import generate_invoice_filename, generate_invoice_pdf
+            from pdf_generator.templates import generate_invoice_with_template
+            
             # Generate filename
-            from pdf_generator.invoice_pdf import generate_invoice_filename
             filename = generate_invoice_filename(invoice)
             
             # Ask user for save location
@@ -738,7 +738,8 @@ class MainWindow:
                 # Generate PDF
                 if template_choice == 'default':
 
-                    final_path = generate_invoice_pdf(invoice, output_path)
+                    # Single exports keep the "Generated on" footer, so they bypass the PDF cache
+                    final_path = generate_invoice_pdf(invoice, output_path, generated_at=datetime.now())
                 else:
                     final_path = generate_invoice_with_template(invoice, template_choice, output_path)
                 
@@ -752,6 +753,46 @@ class MainWindow:
         except Exception as e:
             self._show_error(f"Error generating PDF: {str(e)}")
     
+    def _generate_batch_pdfs(self):
+        """Generate PDFs for the selected invoices, or every invoice in the current filter"""
+        selection = self.invoices_tree.selection()
+        if selection:
+            self._start_batch_pdfs([int(self.invoices_tree.item(iid)['tags'][0]) for iid in selection])
+            return
+        
+        # Every invoice in the filter: look the ids up on a worker, then confirm
+        filter_status = self.invoice_filter.get()
+        status = None if filter_status == 'All' else filter_status
+        self.tasks.submit(
+            'batch_pdf_ids', lambda: self.db_manager.get_invoice_ids(status),
+            lambda invoice_ids: self._confirm_batch_pdfs(invoice_ids, status),
+            lambda e: self._show_error(f"Error loading invoices: {str(e)}")
+        )
+    
+    def _confirm_batch_pdfs(self, invoice_ids, status):
+        """Ask before generating PDFs for every invoice in the filter"""
+        if not invoice_ids:
+            messagebox.showinfo("No Invoices", "There are no invoices to generate.")
+            return
+        scope = f"{len(invoice_ids)}" if status is None else f"{len(invoice_ids)} {status}"
+        if messagebox.askyesno("Batch PDFs",
+                               f"No invoices are selected. Generate PDFs for all {scope} invoices?"):
+            self._start_batch_pdfs(invoice_ids)
+    
+    def _start_batch_pdfs(self, invoice_ids):
+        """Choose a template and folder, then generate the PDFs in a progress window"""
+        template_choice = self._choose_template()
+        if not template_choice:
+            return
+        
+        output_dir = filedialog.askdirectory(title="Save Invoice PDFs To", initialdir=EXPORT_DIR)
+        if not output_dir:
+            return
+        
+        from gui.batch_pdf import BatchPDFWindow
+        BatchPDFWindow(self.root, self.db_manager, invoice_ids, template_choice, output_dir)
+        self._update_status(f"Generating {len(invoice_ids)} invoice PDFs...")
+    
     def _choose_template(self):
         """Show template selection dialog"""
         dialog = tk.Toplevel(self.root)
@@ -781,6 +822,13 @@ class MainWindow:
             ('default', 'Default', 'Standard invoice layout')
         ]
         
+        # Templates installed by other packages
+        from pdf_generator.registry import BUILTIN_TEMPLATES, get_template_names, template_registry
+        for value in get_template_names():
+            if value not in BUILTIN_TEMPLATES:
+                template = template_registry.get(value)
+                template_options.append((value, template.name, template.description))
+        
         for value, name, description in template_options:
             radio_frame = ttk.Frame(frame)
             radio_frame.pack(fill='x', pady=5)
@@ -956,61 +1004,54 @@ class MainWindow:
         except Exception as e:
             self._show_error(f"Error saving settings: {str(e)}")
     
-    def _export_data(self):
-        """Export data to CSV"""
-        try:
-            export_dir = filedialog.askdirectory(title="Choose Export Directory", initialdir=EXPORT_DIR)
-            if not export_dir:
-                return
-            
-            # Export invoices
-            invoices = self.db_manager.get_all_invoices()
-            invoice_file = os.path.join(export_dir, f"invoices_export_{datetime.now().strftime('%Y%m%d')}.csv")
-            
-            with open(invoice_file, 'w', newline='', encoding='utf-8') as f:
-                import csv
-                writer = csv.writer(f)
-                writer.writerow(['Invoice Number', 'Client', 'Date', 'Due Date', 'Amount', 'Status'])
-                
-                for invoice in invoices:
-                    client_name = invoice.client.name if invoice.client else "Unknown"
-                    invoice_date = invoice.invoice_date.strftime('%Y-%m-%d') if invoice.invoice_date else ""
-                    due_date = invoice.due_date.strftime('%Y-%m-%d') if invoice.due_date else ""
-                    
-                    writer.writerow([
-                        invoice.formatted_invoice_number,
-                        client_name,
-                        invoice_date,
-                        due_date,
-                        f"{invoice.total:.2f}",
-                        invoice.status
-                    ])
-            
-            # Export clients
-            clients = self.db_manager.get_all_clients()
-            client_file = os.path.join(export_dir, f"clients_export_{datetime.now().strftime('%Y%m%d')}.csv")
-            
-            with open(client_file, 'w', newline='', encoding='utf-8') as f:
-                import csv
-                writer = csv.writer(f)
-                writer.writerow(['Name', 'Email', 'Phone', 'Address', 'City', 'State', 'ZIP', 'Country'])
-                
-                for client in clients:
-                    writer.writerow([
-                        client.name,
-                        client.email or "",
-                        client.phone or "",
-                        client.address or "",
-                        client.city or "",
-                        client.state or "",
-                        client.zip_code or "",
-                        client.country or ""
-                    ])
-            
-            messagebox.showinfo("Export Complete", f"Data exported successfully!\n\nFiles saved:\n- {invoice_file}\n- {client_file}")
-            
-        except Exception as e:
-            self._show_error(f"Error exporting data: {str(e)}")
+    def _export_data(self, compress: bool = False):
+        """Export data to CSV on a worker thread, optionally gzip-compressed"""
+        export_dir = filedialog.askdirectory(title="Choose Export Directory", initialdir=EXPORT_DIR)
+        if not export_dir:
+            return
+        
+        from database.export import export_csv
+        self.status_var.set("Exporting data...")
+        self.tasks.submit(
+            'export_csv',
+            lambda report: export_csv(self.db_manager, export_dir, compress=compress,
+                                      progress=lambda *args: report(args)),
+            self._export_finished,
+            lambda e: self._show_error(f"Error exporting data: {str(e)}"),
+            on_progress=self._show_export_progress
+        )
+    
+    def _export_analytics(self):
+        """Append new and changed data to a Parquet dataset on a worker thread"""
+        export_dir = filedialog.askdirectory(title="Choose Analytics Export Directory", initialdir=EXPORT_DIR)
+        if not export_dir:
+            return
+        
+        from database.export import export_analytics
+        self.status_var.set("Exporting analytics data...")
+        self.tasks.submit(
+            'export_analytics',
+            lambda report: [path for path in export_analytics(
+                self.db_manager, export_dir, progress=lambda *args: report(args)
+            ).values() if path],
+            self._export_finished,
+            lambda e: self._show_error(f"Error exporting analytics data: {str(e)}"),
+            on_progress=self._show_export_progress
+        )
+    
+    def _show_export_progress(self, progress):
+        """Show rows exported so far in the status bar"""
+        label, done, total = progress
+        if total:
+            self.status_var.set(f"Exporting {label}: {done:,} of {total:,}")
+        else:
+            self.status_var.set(f"Exporting {label}: {done:,}")
+    
+    def _export_finished(self, files):
+        """Report the files written by an export"""
+        self._update_status("Export complete")
+        file_list = "\n".join(f"- {path}" for path in files) or "- No new data since the last export"
+        messagebox.showinfo("Export Complete", f"Data exported successfully!\n\nFiles saved:\n{file_list}")
     
     def _backup_database(self):
         """Create database backup"""
@@ -1078,6 +1119,20 @@ Built with Python and tkinter"""
         messagebox.showerror("Error", message)
         self._update_status("Error occurred")
     
+    def _on_background_activity(self, busy_keys):
+        """Show the status bar progress indicator while background loads run"""
+        busy = bool(busy_keys)
+        if busy == self._progress_visible:
+            return
+        
+        self._progress_visible = busy
+        if busy:
+            self.status_progress.pack(side='right', padx=5)
+            self.status_progress.start(15)
+        else:
+            self.status_progress.stop()
+            self.status_progress.pack_forget()
+    
     def _update_status(self, message):
         """Update status bar"""
         self.status_var.set(message)
@@ -1092,6 +1147,12 @@ Built with Python and tkinter"""
         
         # Start main loop
         self.root.mainloop()
+        
+        # Drop queued background work and let running tasks finish before closing their connections
+        self.tasks.shutdown()
+        
+        # Release pooled database connections
+        self.db_manager.close()
 
 def main():
     """Main entry point"""
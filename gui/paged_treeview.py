@@ -0,0 +1,170 @@
+# File: paged_treeview.py
+# Location: InvoiceGeneratorPro/gui/paged_treeview.py
+
+from tkinter import ttk
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import LIST_PAGE_SIZE
+
+# Fetch the next page once the visible part of the tree reaches this fraction
+LOAD_MORE_THRESHOLD = 0.9
+
+# (iid, values, tags) describing one Treeview row
+RowSpec = Tuple[str, tuple, tuple]
+
+class PagedTreeLoader:
+    """Fills a Treeview one page at a time as the user scrolls
+    
+    fetch_page(cursor, limit) returns (rows, next_cursor) with next_cursor None
+    after the last page, matching DatabaseManager's keyset page methods.
+    row_values(row) returns the (iid, values, tags) to show for one row; the
+    iid must be unique within the tree (e.g. the record id).
+    
+    Given a BackgroundTasks instance, pages are fetched on a worker thread under
+    ``key`` (reloads) and ``key + ':next'`` (scrolling); otherwise fetch_page is
+    called directly on the Tk thread.
+    """
+    
+    def __init__(self, tree: ttk.Treeview, scrollbar: ttk.Scrollbar,
+                 fetch_page: Callable[[Any, int], Tuple[List[Any], Any]],
+                 row_values: Callable[[Any], RowSpec],
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 page_size: int = LIST_PAGE_SIZE, tasks=None, key: str = ''):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_page = fetch_page
+        self.row_values = row_values
+        self.on_error = on_error
+        self.page_size = page_size
+        self.tasks = tasks
+        self.key = key
+        
+        self._epoch = 0  # Bumped by every reload; page results from older epochs are dropped
+        self._cursor = None
+        self._exhausted = True
+        self._load_pending = False
+        self._shown: Dict[str, Tuple[tuple, tuple]] = {}  # iid -> (values, tags) on screen
+        
+        self.tree.configure(yscrollcommand=self._on_scroll)
+    
+    @property
+    def exhausted(self) -> bool:
+        """True once every page has been loaded"""
+        return self._exhausted
+    
+    def reload(self, fetch_page: Optional[Callable[[Any, int], Tuple[List[Any], Any]]] = None):
+        """Fetch the first page again, optionally from a new source, and show it by diff
+        
+        Until the page arrives the current rows stay on screen and scrolling does
+        not load more.
+        """
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        
+        self._epoch += 1
+        self._exhausted = True
+        self._load_pending = False
+        if self.tasks is not None:
+            self.tasks.cancel(f"{self.key}:next")
+        self._fetch(self.key, self.fetch_page, None, replace=True)
+    
+    def show_rows(self, rows: List[Any], next_cursor: Any = None,
+                  fetch_page: Optional[Callable[[Any, int], Tuple[List[Any], Any]]] = None):
+        """Replace the tree contents with rows fetched elsewhere (e.g. on a worker thread)
+        
+        The tree is updated by difference: rows that are already shown keep their
+        item and are only edited or moved when needed, so the view does not
+        flicker or lose its selection. Later pages continue from next_cursor.
+        """
+        if fetch_page is not None:
+            self.fetch_page = fetch_page
+        
+        specs = [self.row_values(row) for row in rows]
+        wanted = {iid for iid, _, _ in specs}
+        
+        stale = [iid for iid in self._shown if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._shown[iid]
+        
+        for index, (iid, values, tags) in enumerate(specs):
+            shown = self._shown.get(iid)
+            if shown is None:
+                self.tree.insert('', index, iid=iid, values=values, tags=tags)
+            elif shown != (values, tags):
+                self.tree.item(iid, values=values, tags=tags)
+            self._shown[iid] = (values, tags)
+        
+        # Reorder only if the surviving rows are not already in result order
+        order = [iid for iid, _, _ in specs]
+        if list(self.tree.get_children()) != order:
+            for index, iid in enumerate(order):
+                self.tree.move(iid, '', index)
+        
+        self._cursor = next_cursor
+        self._exhausted = next_cursor is None
+    
+    def load_next_page(self):
+        """Fetch and append the next page, if any"""
+        if self._exhausted:
+            self._load_pending = False
+            return
+        self._fetch(f"{self.key}:next", self.fetch_page, self._cursor, replace=False)
+    
+    def _fetch(self, key: str, fetch_page, cursor, replace: bool):
+        """Run fetch_page now or on a worker, then show or append the page"""
+        epoch = self._epoch
+        deliver = lambda page: self._deliver(epoch, page, replace)
+        fail = lambda e: self._fail(epoch, e)
+        
+        if self.tasks is not None:
+            self.tasks.submit(key, lambda: fetch_page(cursor, self.page_size), deliver, fail)
+            return
+        
+        try:
+            page = fetch_page(cursor, self.page_size)
+        except Exception as e:
+            fail(e)
+            return
+        deliver(page)
+    
+    def _deliver(self, epoch: int, page, replace: bool):
+        """Show a fetched page unless a reload has happened since it was requested"""
+        if epoch != self._epoch:
+            return
+        
+        rows, next_cursor = page
+        self._load_pending = False
+        if replace:
+            self.show_rows(rows, next_cursor)
+            return
+        
+        self._cursor = next_cursor
+        self._exhausted = next_cursor is None
+        for row in rows:
+            iid, values, tags = self.row_values(row)
+            if iid in self._shown:
+                continue  # Already shown, e.g. inserted since the page was cut
+            self.tree.insert('', 'end', iid=iid, values=values, tags=tags)
+            self._shown[iid] = (values, tags)
+    
+    def _fail(self, epoch: int, error: Exception):
+        """Stop paging after a failed fetch and report it"""
+        if epoch != self._epoch:
+            return
+        
+        self._load_pending = False
+        self._exhausted = True
+        if self.on_error:
+            self.on_error(error)
+    
+    def _on_scroll(self, first, last):
+        """yscrollcommand hook: update the scrollbar and load more near the end"""
+        self.scrollbar.set(first, last)
+        
+        # Also fires when the first page does not fill the view, so it keeps
+        # loading until the tree is scrollable or the data runs out
+        if not self._exhausted and not self._load_pending and float(last) >= LOAD_MORE_THRESHOLD:
+            self._load_pending = True
+            self.tree.after_idle(self.load_next_page)
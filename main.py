@@ -17,8 +17,14 @@ Author: Your Business Name
 Version: 1.0.0
 """
 
+import time
+
+# Startup timing is measured from here, before anything heavier is imported
+_STARTUP_BEGAN = time.perf_counter()
+
 import sys
 import os
+import multiprocessing
 import tkinter as tk
 from tkinter import messagebox
 
@@ -26,6 +32,29 @@ from tkinter import messagebox
 project_root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, project_root)
 
+# Pass --startup-timing to print how long each startup step took
+STARTUP_TIMING_FLAG = "--startup-timing"
+
+_startup_marks = []
+
+def mark_startup(step: str):
+    """Record that a startup step has finished"""
+    _startup_marks.append((step, time.perf_counter()))
+
+def report_startup_timing():
+    """Print the time taken by each startup step to stderr"""
+    from config import STARTUP_TARGET_MS
+    
+    previous = _STARTUP_BEGAN
+    for step, finished in _startup_marks:
+        print(f"startup: {step:<24} {(finished - previous) * 1000:7.1f} ms", file=sys.stderr)
+        previous = finished
+    
+    total_ms = (previous - _STARTUP_BEGAN) * 1000
+    verdict = "ok" if total_ms <= STARTUP_TARGET_MS else "over target"
+    print(f"startup: {'total':<24} {total_ms:7.1f} ms (target {STARTUP_TARGET_MS} ms, {verdict})",
+          file=sys.stderr)
+
 def setup_error_handling():
     """Setup global error handling for end users"""
     def handle_exception(exc_type, exc_value, exc_traceback):
@@ -59,30 +88,21 @@ Error: {exc_type.__name__}"""
     sys.excepthook = handle_exception
 
 def initialize_database():
-    """Initialize database and return success status"""
+    """Create the app directories and open the database; returns the manager or None on failure"""
     try:
+        from config import ensure_app_directories
         from database.db_manager import DatabaseManager
-        db_manager = DatabaseManager()
-        # Test basic functionality
-        db_manager.get_dashboard_stats()
-        return True
+        ensure_app_directories()
+        return DatabaseManager()
     except Exception:
-        return False
+        return None
 
-def create_sample_data():
-    """Create sample data for new users"""
+def create_sample_data(db_manager):
+    """Create sample data for new users; returns True if it was created"""
     try:
-        from database.db_manager import DatabaseManager
         from database.models import Client, Invoice, InvoiceItem
         from datetime import datetime, timedelta
         
-        db_manager = DatabaseManager()
-        
-        # Check if we already have data
-        stats = db_manager.get_dashboard_stats()
-        if stats['total_clients'] > 0:
-            return  # Already have data
-        
         # Create sample clients
         sample_clients = [
             Client(
@@ -149,12 +169,12 @@ def create_sample_data():
                     InvoiceItem(
                         description=f"Consulting Services - Phase {j+1}",
                         quantity=10.0,
-                        rate=150.0
+                        rate_cents=15000
                     ),
                     InvoiceItem(
                         description="Project Documentation",
                         quantity=1.0,
-                        rate=500.0
+                        rate_cents=50000
                     )
                 ]
                 
@@ -162,7 +182,7 @@ def create_sample_data():
                     sample_items.append(InvoiceItem(
                         description="Additional Analysis",
                         quantity=5.0,
-                        rate=200.0
+                        rate_cents=20000
                     ))
                 
                 invoice.items = sample_items
@@ -181,20 +201,17 @@ def create_sample_data():
         settings.default_tax_rate = 0.0875
         settings.default_payment_terms = "Net 30"
         db_manager.save_app_settings(settings)
+        return True
         
     except Exception:
         # Don't fail the app if sample data creation fails
-        pass
+        return False
 
-def show_welcome_message():
+def show_welcome_message(stats: dict):
     """Show welcome message for first-time users"""
     try:
-        from database.db_manager import DatabaseManager
         from config import APP_NAME, APP_VERSION
         
-        db_manager = DatabaseManager()
-        stats = db_manager.get_dashboard_stats()
-        
         # Only show welcome if no data exists
         if stats['total_clients'] == 0 and stats['total_invoices'] == 0:
             root = tk.Tk()
@@ -226,9 +243,13 @@ def main():
     # Setup error handling for end users
     setup_error_handling()
     
+    show_timing = STARTUP_TIMING_FLAG in sys.argv[1:]
+    mark_startup("imports")
+    
     try:
-        # Initialize database
-        if not initialize_database():
+        # Initialize database once; the same manager is shared by everything below
+        db_manager = initialize_database()
+        if db_manager is None:
             # Show user-friendly error
             root = tk.Tk()
             root.withdraw()
@@ -239,17 +260,27 @@ def main():
             root.destroy()
             return 1
         
-        # Create sample data if needed
-        create_sample_data()
+        mark_startup("database")
         
-        # Show welcome message for new users
-        show_welcome_message()
+        # Create sample data if needed, and welcome users it could not be created for
+        stats = db_manager.get_dashboard_stats()
+        if stats['total_clients'] == 0 and not create_sample_data(db_manager):
+            show_welcome_message(stats)
+        mark_startup("first-run checks")
         
         # Import and start main application
         from gui.main_window import MainWindow
+        mark_startup("GUI imports")
         
         # Create and run the application
-        app = MainWindow()
+        app = MainWindow(db_manager)
+        mark_startup("main window built")
+        if show_timing:
+            def first_paint():
+                app.root.update_idletasks()  # Flush pending widget drawing first
+                mark_startup("first paint")
+                report_startup_timing()
+            app.root.after_idle(first_paint)
         app.run()
         
         return 0
@@ -275,6 +306,8 @@ def main():
 
 if __name__ == "__main__":
     """Entry point when application is launched"""
+    # Batch PDF generation starts worker processes; needed for frozen Windows builds
+    multiprocessing.freeze_support()
     try:
         exit_code = main()
         sys.exit(exit_code)
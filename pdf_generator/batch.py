@@ -0,0 +1,133 @@
+# File: batch.py
+# Location: InvoiceGeneratorPro/pdf_generator/batch.py
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from config import DATABASE_PATH, EXPORT_DIR, ERROR_MESSAGES, PDF_BATCH_CHUNK_SIZE
+
+# Template name that selects InvoicePDFGenerator rather than a templates.py template
+DEFAULT_TEMPLATE = 'default'
+
+@dataclass
+class BatchResult:
+    """Outcome of a batch PDF run"""
+    generated: List[Tuple[int, str]] = field(default_factory=list)  # (invoice_id, output path)
+    failed: List[Tuple[int, str]] = field(default_factory=list)     # (invoice_id, error message)
+    cancelled: bool = False
+    
+    @property
+    def processed(self) -> int:
+        """Number of invoices finished, successfully or not"""
+        return len(self.generated) + len(self.failed)
+
+# Per-process state, built once by _init_worker and reused for every invoice
+_worker_db = None
+_worker_render = None
+
+def _init_worker(db_path: str, template_name: str):
+    """Open the database and build the renderer once per worker process
+    
+    Rendering goes through the PDF cache, so re-running a batch over unchanged
+    invoices only copies files.
+    """
+    global _worker_db, _worker_render
+    from database.db_manager import DatabaseManager
+    
+    _worker_db = DatabaseManager(db_path)
+    if template_name == DEFAULT_TEMPLATE:
+        from .invoice_pdf import generate_invoice_pdf, get_pdf_generator
+        get_pdf_generator()
+        _worker_render = generate_invoice_pdf
+    else:
+        from .templates import generate_invoice_with_template, get_template
+        get_template(template_name)
+        _worker_render = lambda invoice, output_path: generate_invoice_with_template(
+            invoice, template_name, output_path)
+
+def _render_chunk(invoice_ids: List[int], output_dir: str) -> List[Tuple[int, Optional[str], Optional[str]]]:
+    """Render a chunk of invoices in a worker; returns (invoice_id, path, error) per invoice"""
+    from .invoice_pdf import generate_invoice_filename
+    
+    invoices = {invoice.id: invoice for invoice in _worker_db.get_invoices_by_ids(invoice_ids)}
+    results = []
+    for invoice_id in invoice_ids:
+        invoice = invoices.get(invoice_id)
+        if invoice is None:
+            results.append((invoice_id, None, ERROR_MESSAGES["invoice_not_found"]))
+            continue
+        
+        try:
+            output_path = os.path.join(output_dir, generate_invoice_filename(invoice))
+            results.append((invoice_id, _worker_render(invoice, output_path), None))
+        except Exception as e:
+            results.append((invoice_id, None, str(e)))
+    return results
+
+def generate_invoices_batch(invoice_ids: Optional[Sequence[int]] = None, status: Optional[str] = None,
+                            template_name: str = DEFAULT_TEMPLATE, output_dir: str = EXPORT_DIR,
+                            db_path: str = DATABASE_PATH, max_workers: Optional[int] = None,
+                            chunk_size: int = PDF_BATCH_CHUNK_SIZE,
+                            progress: Optional[Callable[[int, int, int, Optional[str]], None]] = None,
+                            cancel_event: Optional[threading.Event] = None) -> BatchResult:
+    """Render many invoice PDFs across a pool of worker processes
+    
+    Invoices are given by id, or when invoice_ids is None, every invoice (with the
+    given status, if any). Workers load invoices from db_path themselves, so only
+    ids and results cross process boundaries.
+    
+    progress(done, total, invoice_id, error) is called in the calling thread as
+    each invoice finishes. Setting cancel_event stops handing out work; chunks
+    already rendering finish in the background and are not reported.
+    """
+    if invoice_ids is None:
+        from database.db_manager import DatabaseManager
+        db_manager = DatabaseManager(db_path)
+        try:
+            invoice_ids = db_manager.get_invoice_ids(status)
+        finally:
+            db_manager.close()
+    
+    invoice_ids = list(invoice_ids)
+    result = BatchResult()
+    if not invoice_ids:
+        return result
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    chunks = [invoice_ids[start:start + chunk_size] for start in range(0, len(invoice_ids), chunk_size)]
+    workers = min(max_workers or os.cpu_count() or 1, len(chunks))
+    total = len(invoice_ids)
+    
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(db_path, template_name))
+    try:
+        pending = {pool.submit(_render_chunk, chunk, output_dir): chunk for chunk in chunks}
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                result.cancelled = True
+                break
+            
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    outcomes = future.result()
+                except Exception as e:
+                    # The worker itself failed (e.g. it crashed); report every invoice in its chunk
+                    outcomes = [(invoice_id, None, str(e) or type(e).__name__) for invoice_id in chunk]
+                
+                for invoice_id, path, error in outcomes:
+                    if error is None:
+                        result.generated.append((invoice_id, path))
+                    else:
+                        result.failed.append((invoice_id, error))
+                    if progress is not None:
+                        progress(result.processed, total, invoice_id, error)
+    finally:
+        pool.shutdown(wait=not result.cancelled, cancel_futures=True)
+    
+    return result
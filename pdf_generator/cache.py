@@ -0,0 +1,224 @@
+# File: cache.py
+# Location: InvoiceGeneratorPro/pdf_generator/cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from database.models import Invoice
+from config import PDF_CACHE_DIR, PDF_CACHE_MAX_BYTES
+
+def invoice_render_fields(invoice: Invoice) -> dict:
+    """Every invoice field that can appear in a rendered PDF
+    
+    Bookkeeping fields (ids, created/updated dates) are left out so saving an
+    unchanged invoice does not invalidate its cached PDF.
+    """
+    fields = invoice.to_dict()
+    for name in ('id', 'client_id', 'created_date', 'updated_date'):
+        fields.pop(name, None)
+    
+    fields['formatted_invoice_number'] = invoice.formatted_invoice_number
+    fields['items'] = [
+        {k: v for k, v in item.to_dict().items() if k != 'id'} for item in invoice.items
+    ]
+    if invoice.client is not None:
+        client = invoice.client.to_dict()
+        for name in ('id', 'created_date', 'notes'):
+            client.pop(name, None)
+        fields['client'] = client
+    else:
+        fields['client'] = None
+    return fields
+
+def pdf_cache_key(invoice: Invoice, template_name: str, template_version: str) -> str:
+    """Stable content hash identifying one rendering of an invoice"""
+    payload = json.dumps(
+        {'template': template_name, 'version': template_version, 'invoice': invoice_render_fields(invoice)},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class PDFCache:
+    """Content-addressed store of rendered PDFs with LRU eviction by total size
+    
+    Each PDF is stored as <key>.pdf in cache_dir; a file's mtime is its last use,
+    so the LRU order survives restarts. Safe to share between threads. Several
+    processes may use one directory (batch PDF workers do): each keeps its own
+    index and rescans the directory before evicting, so eviction accounts for
+    every process's PDFs. Between evictions the directory can exceed max_bytes
+    by what other processes wrote since this one last scanned it. An entry
+    evicted by another process reads as a miss.
+    """
+    
+    def __init__(self, cache_dir: str = PDF_CACHE_DIR, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: Optional["OrderedDict[str, int]"] = None  # key -> size, least recently used first
+        self._total_bytes = 0
+    
+    @property
+    def total_bytes(self) -> int:
+        """Size of all cached PDFs known to this process"""
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+    
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached PDF bytes for key, or None"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self._forget(key)
+            return None
+        
+        self._touch(key)
+        return data
+    
+    def copy_to(self, key: str, output_path: str) -> bool:
+        """Copy the cached PDF for key to output_path; False on a miss"""
+        try:
+            shutil.copyfile(self._path(key), output_path)
+        except FileNotFoundError:
+            self._forget(key)
+            return False
+        
+        self._touch(key)
+        return True
+    
+    def put(self, key: str, data: bytes):
+        """Store a rendered PDF and evict least recently used ones beyond max_bytes"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        
+        # Write to a temporary file and rename, so readers never see a partial PDF
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        
+        with self._lock:
+            self._load_index()
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                # Other processes sharing the directory may have added or used PDFs
+                # since the index was built, so evict from a fresh scan
+                self._entries = None
+                self._load_index()
+                self._evict()
+    
+    def fetch(self, key: str, render: Callable[[], bytes]) -> bytes:
+        """Cached PDF bytes for key, rendering and storing them on a miss"""
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+    
+    def clear(self):
+        """Delete every cached PDF"""
+        with self._lock:
+            self._load_index()
+            for key in list(self._entries):
+                self._remove_file(key)
+            self._entries.clear()
+            self._total_bytes = 0
+    
+    def _path(self, key: str) -> str:
+        """File holding the PDF for key"""
+        return os.path.join(self.cache_dir, f"{key}.pdf")
+    
+    def _load_index(self):
+        """Build the LRU index from the cache directory on first use (lock held)"""
+        if self._entries is not None:
+            return
+        
+        entries = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.pdf') and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.name[:-4], stat.st_size))
+        except FileNotFoundError:
+            pass
+        
+        entries.sort()
+        self._entries = OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._entries.values())
+    
+    def _touch(self, key: str):
+        """Mark key as most recently used"""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        
+        with self._lock:
+            self._load_index()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+    
+    def _forget(self, key: str):
+        """Drop key from the index after its file turned out to be missing"""
+        with self._lock:
+            if self._entries is not None and key in self._entries:
+                self._total_bytes -= self._entries.pop(key)
+    
+    def _evict(self):
+        """Remove least recently used PDFs until under max_bytes (lock held)"""
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._remove_file(key)
+    
+    def _remove_file(self, key: str):
+        """Delete the file for key if it still exists"""
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+# Process-wide cache, created on first use
+_shared_cache: Optional[PDFCache] = None
+_shared_cache_lock = threading.Lock()
+
+def get_pdf_cache() -> PDFCache:
+    """Return the shared PDFCache, creating it on first use"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = PDFCache()
+    return _shared_cache
+
+def generate_cached_pdf(invoice: Invoice, template_name: str, template_version: str,
+                        render: Callable[[Invoice], bytes], output_path: str) -> str:
+    """Write invoice's PDF to output_path, copying it from the cache when unchanged"""
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    cache = get_pdf_cache()
+    key = pdf_cache_key(invoice, template_name, template_version)
+    if cache.copy_to(key, output_path):
+        return output_path
+    
+    data = render(invoice)
+    cache.put(key, data)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return output_path
@@ -1,9 +1,13 @@
 # File: invoice_pdf.py
 # Location: InvoiceGeneratorPro/pdf_generator/invoice_pdf.py
 
+import copy
+import io
 import os
 import re
+import threading
 from datetime import datetime
+from typing import BinaryIO
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -13,20 +17,119 @@ from reportlab.platypus.flowables import HRFlowable
 from reportlab.lib.enums import TA_LEFT, TA_RIGHT, TA_CENTER
 
 from database.models import Invoice
+from .cache import generate_cached_pdf, get_pdf_cache, pdf_cache_key
 from utils.calculations import CurrencyFormatter, DateCalculator
 from config import (
     PDF_MARGIN, PDF_HEADER_FONT_SIZE, PDF_TITLE_FONT_SIZE,
-    DEFAULT_LOGO_PATH, EXPORT_DIR, APP_NAME
+    DEFAULT_LOGO_PATH, EXPORT_DIR, APP_NAME, PDF_CACHE_ENABLED
 )
 
+# Table styles are immutable once built, so one instance of each is shared by every render
+HEADER_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+])
+
+INFO_TABLE_STYLE = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+    ('ALIGN', (1, 0), (1, 0), 'LEFT'),
+])
+
+DETAILS_TABLE_STYLE = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+    ('RIGHTPADDING', (0, 0), (0, -1), 10),
+])
+
+ITEMS_TABLE_STYLE = TableStyle([
+    # Header row styling
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    
+    # Data rows styling
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),    # Description left
+    ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Quantity center
+    ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),  # Rate and Amount right
+    
+    # Grid lines
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7')),
+    
+    # Alternating row colors
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
+    
+    # Padding
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+TOTALS_TABLE_STYLE = TableStyle([
+    # General styling
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    
+    # Subtotal and tax rows
+    ('FONTNAME', (0, 0), (-1, -2), 'Helvetica'),
+    ('TEXTCOLOR', (0, 0), (-1, -2), colors.HexColor('#2C3E50')),
+    
+    # Total row (last row)
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, -1), (-1, -1), 12),
+    ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#2E86AB')),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ECF0F1')),
+    
+    # Borders
+    ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#2E86AB')),
+    ('LINEBELOW', (0, -1), (-1, -1), 2, colors.HexColor('#2E86AB')),
+    
+    # Padding
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 6),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+])
+
+RIGHT_ALIGN_TABLE_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, 0), 'RIGHT'),
+])
+
 class InvoicePDFGenerator:
-    """Generates professional PDF invoices"""
+    """Generates professional PDF invoices
+    
+    Styles and the decoded logo are built once in __init__ and only read while
+    rendering, so one instance can be kept for the life of the process and used
+    from several threads at once (see get_pdf_generator()).
+    
+    Output is deterministic for a given invoice: document metadata is fixed
+    (reportlab's invariant mode) and the "Generated on" footer line only appears
+    when a generated_at time is passed in. The GUI passes one for single-invoice
+    exports; batch exports leave it out so their PDFs can be cached.
+    """
+    
+    # Bump when the layout changes so cached PDFs are re-rendered
+    version = "1"
     
     def __init__(self):
         self.page_size = letter
         self.margin = PDF_MARGIN
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
+        self._logo_identity: str | None = None
+        self._logo = self._load_logo()
     
     def _setup_custom_styles(self):
         """Set up custom paragraph styles"""
@@ -89,24 +192,71 @@ class InvoicePDFGenerator:
             alignment=TA_RIGHT,
             fontName='Helvetica-Bold'
         ))
+        
+        # Generated-on footer style
+        self.styles.add(ParagraphStyle(
+            name='Timestamp',
+            parent=self.styles['Normal'],
+            fontSize=8,
+            textColor=colors.HexColor('#7F8C8D'),
+            alignment=TA_CENTER
+        ))
+    
+    def _load_logo(self) -> Image | None:
+        """Decode the company logo once; None if there is none or it cannot be read
+        
+        Also records the size and mtime of the file that was decoded, so cache
+        keys describe the logo renders actually use.
+        """
+        try:
+            stat = os.stat(DEFAULT_LOGO_PATH)
+            # lazy=0 reads the image now so every render shares the decoded data
+            logo = Image(DEFAULT_LOGO_PATH, width=120, height=60, lazy=0)
+        except (OSError, IOError, ValueError):
+            return None
+        
+        self._logo_identity = f"{stat.st_size}:{stat.st_mtime_ns}"
+        return logo
     
-    def generate_invoice_pdf(self, invoice: Invoice, output_path: str | None = None) -> str:
+    def cache_version(self) -> str:
+        """Layout version plus the decoded logo's identity, for PDF cache keys"""
+        if self._logo is None:
+            return self.version
+        return f"{self.version}:logo:{self._logo_identity}"
+    
+    def generate_invoice_pdf(self, invoice: Invoice, output_path: str | None = None,
+                             generated_at: datetime | None = None) -> str:
         """Generate PDF for an invoice"""
         if not output_path:
-            filename = f"Invoice_{invoice.formatted_invoice_number}_{datetime.now().strftime('%Y%m%d')}.pdf"
-            output_path = os.path.join(EXPORT_DIR, filename)
+            output_path = default_invoice_pdf_path(invoice)
         
         # Ensure output directory exists
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        with open(output_path, 'wb') as stream:
+            self.write_invoice_pdf(invoice, stream, generated_at)
         
+        return output_path
+    
+    def render_invoice_pdf(self, invoice: Invoice, generated_at: datetime | None = None) -> bytes:
+        """Render an invoice PDF in memory and return its bytes"""
+        buffer = io.BytesIO()
+        self.write_invoice_pdf(invoice, buffer, generated_at)
+        return buffer.getvalue()
+    
+    def write_invoice_pdf(self, invoice: Invoice, stream: BinaryIO, generated_at: datetime | None = None):
+        """Render an invoice PDF into a writable binary stream"""
         # Create PDF document
         doc = SimpleDocTemplate(
-            output_path,
+            stream,
             pagesize=self.page_size,
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            invariant=1
         )
         
         # Build PDF content
@@ -138,12 +288,10 @@ class InvoicePDFGenerator:
             story.append(Spacer(1, 15))
         
         # Add footer
-        story.extend(self._build_footer(invoice))
+        story.extend(self._build_footer(invoice, generated_at))
         
         # Build PDF
         doc.build(story)
-        
-        return output_path
     
     def _build_header(self, invoice: Invoice) -> list:
         """Build PDF header section"""
@@ -151,16 +299,9 @@ class InvoicePDFGenerator:
         
         # Left side - Logo (if exists) or Company Name
         left_content = []
-        if os.path.exists(DEFAULT_LOGO_PATH):
-            try:
-                logo = Image(DEFAULT_LOGO_PATH, width=120, height=60)
-                left_content.append(logo)
-            except (OSError, IOError, ValueError):
-                # If logo fails to load, use company name
-                left_content.append(Paragraph(
-                    invoice.company_name or APP_NAME,
-                    self.styles['InvoiceHeader']
-                ))
+        if self._logo is not None:
+            # Flowables hold per-render state while drawn; the copy shares the decoded image
+            left_content.append(copy.copy(self._logo))
         else:
             left_content.append(Paragraph(
                 invoice.company_name or APP_NAME,
@@ -178,11 +319,7 @@ class InvoicePDFGenerator:
             [left_content, right_content]
         ], colWidths=[3*inch, 3*inch])
         
-        header_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ]))
+        header_table.setStyle(HEADER_TABLE_STYLE)
         
         elements.append(header_table)
         elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#2E86AB')))
@@ -201,11 +338,7 @@ class InvoicePDFGenerator:
             [company_info, client_info]
         ], colWidths=[3*inch, 3*inch])
         
-        info_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            ('ALIGN', (1, 0), (1, 0), 'LEFT'),
-        ]))
+        info_table.setStyle(INFO_TABLE_STYLE)
         
         elements.append(info_table)
         
@@ -275,15 +408,7 @@ class InvoicePDFGenerator:
         ]
         
         details_table = Table(details_data, colWidths=[1.5*inch, 2*inch])
-        details_table.setStyle(TableStyle([
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (0, -1), 10),
-        ]))
+        details_table.setStyle(DETAILS_TABLE_STYLE)
         
         elements.append(details_table)
         
@@ -312,33 +437,7 @@ class InvoicePDFGenerator:
         items_table = Table(table_data, colWidths=[3.5*inch, 0.7*inch, 1*inch, 1*inch])
         
         # Style the table
-        items_table.setStyle(TableStyle([
-            # Header row styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2E86AB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            
-            # Data rows styling
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),    # Description left
-            ('ALIGN', (1, 1), (1, -1), 'CENTER'),  # Quantity center
-            ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),  # Rate and Amount right
-            
-            # Grid lines
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7')),
-            
-            # Alternating row colors
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F8F9FA')]),
-            
-            # Padding
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
+        items_table.setStyle(ITEMS_TABLE_STYLE)
         
         elements.append(items_table)
         
@@ -373,39 +472,11 @@ class InvoicePDFGenerator:
         
         # Create totals table
         totals_table = Table(totals_data, colWidths=[1.5*inch, 1.2*inch])
-        totals_table.setStyle(TableStyle([
-            # General styling
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            
-            # Subtotal and tax rows
-            ('FONTNAME', (0, 0), (-1, -2), 'Helvetica'),
-            ('TEXTCOLOR', (0, 0), (-1, -2), colors.HexColor('#2C3E50')),
-            
-            # Total row (last row)
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -1), (-1, -1), 12),
-            ('TEXTCOLOR', (0, -1), (-1, -1), colors.HexColor('#2E86AB')),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ECF0F1')),
-            
-            # Borders
-            ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#2E86AB')),
-            ('LINEBELOW', (0, -1), (-1, -1), 2, colors.HexColor('#2E86AB')),
-            
-            # Padding
-            ('LEFTPADDING', (0, 0), (-1, -1), 8),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-            ('TOPPADDING', (0, 0), (-1, -1), 6),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-        ]))
+        totals_table.setStyle(TOTALS_TABLE_STYLE)
         
         # Right-align the totals table
         totals_wrapper = Table([[totals_table]], colWidths=[6.5*inch])
-        totals_wrapper.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'RIGHT'),
-        ]))
+        totals_wrapper.setStyle(RIGHT_ALIGN_TABLE_STYLE)
         
         elements.append(totals_wrapper)
         
@@ -420,7 +491,7 @@ class InvoicePDFGenerator:
         
         return elements
     
-    def _build_footer(self, invoice: Invoice) -> list:
+    def _build_footer(self, invoice: Invoice, generated_at: datetime | None = None) -> list:
         """Build footer section"""
         elements = []
         
@@ -437,27 +508,57 @@ class InvoicePDFGenerator:
         elements.append(Spacer(1, 10))
         elements.append(Paragraph(footer_text, self.styles['Normal']))
         
-        # Generated timestamp
-        timestamp = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-        elements.append(Spacer(1, 10))
-        elements.append(Paragraph(
-            f"<i>Generated on {timestamp} by {APP_NAME}</i>",
-            ParagraphStyle(
-                name='Timestamp',
-                parent=self.styles['Normal'],
-                fontSize=8,
-                textColor=colors.HexColor('#7F8C8D'),
-                alignment=TA_CENTER
-            )
-        ))
+        # Generated timestamp, only when asked for; it would make every render unique
+        if generated_at is not None:
+            timestamp = generated_at.strftime("%B %d, %Y at %I:%M %p")
+            elements.append(Spacer(1, 10))
+            elements.append(Paragraph(
+                f"<i>Generated on {timestamp} by {APP_NAME}</i>",
+                self.styles['Timestamp']
+            ))
         
         return elements
 
-@staticmethod
-def generate_invoice_pdf(invoice: Invoice, output_path: str | None = None) -> str:
-    """Convenience function to generate invoice PDF"""
-    generator = InvoicePDFGenerator()
-    return generator.generate_invoice_pdf(invoice, output_path)
+# Process-wide generator, created on first use
+_shared_generator: InvoicePDFGenerator | None = None
+_shared_generator_lock = threading.Lock()
+
+def get_pdf_generator() -> InvoicePDFGenerator:
+    """Return the shared InvoicePDFGenerator, building it on first use"""
+    global _shared_generator
+    if _shared_generator is None:
+        with _shared_generator_lock:
+            if _shared_generator is None:
+                _shared_generator = InvoicePDFGenerator()
+    return _shared_generator
+
+def generate_invoice_pdf(invoice: Invoice, output_path: str | None = None,
+                         generated_at: datetime | None = None) -> str:
+    """Convenience function to generate invoice PDF
+    
+    Unchanged invoices are copied from the PDF cache instead of re-rendered;
+    passing generated_at makes the output unique, so it bypasses the cache.
+    """
+    generator = get_pdf_generator()
+    if generated_at is not None or not PDF_CACHE_ENABLED:
+        return generator.generate_invoice_pdf(invoice, output_path, generated_at)
+    
+    return generate_cached_pdf(invoice, 'default', generator.cache_version(),
+                               generator.render_invoice_pdf, output_path or default_invoice_pdf_path(invoice))
+
+def render_invoice_pdf(invoice: Invoice, generated_at: datetime | None = None) -> bytes:
+    """Convenience function to render an invoice PDF to bytes, through the PDF cache"""
+    generator = get_pdf_generator()
+    if generated_at is not None or not PDF_CACHE_ENABLED:
+        return generator.render_invoice_pdf(invoice, generated_at)
+    
+    key = pdf_cache_key(invoice, 'default', generator.cache_version())
+    return get_pdf_cache().fetch(key, lambda: generator.render_invoice_pdf(invoice))
+
+def default_invoice_pdf_path(invoice: Invoice) -> str:
+    """Export-folder path used when no output path is given"""
+    filename = f"Invoice_{invoice.formatted_invoice_number}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return os.path.join(EXPORT_DIR, filename)
 
 def generate_invoice_filename(invoice: Invoice) -> str:
     """Generate a standard filename for an invoice PDF"""
@@ -0,0 +1,116 @@
+# File: registry.py
+# Location: InvoiceGeneratorPro/pdf_generator/registry.py
+
+import threading
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Callable, Dict, List, Union
+
+# Third-party packages add templates by declaring entry points in this group, e.g.
+#   [project.entry-points."invoicegeneratorpro.templates"]
+#   fancy = "fancy_invoices:FancyTemplate"
+# The object named must be an InvoiceTemplate subclass or a zero-argument factory.
+ENTRY_POINT_GROUP = 'invoicegeneratorpro.templates'
+
+# Built-in templates as "module:attribute", imported only when first used
+BUILTIN_TEMPLATES = {
+    'modern': 'pdf_generator.templates:ModernTemplate',
+    'classic': 'pdf_generator.templates:ClassicTemplate',
+    'minimal': 'pdf_generator.templates:MinimalTemplate',
+}
+
+# Used for unknown template names
+FALLBACK_TEMPLATE = 'modern'
+
+# A factory, or a "module:attribute" reference to one
+TemplateFactory = Union[str, Callable[[], object]]
+
+class TemplateRegistry:
+    """Maps template names to lazily constructed, cached InvoiceTemplate instances
+    
+    Nothing is imported or built until a template is asked for, so importing the
+    registry does not pull in reportlab. Each template is built once and shared;
+    templates are read-only while rendering.
+    """
+    
+    def __init__(self, builtins: Dict[str, TemplateFactory] = BUILTIN_TEMPLATES,
+                 group: str = ENTRY_POINT_GROUP):
+        self.group = group
+        self._factories: Dict[str, TemplateFactory] = dict(builtins)
+        self._instances: Dict[str, object] = {}
+        self._lock = threading.RLock()
+        self._discovered = False
+    
+    def register(self, name: str, factory: TemplateFactory):
+        """Add or replace a template; replaces any instance already built under name"""
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+    
+    def names(self) -> List[str]:
+        """Names of every known template, built-in ones first"""
+        with self._lock:
+            self._discover()
+            return list(self._factories)
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.names()
+    
+    def get(self, name: str):
+        """The template registered under name, or the fallback template
+        
+        The fallback is used for unknown names and for templates that fail to
+        load, which are then no longer listed.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        
+        with self._lock:
+            self._discover()
+            if name not in self._factories:
+                name = FALLBACK_TEMPLATE
+            
+            instance = self._instances.get(name)
+            if instance is None:
+                try:
+                    instance = self._resolve(self._factories[name])()
+                except Exception as e:
+                    if name == FALLBACK_TEMPLATE:
+                        raise
+                    # A broken plug-in is dropped rather than breaking template lookup
+                    print(f"Error loading template '{name}': {str(e)}")
+                    del self._factories[name]
+                    return self.get(FALLBACK_TEMPLATE)
+                self._instances[name] = instance
+            return instance
+    
+    def _discover(self):
+        """Register entry-point templates once; explicit registrations win (lock held)"""
+        if self._discovered:
+            return
+        self._discovered = True
+        
+        for entry_point in entry_points(group=self.group):
+            self._factories.setdefault(entry_point.name, entry_point)
+    
+    @staticmethod
+    def _resolve(factory) -> Callable[[], object]:
+        """Import a "module:attribute" reference or load an entry point"""
+        if isinstance(factory, str):
+            module_name, _, attribute = factory.partition(':')
+            return getattr(import_module(module_name), attribute)
+        if hasattr(factory, 'load'):
+            return factory.load()
+        return factory
+
+# Process-wide registry
+template_registry = TemplateRegistry()
+
+def register_template(name: str, factory: TemplateFactory):
+    """Make a template available by name (see TemplateRegistry.register)"""
+    template_registry.register(name, factory)
+
+def get_template_names() -> List[str]:
+    """Names of all available templates"""
+    return template_registry.names()
@@ -1,6 +1,10 @@
 # File: templates.py
 # Location: InvoiceGeneratorPro/pdf_generator/templates.py
 
+import io
+import os
+from typing import BinaryIO
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -11,10 +15,19 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER
 
 from database.models import Invoice
 from utils.calculations import CurrencyFormatter, DateCalculator
-from config import PDF_MARGIN
+from config import PDF_MARGIN, PDF_CACHE_ENABLED
+from .cache import generate_cached_pdf, get_pdf_cache, pdf_cache_key
+from .registry import template_registry
 
 class InvoiceTemplate:
-    """Base template class for invoice PDFs"""
+    """Base template class for invoice PDFs
+    
+    Subclasses implement write_pdf(); output must depend only on the invoice
+    (build documents with invariant=1) so rendered PDFs can be cached.
+    """
+    
+    # Bump in a subclass when its layout changes so cached PDFs are re-rendered
+    version = "1"
     
     def __init__(self, name: str, description: str):
         self.name = name
@@ -28,9 +41,29 @@ class InvoiceTemplate:
         """Setup base styles - can be overridden by subclasses"""
         pass
     
+    def cache_version(self) -> str:
+        """Version string included in PDF cache keys"""
+        return self.version
+    
     def generate_pdf(self, invoice: Invoice, output_path: str) -> str:
         """Generate PDF using this template"""
-        raise NotImplementedError("Subclasses must implement generate_pdf")
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        
+        with open(output_path, 'wb') as stream:
+            self.write_pdf(invoice, stream)
+        return output_path
+    
+    def render_pdf(self, invoice: Invoice) -> bytes:
+        """Render PDF using this template in memory and return its bytes"""
+        buffer = io.BytesIO()
+        self.write_pdf(invoice, buffer)
+        return buffer.getvalue()
+    
+    def write_pdf(self, invoice: Invoice, stream: BinaryIO):
+        """Render PDF using this template into a writable binary stream"""
+        raise NotImplementedError("Subclasses must implement write_pdf")
 
 class ModernTemplate(InvoiceTemplate):
     """Modern, clean template with blue accent colors"""
@@ -90,15 +123,16 @@ class ModernTemplate(InvoiceTemplate):
             alignment=TA_LEFT
         ))
     
-    def generate_pdf(self, invoice: Invoice, output_path: str) -> str:
-        """Generate modern template PDF"""
+    def write_pdf(self, invoice: Invoice, stream: BinaryIO):
+        """Write modern template PDF to stream"""
         doc = SimpleDocTemplate(
-            output_path,
+            stream,
             pagesize=self.page_size,
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            invariant=1
         )
         
         story = []
@@ -143,7 +177,6 @@ class ModernTemplate(InvoiceTemplate):
             story.append(Paragraph(invoice.notes, self.styles['Normal']))
         
         doc.build(story)
-        return output_path
     
     def _build_modern_info_section(self, invoice: Invoice) -> list:
         """Build modern info section"""
@@ -317,15 +350,16 @@ class ClassicTemplate(InvoiceTemplate):
             fontName='Times-Roman'
         ))
     
-    def generate_pdf(self, invoice: Invoice, output_path: str) -> str:
-        """Generate classic template PDF"""
+    def write_pdf(self, invoice: Invoice, stream: BinaryIO):
+        """Write classic template PDF to stream"""
         doc = SimpleDocTemplate(
-            output_path,
+            stream,
             pagesize=self.page_size,
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            invariant=1
         )
         
         story = []
@@ -372,7 +406,6 @@ class ClassicTemplate(InvoiceTemplate):
         story.append(Paragraph("Thank you for your business.", self.styles['ClassicBody']))
         
         doc.build(story)
-        return output_path
     
     def _build_classic_info_section(self, invoice: Invoice) -> list:
         """Build classic info section"""
@@ -494,28 +527,33 @@ class MinimalTemplate(InvoiceTemplate):
             description="Ultra-clean design with minimal colors and maximum white space"
         )
     
-    def generate_pdf(self, invoice: Invoice, output_path: str) -> str:
-        """Generate minimal template PDF"""
+    def _setup_styles(self):
+        """Setup minimal template styles"""
+        self.styles.add(ParagraphStyle(
+            name='MinimalTitle',
+            fontSize=32,
+            textColor=self.primary_color,
+            fontName='Helvetica',  # Helvetica-Light is not a standard PDF font
+            alignment=TA_LEFT
+        ))
+    
+    def write_pdf(self, invoice: Invoice, stream: BinaryIO):
+        """Write minimal template PDF to stream"""
         doc = SimpleDocTemplate(
-            output_path,
+            stream,
             pagesize=self.page_size,
             rightMargin=self.margin,
             leftMargin=self.margin,
             topMargin=self.margin,
-            bottomMargin=self.margin
+            bottomMargin=self.margin,
+            invariant=1
         )
         
         story = []
         
         # Simple invoice header
         story.append(Spacer(1, 20))
-        story.append(Paragraph("Invoice", ParagraphStyle(
-            name='MinimalTitle',
-            fontSize=32,
-            textColor=self.primary_color,
-            fontName='Helvetica-Light',
-            alignment=TA_LEFT
-        )))
+        story.append(Paragraph("Invoice", self.styles['MinimalTitle']))
         story.append(Spacer(1, 40))
         
         # Basic info in clean layout
@@ -574,24 +612,32 @@ class MinimalTemplate(InvoiceTemplate):
         story.append(total_table)
         
         doc.build(story)
-        return output_path
-
-# Template registry
-AVAILABLE_TEMPLATES = {
-    'modern': ModernTemplate(),
-    'classic': ClassicTemplate(),
-    'minimal': MinimalTemplate()
-}
 
+# Templates are looked up through the lazy registry in registry.py
 def get_template(template_name: str) -> InvoiceTemplate:
     """Get a template by name"""
-    return AVAILABLE_TEMPLATES.get(template_name, ModernTemplate())
+    return template_registry.get(template_name)
 
 def get_available_templates() -> dict:
     """Get all available templates"""
-    return {name: template.description for name, template in AVAILABLE_TEMPLATES.items()}
+    descriptions = {}
+    for name in template_registry.names():
+        template = template_registry.get(name)
+        if name in template_registry:  # Templates that fail to load are dropped
+            descriptions[name] = template.description
+    return descriptions
 
 def generate_invoice_with_template(invoice: Invoice, template_name: str, output_path: str) -> str:
     """Generate invoice PDF with specified template"""
     template = get_template(template_name)
-    return template.generate_pdf(invoice, output_path)
\ No newline at end of file
+    if not PDF_CACHE_ENABLED:
+        return template.generate_pdf(invoice, output_path)
+    return generate_cached_pdf(invoice, template_name, template.cache_version(), template.render_pdf, output_path)
+
+def render_invoice_with_template(invoice: Invoice, template_name: str) -> bytes:
+    """Render invoice PDF with specified template to bytes"""
+    template = get_template(template_name)
+    if not PDF_CACHE_ENABLED:
+        return template.render_pdf(invoice)
+    key = pdf_cache_key(invoice, template_name, template.cache_version())
+    return get_pdf_cache().fetch(key, lambda: template.render_pdf(invoice))
\ No newline at end of file
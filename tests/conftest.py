@@ -0,0 +1,28 @@
+# File: conftest.py
+# Location: InvoiceGeneratorPro/tests/conftest.py
+
+import pytest
+
+from database.db_manager import DatabaseManager
+from database.models import Client, Invoice, InvoiceItem
+
+@pytest.fixture
+def db(tmp_path):
+    """A DatabaseManager on a fresh database file"""
+    manager = DatabaseManager(str(tmp_path / "invoices.db"))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def invoice(db):
+    """A saved two-item invoice for a new client"""
+    client = db.save_client(Client(name="Acme"))
+    return db.save_invoice(Invoice(client_id=client.id, tax_rate=0.1, notes="Thanks", items=[
+        InvoiceItem(description="Design", quantity=2, rate_cents=5000),
+        InvoiceItem(description="Hosting", quantity=1, rate_cents=1250),
+    ]))
+
+def listed_invoice(db, invoice_id):
+    """The invoice as list queries return it, without its items loaded"""
+    return next(invoice for invoice in db.get_all_invoices() if invoice.id == invoice_id)
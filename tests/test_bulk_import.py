@@ -0,0 +1,197 @@
+# File: test_bulk_import.py
+# Location: InvoiceGeneratorPro/tests/test_bulk_import.py
+
+import csv
+import gzip
+import json
+
+import pytest
+
+from config import ERROR_MESSAGES
+from database import bulk_import
+from database.db_manager import DatabaseManager
+from database.models import Client, Invoice, InvoiceItem
+
+# Emails are left blank where valid: email-validator checks deliverability over DNS
+CLIENTS_CSV = """Name,Email,Zip,Notes
+Acme,,12345,First
+,,,Missing name
+Globex,not-an-email,,Bad email
+Acme,,,Duplicate name
+Initech,,,Last
+"""
+
+def write_jsonl(path, lines):
+    """Write JSON Lines, gzipped when path ends in .gz"""
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'wt', encoding='utf-8') as f:
+        for line in lines:
+            f.write((line if isinstance(line, str) else json.dumps(line)) + "\n")
+
+def read_report(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+def test_read_records_normalizes_csv_headers(tmp_path):
+    path = tmp_path / "clients.csv"
+    path.write_text(CLIENTS_CSV, encoding='utf-8')
+    
+    records = list(bulk_import.read_records(str(path)))
+    assert [line_no for line_no, _ in records] == [2, 3, 4, 5, 6]
+    assert records[0][1] == {'name': 'Acme', 'email': '', 'zip_code': '12345', 'notes': 'First'}
+
+def test_read_records_flags_bad_json_lines(tmp_path):
+    path = tmp_path / "invoices.jsonl.gz"
+    write_jsonl(path, [{'Client Name': 'Acme'}, '{"client":', '', '[1, 2]'])
+    
+    records = list(bulk_import.read_records(str(path)))
+    assert [line_no for line_no, _ in records] == [1, 2, 4]
+    assert records[0][1] == {'client': 'Acme'}
+    assert records[1][1]['_error'].startswith("Invalid JSON")
+    assert records[1][1]['_raw'] == '{"client":'
+    assert records[2][1]['_error'] == "Each line must be a JSON object"
+
+def test_read_records_rejects_unknown_extension(tmp_path):
+    path = tmp_path / "clients.txt"
+    path.write_text("name\nAcme\n", encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(bulk_import.read_records(str(path)))
+
+def test_client_import_writes_valid_rows_and_reports_the_rest(db, tmp_path):
+    path = tmp_path / "clients.csv"
+    path.write_text(CLIENTS_CSV, encoding='utf-8')
+    
+    result = bulk_import.import_file(db, 'clients', str(path), workers=1)
+    
+    assert (result.imported, result.rejected) == (2, 3)
+    assert result.report_path == str(tmp_path / "clients_errors.csv")
+    clients = {client.name: client for client in db.get_all_clients()}
+    assert sorted(clients) == ["Acme", "Initech"]
+    assert (clients["Acme"].zip_code, clients["Acme"].notes) == ("12345", "First")
+    
+    header, *rows = read_report(result.report_path)
+    assert header == bulk_import.ERROR_REPORT_HEADER
+    # Rows the database turns away are reported after the ones that failed validation
+    assert [row[0] for row in rows] == ['3', '4', '5']
+    assert rows[0][1] == "Client name is required"
+    assert rows[1][1] == ERROR_MESSAGES["invalid_email"]
+    assert rows[2][1] == ERROR_MESSAGES["duplicate_client"]
+    assert json.loads(rows[2][2])['notes'] == "Duplicate name"
+
+def test_clean_import_writes_no_report(db, tmp_path):
+    path = tmp_path / "clients.csv"
+    path.write_text("name\nAcme\n", encoding='utf-8')
+    
+    result = bulk_import.import_file(db, 'clients', str(path), workers=1)
+    
+    assert (result.imported, result.rejected, result.report_path) == (1, 0, None)
+    assert not (tmp_path / "clients_errors.csv").exists()
+
+def test_invoice_import_from_gzipped_jsonl(db, tmp_path):
+    acme = db.save_client(Client(name="Acme"))
+    path = tmp_path / "invoices.jsonl.gz"
+    write_jsonl(path, [
+        {'client': 'Acme', 'tax_rate': '10%', 'items': [
+            {'description': 'Design', 'quantity': 2, 'rate': 50},
+            {'description': 'Hosting', 'quantity': 1, 'rate': '$12.50'},
+        ]},
+        {'client_id': acme.id, 'invoice_number': 'IMP-1', 'description': 'Support', 'rate': 20,
+         'invoice_date': '2025-01-02', 'due_date': '2025-02-01', 'status': 'Sent'},
+        '{not json',
+        {'client': 'Nobody', 'description': 'Orphan', 'rate': 1},
+        {'client': 'Acme', 'invoice_number': 'IMP-1', 'description': 'Dup', 'rate': 1},
+        {'client': 'Acme', 'description': 'Bad date', 'rate': 1, 'invoice_date': 'yesterday'},
+    ])
+    report_path = tmp_path / "reports" / "errors.csv"
+    
+    result = bulk_import.import_file(db, 'invoices', str(path), str(report_path), workers=1)
+    
+    assert (result.imported, result.rejected) == (2, 4)
+    invoices = sorted(db.get_all_invoices(), key=lambda invoice: invoice.id)
+    assert [invoice.client_id for invoice in invoices] == [acme.id, acme.id]
+    
+    first = db.get_invoice(invoices[0].id)
+    assert [(item.description, item.rate_cents, item.total_cents) for item in first.items] == [
+        ("Design", 5000, 10000), ("Hosting", 1250, 1250)]
+    assert (first.subtotal_cents, first.tax_amount_cents, first.total_cents) == (11250, 1125, 12375)
+    assert first.invoice_number  # Numbered from the settings counter
+    
+    second = db.get_invoice(invoices[1].id)
+    assert (second.invoice_number, second.status, second.total_cents) == ("IMP-1", "Sent", 2000)
+    assert second.invoice_date.date().isoformat() == "2025-01-02"
+    
+    # Rows the database turns away are reported after the ones that failed validation
+    errors = {int(line): (message, record) for line, message, record in read_report(report_path)[1:]}
+    assert sorted(errors) == [3, 4, 5, 6]
+    assert errors[3][0].startswith("Invalid JSON") and errors[3][1] == '{not json'
+    assert errors[4][0] == "Valid client is required"
+    assert errors[5][0] == "Invoice number must be unique"
+    assert "invoice_date" in errors[6][0]
+
+def test_import_invoices_assigns_ids_after_deleted_ones(db):
+    client = db.save_client(Client(name="Acme"))
+    saved = [db.save_invoice(Invoice(client_id=client.id)) for _ in range(3)]
+    db.delete_invoice(saved[-1].id)  # AUTOINCREMENT never hands this id out again
+    
+    rows = [{'client_id': client.id, 'client': '', 'invoice_number': '', 'tax_rate': 0.0,
+             'subtotal_cents': 500, 'tax_amount_cents': 0, 'total_cents': 500,
+             'items': [("Work", 1.0, 500, 500)]} for _ in range(2)]
+    assert db.import_invoices(rows) == []
+    
+    imported_ids = [row['id'] for row in rows]
+    assert imported_ids == [saved[-1].id + 1, saved[-1].id + 2]
+    for invoice_id, row in zip(imported_ids, rows):
+        stored = db.get_invoice(invoice_id)
+        assert stored.invoice_number == row['invoice_number']
+        assert [item.description for item in stored.items] == ["Work"]
+    
+    later = db.save_invoice(Invoice(client_id=client.id, items=[InvoiceItem(description="Later", rate_cents=1)]))
+    assert later.id == imported_ids[-1] + 1
+
+def test_import_clients_skips_names_taken_in_the_batch(db):
+    db.save_client(Client(name="Acme"))
+    rows = [{'name': name} for name in ("Acme", "Globex", "Globex", "Initech")]
+    
+    rejected = db.import_clients(rows)
+    
+    assert [index for index, _ in rejected] == [0, 2]
+    assert sorted(client.name for client in db.get_all_clients()) == ["Acme", "Globex", "Initech"]
+
+def test_parallel_validation_keeps_input_order(db, tmp_path):
+    records = [(n, {'name': f"Client {n}" if n % 3 else ""}) for n in range(1, 13)]
+    
+    result = bulk_import.import_records(db, 'clients', records, str(tmp_path / "errors.csv"),
+                                        workers=2, chunk_size=2, batch_size=3)
+    
+    assert (result.imported, result.rejected) == (8, 4)
+    assert [row[0] for row in read_report(result.report_path)[1:]] == ['3', '6', '9', '12']
+
+def test_command_line_import(tmp_path, capsys):
+    db_path = tmp_path / "cli.db"
+    path = tmp_path / "clients.csv"
+    path.write_text(CLIENTS_CSV, encoding='utf-8')
+    report_path = tmp_path / "rejected.csv"
+    
+    status = bulk_import.main(['clients', str(path), '--db', str(db_path), '--report', str(report_path),
+                               '--workers', '1'])
+    
+    assert status == 1
+    output = capsys.readouterr().out
+    assert "Imported 2 clients, rejected 3" in output
+    assert str(report_path) in output
+    assert len(read_report(report_path)) == 4
+    
+    db = DatabaseManager(str(db_path))
+    try:
+        assert sorted(client.name for client in db.get_all_clients()) == ["Acme", "Initech"]
+    finally:
+        db.close()
+
+def test_command_line_import_without_rejects(tmp_path, capsys):
+    path = tmp_path / "clients.csv"
+    path.write_text("name\nAcme\n", encoding='utf-8')
+    
+    status = bulk_import.main(['clients', str(path), '--db', str(tmp_path / "cli.db"), '--workers', '1'])
+    
+    assert status == 0
+    assert "Rejected records" not in capsys.readouterr().out
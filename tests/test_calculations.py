@@ -0,0 +1,99 @@
+# File: test_calculations.py
+# Location: InvoiceGeneratorPro/tests/test_calculations.py
+
+import random
+
+import pytest
+
+from utils import calculations
+from utils.calculations import CalculationEngine
+
+def _random_invoices(count, seed=7):
+    """Column-wise items for count invoices (some empty) plus their per-invoice tax rates"""
+    rng = random.Random(seed)
+    quantities, rates_cents, offsets, tax_rates = [], [], [0], []
+    for _ in range(count):
+        for _ in range(rng.choice([0, 1, 3, 8])):
+            quantities.append(round(rng.uniform(-5, 50), rng.randint(0, 4)))
+            rates_cents.append(rng.randint(-10000, 500000))
+        offsets.append(len(quantities))
+        tax_rates.append(round(rng.uniform(0, 0.25), 4))
+    return quantities, rates_cents, offsets, tax_rates
+
+def _scalar_totals(quantities, rates_cents, offsets, tax_rates):
+    """The same figures from calculate_invoice_totals(), one invoice at a time"""
+    expected = {'line_totals_cents': [], 'subtotal_cents': [], 'tax_amount_cents': [], 'total_cents': []}
+    for n, tax_rate in enumerate(tax_rates):
+        items = [{'quantity': quantities[i], 'rate_cents': rates_cents[i]}
+                 for i in range(offsets[n], offsets[n + 1])]
+        totals = CalculationEngine.calculate_invoice_totals(items, tax_rate)
+        expected['line_totals_cents'].extend(totals['line_totals_cents'])
+        for key in ('subtotal_cents', 'tax_amount_cents', 'total_cents'):
+            expected[key].append(totals[key])
+    return expected
+
+@pytest.fixture
+def without_numpy(monkeypatch):
+    monkeypatch.setattr(calculations, '_numpy_module', False)
+
+def test_numpy_path_matches_scalar_totals(monkeypatch):
+    pytest.importorskip('numpy')
+    
+    def fail(*args):
+        raise AssertionError("fell back to the pure-Python path")
+    monkeypatch.setattr(CalculationEngine, '_batch_totals_python', staticmethod(fail))
+    
+    invoices = _random_invoices(500)
+    assert CalculationEngine.calculate_batch_totals(*invoices) == _scalar_totals(*invoices)
+
+def test_python_path_matches_scalar_totals():
+    invoices = _random_invoices(500)
+    assert CalculationEngine.calculate_batch_totals(*invoices, use_numpy=False) == _scalar_totals(*invoices)
+
+def test_python_fallback_without_numpy(without_numpy):
+    invoices = _random_invoices(50)
+    assert CalculationEngine.calculate_batch_totals(*invoices) == _scalar_totals(*invoices)
+    with pytest.raises(ImportError):
+        CalculationEngine.calculate_batch_totals(*invoices, use_numpy=True)
+
+@pytest.mark.parametrize("use_numpy", [None, False])
+def test_half_cents_round_half_up(use_numpy):
+    if use_numpy is None:
+        pytest.importorskip('numpy')
+    # 0.5 x 1 cent, -0.5 x 1 cent and a 12.5% tax on 1 cent land on half cents
+    totals = CalculationEngine.calculate_batch_totals([0.5, -0.5, 1], [1, 1, 1], [0, 1, 2, 3],
+                                                      [0.0, 0.0, 0.5], use_numpy=use_numpy)
+    assert totals['line_totals_cents'] == [1, -1, 1]
+    assert totals['tax_amount_cents'] == [0, 0, 1]
+
+def test_int64_overflow_falls_back_to_exact_integers():
+    np = pytest.importorskip('numpy')
+    # 2 * 10**4 quantity units times 10**15 cents is past int64 before the division
+    quantities, rates_cents, offsets, tax_rates = [2, 3], [10 ** 15, 10 ** 15], [0, 2], [0.2]
+    assert CalculationEngine._batch_totals_numpy(np, quantities, rates_cents, offsets, tax_rates) is None
+    
+    totals = CalculationEngine.calculate_batch_totals(quantities, rates_cents, offsets, tax_rates)
+    assert totals['subtotal_cents'] == [5 * 10 ** 15]
+    assert totals['total_cents'] == [6 * 10 ** 15]
+    assert totals == _scalar_totals(quantities, rates_cents, offsets, tax_rates)
+
+@pytest.mark.parametrize("use_numpy", [None, False])
+def test_invoices_without_items(use_numpy):
+    if use_numpy is None:
+        pytest.importorskip('numpy')
+    totals = CalculationEngine.calculate_batch_totals([2], [150], [0, 0, 1, 1], 0.1, use_numpy=use_numpy)
+    assert totals == {
+        'line_totals_cents': [300],
+        'subtotal_cents': [0, 300, 0],
+        'tax_amount_cents': [0, 30, 0],
+        'total_cents': [0, 330, 0]
+    }
+    assert CalculationEngine.calculate_batch_totals([], [], [0], use_numpy=use_numpy) == {
+        'line_totals_cents': [], 'subtotal_cents': [], 'tax_amount_cents': [], 'total_cents': []
+    }
+
+def test_misaligned_columns_are_rejected():
+    with pytest.raises(ValueError):
+        CalculationEngine.calculate_batch_totals([1, 2], [100], [0, 2])
+    with pytest.raises(ValueError):
+        CalculationEngine.calculate_batch_totals([1], [100], [0, 1], [0.1, 0.2])
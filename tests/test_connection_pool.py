@@ -0,0 +1,123 @@
+# File: test_connection_pool.py
+# Location: InvoiceGeneratorPro/tests/test_connection_pool.py
+
+import gc
+import sqlite3
+import threading
+import weakref
+
+import pytest
+
+from database.connection_pool import ConnectionPool
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    yield pool
+    pool.close_all()
+
+def in_thread(func):
+    """Run func on a new thread, wait for it and return its result"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+def test_connection_is_reused_within_a_thread(pool):
+    conn = pool.acquire()
+    
+    assert pool.acquire() is conn
+    assert in_thread(pool.acquire) is not conn
+    assert pool.size == 2
+
+def test_closed_connection_is_replaced(pool):
+    conn = pool.acquire()
+    conn.close()
+    
+    replacement = pool.acquire()
+    assert replacement is not conn
+    assert replacement.execute("SELECT 1").fetchone()[0] == 1
+    assert pool.size == 1
+
+def test_reuse_runs_no_query_until_an_error_is_reported(pool):
+    conn = pool.acquire()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    
+    for _ in range(3):
+        assert pool.acquire() is conn
+    assert statements == []
+    
+    pool.report_error()
+    assert pool.acquire() is conn
+    assert pool.acquire() is conn
+    assert statements == ["SELECT 1"]
+
+def test_database_errors_get_the_connection_checked(db):
+    with pytest.raises(sqlite3.OperationalError):
+        with db.get_connection() as conn:
+            conn.execute("SELECT * FROM no_such_table")
+    
+    statements = []
+    conn.set_trace_callback(statements.append)
+    with db.get_connection() as again:
+        assert again is conn
+    assert statements == ["SELECT 1"]
+
+def test_unused_pools_are_collected(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"))
+    conn = pool.acquire()
+    ref = weakref.ref(pool)
+    del pool
+    gc.collect()
+    
+    assert ref() is None
+    conn.close()
+
+def test_connections_of_exited_threads_are_pruned(pool):
+    pool.acquire()
+    finished = in_thread(pool.acquire)
+    assert pool.size == 2
+    
+    in_thread(pool.acquire)  # Opening a connection prunes the exited thread's one
+    assert pool.size == 2
+    with pytest.raises(sqlite3.ProgrammingError):
+        finished.execute("SELECT 1")
+
+def row_count(db):
+    """Clients visible to a connection outside the pool"""
+    conn = sqlite3.connect(db.db_path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM clients").fetchone()[0]
+    finally:
+        conn.close()
+
+def test_uncommitted_write_is_rolled_back_at_outermost_exit(db):
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO clients (name) VALUES ('Acme')")
+        with db.get_connection() as inner:
+            assert inner is conn
+        assert conn.in_transaction  # The nested block leaves the transaction open
+    
+    assert not conn.in_transaction
+    assert row_count(db) == 0
+    with db.get_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM clients").fetchone()[0] == 0
+
+def test_nested_blocks_commit_with_the_outer_block(db):
+    with db.get_connection() as conn:
+        with db.get_connection() as inner:
+            inner.execute("INSERT INTO clients (name) VALUES ('Acme')")
+        conn.commit()
+    
+    assert row_count(db) == 1
+
+def test_error_rolls_back_the_transaction(db):
+    with pytest.raises(RuntimeError):
+        with db.get_connection() as conn:
+            conn.execute("INSERT INTO clients (name) VALUES ('Acme')")
+            raise RuntimeError("boom")
+    
+    assert not conn.in_transaction
+    assert row_count(db) == 0
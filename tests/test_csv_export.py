@@ -0,0 +1,97 @@
+# File: test_csv_export.py
+# Location: InvoiceGeneratorPro/tests/test_csv_export.py
+
+import csv
+import gzip
+import os
+from datetime import datetime
+
+import pytest
+
+from database.export import CLIENT_CSV_HEADER, INVOICE_CSV_HEADER, export_csv, write_csv
+from database.models import Client, Invoice, InvoiceItem
+
+@pytest.fixture
+def exported_db(db):
+    acme = db.save_client(Client(name="Acme", email="billing@acme.test", phone="555-0100",
+                                 address="1 Main St", city="Springfield", state="IL",
+                                 zip_code="62701", country="USA"))
+    initech = db.save_client(Client(name="Initech, Inc.", address='Suite "B"\nFloor 2'))
+    db.save_invoice(Invoice(client_id=acme.id, invoice_date=datetime(2025, 1, 2), due_date=datetime(2025, 2, 1),
+                            tax_rate=0.1, items=[InvoiceItem(description="Design", quantity=2, rate_cents=5005)]))
+    db.save_invoice(Invoice(client_id=initech.id, invoice_number="CUSTOM-1", status="Paid",
+                            items=[InvoiceItem(description="Hosting", rate_cents=1250)]))
+    db.save_invoice(Invoice(client_id=acme.id))
+    return db
+
+def _read_csv(path):
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+def _model_rows(db):
+    """Rows as the GUI's export built them from model objects before streaming"""
+    invoices = [[
+        invoice.formatted_invoice_number,
+        invoice.client.name if invoice.client else "Unknown",
+        invoice.invoice_date.strftime('%Y-%m-%d') if invoice.invoice_date else "",
+        invoice.due_date.strftime('%Y-%m-%d') if invoice.due_date else "",
+        f"{invoice.total:.2f}",
+        invoice.status,
+    ] for invoice in db.get_all_invoices()]
+    clients = [[
+        client.name, client.email or "", client.phone or "", client.address or "",
+        client.city or "", client.state or "", client.zip_code or "", client.country or "",
+    ] for client in db.get_all_clients()]
+    return invoices, clients
+
+@pytest.mark.parametrize("batch_size", [1, 2, 3, 1000])
+def test_export_matches_model_rows(exported_db, tmp_path, batch_size):
+    invoice_file, client_file = export_csv(exported_db, str(tmp_path), batch_size=batch_size)
+    invoices, clients = _model_rows(exported_db)
+    
+    assert _read_csv(invoice_file) == [INVOICE_CSV_HEADER] + invoices
+    assert _read_csv(client_file) == [CLIENT_CSV_HEADER] + clients
+    assert [row[:2] for row in invoices][1:] == [["CUSTOM-1", "Initech, Inc."], ["INV-0001", "Acme"]]
+    assert invoices[2][4] == "110.11"
+
+def test_export_empty_database_writes_headers(db, tmp_path):
+    invoice_file, client_file = export_csv(db, str(tmp_path / "new"))
+    assert _read_csv(invoice_file) == [INVOICE_CSV_HEADER]
+    assert _read_csv(client_file) == [CLIENT_CSV_HEADER]
+
+def test_iter_export_rows_cross_batches(exported_db):
+    for batch_size in (1, 2, 3, 4):
+        assert len(list(exported_db.iter_invoice_export_rows(batch_size))) == 3
+        assert [row[0] for row in exported_db.iter_client_export_rows(batch_size)] == ["Acme", "Initech, Inc."]
+    assert next(exported_db.iter_invoice_export_rows(1))[4] == 0  # Amounts stay in cents
+
+@pytest.mark.parametrize("count, batch_size", [(0, 2), (1, 1), (6, 3), (6, 1), (7, 3)])
+def test_write_csv_batches(tmp_path, count, batch_size):
+    path = str(tmp_path / "rows.csv")
+    rows = ((n, f"row {n}") for n in range(count))
+    calls = []
+    
+    written = write_csv(path, ['n', 'label'], rows, batch_size=batch_size, label='rows', total=count,
+                        progress=lambda *args: calls.append(args))
+    
+    assert written == count
+    assert _read_csv(path) == [['n', 'label']] + [[str(n), f"row {n}"] for n in range(count)]
+    # One call per batch, the last one reporting every row
+    expected = [min(end, count) for end in range(batch_size, count + batch_size, batch_size)] if count else []
+    assert calls == [('rows', done, count) for done in expected]
+
+def test_gzip_export_round_trips(exported_db, tmp_path):
+    plain = export_csv(exported_db, str(tmp_path / "plain"))
+    compressed = export_csv(exported_db, str(tmp_path / "gz"), compress=True, batch_size=2)
+    
+    assert [os.path.basename(path) for path in compressed] == \
+        [os.path.basename(path) + '.gz' for path in plain]
+    for plain_path, compressed_path in zip(plain, compressed):
+        with open(plain_path, 'rb') as f, gzip.open(compressed_path, 'rb') as g:
+            assert g.read() == f.read()
+
+def test_export_reports_progress_against_totals(exported_db, tmp_path):
+    calls = []
+    export_csv(exported_db, str(tmp_path), batch_size=2, progress=lambda *args: calls.append(args))
+    assert calls == [('invoices', 2, 3), ('invoices', 3, 3), ('clients', 2, 2)]
@@ -0,0 +1,72 @@
+# File: test_dashboard.py
+# Location: InvoiceGeneratorPro/tests/test_dashboard.py
+
+from datetime import datetime, timedelta
+
+from database.models import Client, Invoice, InvoiceItem
+from utils.calculations import from_cents
+
+def recomputed_stats(db) -> dict:
+    """Dashboard stats computed straight from the invoices and clients tables"""
+    with db.get_connection() as conn:
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM invoices GROUP BY status").fetchall())
+        cents = dict(conn.execute("SELECT status, SUM(total_cents) FROM invoices GROUP BY status").fetchall())
+        clients = conn.execute("SELECT COUNT(*) FROM clients").fetchone()[0]
+        overdue = conn.execute(
+            "SELECT COUNT(*) FROM invoices WHERE status = 'Sent' AND due_date < ?",
+            (datetime.now().date().isoformat(),)
+        ).fetchone()[0]
+    
+    return {
+        'total_clients': clients,
+        'total_invoices': sum(counts.values()),
+        'draft_invoices': counts.get('Draft', 0),
+        'sent_invoices': counts.get('Sent', 0),
+        'paid_invoices': counts.get('Paid', 0),
+        'overdue_invoices': overdue,
+        'total_revenue': from_cents(cents.get('Paid', 0)),
+        'pending_revenue': from_cents(cents.get('Sent', 0) + cents.get('Draft', 0)),
+    }
+
+def test_dashboard_stats_follow_invoice_changes(db):
+    def check():
+        assert db.get_dashboard_stats() == recomputed_stats(db)
+    
+    check()
+    acme = db.save_client(Client(name="Acme"))
+    globex = db.save_client(Client(name="Globex"))
+    spare = db.save_client(Client(name="Initech"))
+    check()
+    
+    invoices = [
+        db.save_invoice(Invoice(client_id=client.id, tax_rate=0.1, items=[
+            InvoiceItem(description="Work", quantity=quantity, rate_cents=2500)
+        ]))
+        for client, quantity in ((acme, 1), (acme, 2), (globex, 3), (globex, 4))
+    ]
+    check()
+    
+    db.update_invoice_status(invoices[0].id, "Sent")
+    db.update_invoice_status(invoices[1].id, "Paid")
+    db.update_invoice_status(invoices[2].id, "Sent")
+    check()
+    
+    edited = db.get_invoice(invoices[2].id)
+    edited.items[0].quantity = 10
+    edited.due_date = datetime.now() - timedelta(days=5)
+    db.save_invoice(edited)
+    check()
+    
+    paid = db.get_invoice(invoices[1].id)
+    paid.add_item(InvoiceItem(description="Extra", quantity=1, rate_cents=999))
+    paid.status = "Draft"
+    db.save_invoice(paid)
+    check()
+    
+    assert db.delete_invoice(invoices[0].id)
+    assert db.delete_invoice(invoices[3].id)
+    check()
+    
+    assert db.delete_client(spare.id)
+    check()
+    assert db.get_dashboard_stats()['overdue_invoices'] == 1
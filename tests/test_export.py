@@ -0,0 +1,170 @@
+# File: test_export.py
+# Location: InvoiceGeneratorPro/tests/test_export.py
+
+import glob
+import os
+import threading
+
+import pytest
+
+from database import export
+from database.db_manager import DatabaseManager
+from database.export import ANALYTICS_STATE_FILE, export_analytics, write_columnar
+from database.models import Client, Invoice, InvoiceItem
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+def _rows_by_run(export_dir, table):
+    """{run: rows} for every partition of table"""
+    runs = {}
+    for path in glob.glob(os.path.join(export_dir, table, 'run=*', '*.parquet')):
+        run = os.path.basename(os.path.dirname(path))
+        runs[run] = pq.read_table(path).to_pylist()
+    return runs
+
+def _current_state(export_dir):
+    """Replay the partitions the way the export_analytics() docstring tells readers to"""
+    invoices, items, clients = {}, {}, {}
+    line_items = _rows_by_run(export_dir, 'line_items')
+    for run, rows in sorted(_rows_by_run(export_dir, 'invoices').items()):
+        run_items = line_items.get(run, [])
+        for invoice in rows:
+            invoices[invoice['id']] = invoice
+            items[invoice['id']] = [item['description'] for item in run_items
+                                    if item['invoice_id'] == invoice['id']]
+    for run, rows in sorted(_rows_by_run(export_dir, 'clients').items()):
+        clients.update((client['id'], client) for client in rows)
+    for run, rows in sorted(_rows_by_run(export_dir, 'deletions').items()):
+        for deletion in rows:
+            removed_from = invoices if deletion['table_name'] == 'invoices' else clients
+            removed_from.pop(deletion['row_id'], None)
+            if deletion['table_name'] == 'invoices':
+                items.pop(deletion['row_id'], None)
+    return ({invoice_id: invoice['status'] for invoice_id, invoice in invoices.items()},
+            items, {client_id: client['name'] for client_id, client in clients.items()})
+
+def _stored_state(db):
+    invoices = {invoice.id: invoice for invoice in db.load_invoice_items(db.get_all_invoices())}
+    return ({invoice_id: invoice.status for invoice_id, invoice in invoices.items()},
+            {invoice_id: [item.description for item in invoice.items] for invoice_id, invoice in invoices.items()},
+            {client.id: client.name for client in db.get_all_clients()})
+
+def test_incremental_export_replays_to_current_state(db, tmp_path):
+    export_dir = str(tmp_path / "analytics")
+    acme = db.save_client(Client(name="Acme"))
+    spare = db.save_client(Client(name="Spare"))
+    invoices = [db.save_invoice(Invoice(client_id=acme.id, items=[
+        InvoiceItem(description=f"Invoice {n} item {i}", rate_cents=1000) for i in range(3)
+    ])) for n in range(4)]
+    export_analytics(db, export_dir, incremental=False)
+    
+    # Remove one item, remove all items, delete an invoice and a client, add and rename clients
+    edited = db.get_invoice(invoices[0].id)
+    edited.remove_item(1)
+    db.save_invoice(edited)
+    emptied = db.get_invoice(invoices[1].id)
+    emptied.items = []
+    db.save_invoice(emptied)
+    db.delete_invoice(invoices[2].id)
+    db.delete_client(spare.id)
+    db.save_client(Client(name="Newco"))
+    renamed = db.get_client(acme.id)
+    renamed.name = "Acme Ltd"
+    db.save_client(renamed)
+    
+    files = export_analytics(db, export_dir)
+    assert files['deletions'] is not None
+    assert _current_state(export_dir) == _stored_state(db)
+    
+    # Nothing new: no partitions, and the state still replays
+    assert all(path is None for path in export_analytics(db, export_dir).values())
+    assert _current_state(export_dir) == _stored_state(db)
+
+def test_full_export_skips_earlier_deletions(db, tmp_path):
+    export_dir = str(tmp_path / "analytics")
+    client = db.save_client(Client(name="Acme"))
+    invoice = db.save_invoice(Invoice(client_id=client.id))
+    db.delete_invoice(invoice.id)
+    
+    files = export_analytics(db, export_dir, incremental=False)
+    assert 'deletions' not in files
+    assert export_analytics(db, export_dir)['deletions'] is None
+
+def test_failed_full_export_keeps_earlier_partitions(db, tmp_path, monkeypatch):
+    export_dir = str(tmp_path / "analytics")
+    client = db.save_client(Client(name="Acme"))
+    db.save_invoice(Invoice(client_id=client.id, items=[InvoiceItem(description="Design", rate_cents=1000)]))
+    first = export_analytics(db, export_dir, incremental=False)
+    with open(os.path.join(export_dir, ANALYTICS_STATE_FILE), encoding='utf-8') as f:
+        state = f.read()
+    
+    def write_until_clients(path, columns, batches, label='', **kwargs):
+        if label == 'clients':
+            raise OSError("No space left on device")
+        return write_columnar(path, columns, batches, label=label, **kwargs)
+    monkeypatch.setattr(export, 'write_columnar', write_until_clients)
+    with pytest.raises(OSError):
+        export_analytics(db, export_dir, incremental=False)
+    
+    assert all(os.path.exists(path) for path in first.values())
+    assert sorted(glob.glob(os.path.join(export_dir, '*', 'run=*'))) == \
+        sorted(os.path.dirname(path) for path in first.values())
+    with open(os.path.join(export_dir, ANALYTICS_STATE_FILE), encoding='utf-8') as f:
+        assert f.read() == state
+    
+    monkeypatch.undo()
+    second = export_analytics(db, export_dir, incremental=False)
+    assert sorted(glob.glob(os.path.join(export_dir, '*', 'run=*'))) == \
+        sorted(os.path.dirname(path) for path in second.values())
+    assert os.listdir(export_dir).count(ANALYTICS_STATE_FILE + '.tmp') == 0
+
+@pytest.mark.parametrize("tuning", [False, True], ids=["rollback-journal", "wal"])
+def test_saves_go_through_while_an_export_runs(tmp_path, tuning):
+    db = DatabaseManager(str(tmp_path / "invoices.db"), tuning=tuning)
+    export_dir = str(tmp_path / "analytics")
+    client = db.save_client(Client(name="Acme"))
+    first = db.save_invoice(Invoice(client_id=client.id))
+    saved, errors = [], []
+    
+    def save_from_gui_thread(label, written, total):
+        if label != 'invoices' or saved:
+            return
+        def save():
+            try:
+                saved.append(db.save_invoice(Invoice(client_id=client.id)))
+            except Exception as e:
+                errors.append(e)
+        thread = threading.Thread(target=save)
+        thread.start()
+        thread.join()
+    
+    files = export_analytics(db, export_dir, incremental=False, progress=save_from_gui_thread)
+    assert errors == []
+    
+    # The export shows the database as it was when it started; the next run picks up the save
+    assert [row['id'] for row in pq.read_table(files['invoices']).to_pylist()] == [first.id]
+    files = export_analytics(db, export_dir, progress=save_from_gui_thread)
+    assert [row['id'] for row in pq.read_table(files['invoices']).to_pylist()] == [saved[0].id]
+    assert _current_state(export_dir) == _stored_state(db)
+    db.close()
+
+def test_incremental_export_reads_only_changes_without_copying(db, tmp_path, monkeypatch):
+    export_dir = str(tmp_path / "analytics")
+    client = db.save_client(Client(name="Acme"))
+    db.save_invoice(Invoice(client_id=client.id))
+    export_analytics(db, export_dir, incremental=False)
+    changed = db.save_invoice(Invoice(client_id=client.id))
+    
+    def no_copy(db_manager):
+        raise AssertionError("incremental run copied the database")
+    monkeypatch.setattr(export, '_read_snapshot', no_copy)
+    saved = []
+    
+    def save_while_writing(label, written, total):
+        if not saved:
+            saved.append(db.save_invoice(Invoice(client_id=client.id)))
+    
+    files = export_analytics(db, export_dir, progress=save_while_writing)
+    assert [row['id'] for row in pq.read_table(files['invoices']).to_pylist()] == [changed.id]
+    assert [row['id'] for row in pq.read_table(export_analytics(db, export_dir)['invoices']).to_pylist()] == \
+        [saved[0].id]
@@ -0,0 +1,36 @@
+# File: test_invoice_numbers.py
+# Location: InvoiceGeneratorPro/tests/test_invoice_numbers.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+from database.models import Client, Invoice
+
+def test_saving_stale_settings_keeps_the_counter(db):
+    stale = db.get_app_settings()
+    client = db.save_client(Client(name="Acme"))
+    saved = db.save_invoice(Invoice(client_id=client.id))
+    first = db.allocate_invoice_numbers(3)  # Reserved, not yet used by any invoice
+    
+    stale.company_name = "Renamed"
+    db.save_app_settings(stale)
+    second = db.allocate_invoice_numbers(3)
+    
+    assert db.get_app_settings().company_name == "Renamed"
+    numbers = first + [saved.invoice_number] + second
+    assert len(set(numbers)) == len(numbers)
+
+def test_parallel_savers_and_allocators_get_distinct_numbers(db):
+    client = db.save_client(Client(name="Acme"))
+    
+    def save_invoices():
+        return [db.save_invoice(Invoice(client_id=client.id)).invoice_number for _ in range(25)]
+    
+    def allocate_blocks():
+        return [number for _ in range(10) for number in db.allocate_invoice_numbers(5)]
+    
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        futures = [pool.submit(task) for task in (save_invoices, allocate_blocks) * 3]
+        numbers = [number for future in futures for number in future.result()]
+    
+    assert len(numbers) == 3 * 25 + 3 * 50
+    assert len(set(numbers)) == len(numbers)
@@ -0,0 +1,29 @@
+# File: test_invoice_pages.py
+# Location: InvoiceGeneratorPro/tests/test_invoice_pages.py
+
+import pytest
+
+from database.models import Client, Invoice
+
+def _all_pages(db, limit, count):
+    ids, after = [], None
+    while True:
+        invoices, after = db.get_invoices_page(after=after, limit=limit)
+        ids.extend(invoice.id for invoice in invoices)
+        assert len(ids) <= count, "pages repeat invoices"
+        if after is None:
+            return ids
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_pages_cover_every_invoice_once(db, limit):
+    client = db.save_client(Client(name="Acme"))
+    ids = [db.save_invoice(Invoice(client_id=client.id)).id for _ in range(6)]
+    # Dates as older versions or imports may have stored them: date-only, and missing
+    stored_dates = ['2025-03-01', '2025-03-01', '2025-02-01T10:00:00', None, None, '2025-03-01T00:00:00']
+    with db.get_connection() as conn:
+        conn.executemany("UPDATE invoices SET created_date = ? WHERE id = ?", zip(stored_dates, ids))
+        conn.commit()
+    
+    paged = _all_pages(db, limit, len(ids))
+    assert sorted(paged) == sorted(ids)
+    assert paged == [invoice.id for invoice in db.get_invoices_page(limit=len(ids))[0]]
@@ -0,0 +1,41 @@
+# File: test_invoice_queries.py
+# Location: InvoiceGeneratorPro/tests/test_invoice_queries.py
+
+from database.models import Client, Invoice, InvoiceItem
+
+def _create_invoices(db):
+    acme = db.save_client(Client(name="Acme", email="billing@acme.test", city="Springfield"))
+    globex = db.save_client(Client(name="Globex"))
+    for client, status in ((acme, "Draft"), (acme, "Paid"), (globex, "Paid")):
+        db.save_invoice(Invoice(client_id=client.id, status=status, items=[
+            InvoiceItem(description="Design", quantity=1, rate_cents=1000)
+        ]))
+    return acme, globex
+
+def test_list_queries_fill_clients_from_the_join(db):
+    acme, globex = _create_invoices(db)
+    
+    invoices = db.get_all_invoices()
+    with db.get_connection() as conn:
+        stored_ids = [row[0] for row in conn.execute("SELECT id FROM invoices ORDER BY created_date DESC")]
+    assert [invoice.id for invoice in invoices] == stored_ids
+    for invoice in invoices:
+        assert invoice.client == db.get_client(invoice.client_id)
+        assert invoice.client.to_dict() == (acme if invoice.client_id == acme.id else globex).to_dict()
+    
+    # Invoices of the same client share one Client
+    acme_invoices = [invoice for invoice in invoices if invoice.client_id == acme.id]
+    assert acme_invoices[0].client is acme_invoices[1].client
+
+def test_list_queries_return_the_stored_invoices(db):
+    acme, _ = _create_invoices(db)
+    
+    for invoices in (db.get_all_invoices(), db.get_invoices_by_status("Paid"), db.get_invoices_by_client(acme.id)):
+        for invoice in db.load_invoice_items(invoices):
+            stored = db.get_invoice(invoice.id)
+            assert invoice == stored
+            assert invoice.client == stored.client
+    
+    assert {invoice.status for invoice in db.get_invoices_by_status("Paid")} == {"Paid"}
+    assert {invoice.client_id for invoice in db.get_invoices_by_client(acme.id)} == {acme.id}
+    assert db.get_invoice_by_number(db.get_all_invoices()[0].invoice_number).client is not None
@@ -0,0 +1,70 @@
+# File: test_invoice_saves.py
+# Location: InvoiceGeneratorPro/tests/test_invoice_saves.py
+
+import pytest
+
+from database.models import InvoiceItem
+from .conftest import listed_invoice
+
+def _stored(db, query, params):
+    with db.get_connection() as conn:
+        return conn.execute(query, params).fetchone()
+
+def test_saving_listed_invoice_keeps_items_and_totals(db, invoice):
+    listed = listed_invoice(db, invoice.id)
+    assert not listed.items_loaded
+    listed.status = "Paid"
+    db.save_invoice(listed)
+    
+    stored = db.get_invoice(invoice.id)
+    assert stored.status == "Paid"
+    assert [item.description for item in stored.items] == ["Design", "Hosting"]
+    assert stored.subtotal_cents == 11250
+    assert stored.total_cents == invoice.total_cents
+
+def test_add_item_on_listed_invoice_raises(db, invoice):
+    listed = listed_invoice(db, invoice.id)
+    with pytest.raises(ValueError):
+        listed.add_item(InvoiceItem(description="Extra", rate_cents=100))
+    with pytest.raises(ValueError):
+        listed.remove_item(0)
+    
+    # Nothing was dropped by the failed edits
+    db.save_invoice(listed)
+    assert len(db.get_invoice(invoice.id).items) == 2
+
+def test_saving_listed_invoice_with_replaced_items_raises(db, invoice):
+    listed = listed_invoice(db, invoice.id)
+    listed.items = [InvoiceItem(description="Only", rate_cents=100)]
+    with pytest.raises(ValueError):
+        db.save_invoice(listed)
+    assert len(db.get_invoice(invoice.id).items) == 2
+
+def test_add_item_after_loading_items(db, invoice):
+    listed = db.load_invoice_items([listed_invoice(db, invoice.id)])[0]
+    listed.add_item(InvoiceItem(description="Extra", quantity=1, rate_cents=100))
+    db.save_invoice(listed)
+    
+    stored = db.get_invoice(invoice.id)
+    assert [item.description for item in stored.items] == ["Design", "Hosting", "Extra"]
+    assert stored.subtotal_cents == 11350
+
+@pytest.mark.parametrize("load", ["listed", "full"])
+def test_non_canonical_stored_dates_are_not_rewritten(db, invoice, load):
+    with db.get_connection() as conn:
+        conn.execute("UPDATE invoices SET invoice_date = '2025-01-02', created_date = '2025-01-02 09:30:00' "
+                     "WHERE id = ?", (invoice.id,))
+        conn.execute("UPDATE clients SET created_date = '2025-01-02' WHERE id = ?", (invoice.client_id,))
+        conn.commit()
+    before = _stored(db, "SELECT invoice_date, created_date, updated_date FROM invoices WHERE id = ?",
+                     (invoice.id,))
+    
+    loaded = listed_invoice(db, invoice.id) if load == "listed" else db.get_invoice(invoice.id)
+    assert loaded.changes() == {}
+    assert loaded.client.changes() == {}
+    db.save_invoice(loaded)
+    db.save_client(loaded.client)
+    
+    assert tuple(_stored(db, "SELECT invoice_date, created_date, updated_date FROM invoices WHERE id = ?",
+                         (invoice.id,))) == tuple(before)
+    assert _stored(db, "SELECT created_date FROM clients WHERE id = ?", (invoice.client_id,))[0] == "2025-01-02"
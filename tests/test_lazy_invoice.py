@@ -0,0 +1,35 @@
+# File: test_lazy_invoice.py
+# Location: InvoiceGeneratorPro/tests/test_lazy_invoice.py
+
+import copy
+import pickle
+
+from database.models import Invoice, LazyInvoice
+from .conftest import listed_invoice
+
+def test_lazy_invoice_equals_invoice_with_same_fields(db, invoice):
+    listed = db.load_invoice_items([listed_invoice(db, invoice.id)])[0]
+    assert isinstance(listed, LazyInvoice)
+    
+    assert listed == db.get_invoice(invoice.id)
+    assert db.get_invoice(invoice.id) == listed
+    built = Invoice.from_dict(listed.to_dict())
+    built.items = listed.items
+    built.client = listed.client
+    assert listed == built and built == listed
+    
+    built.notes = "Changed"
+    assert listed != built and built != listed
+    assert listed != "not an invoice"
+
+def test_lazy_invoice_copy_and_pickle(db, invoice):
+    listed = listed_invoice(db, invoice.id)
+    for duplicate in (copy.copy(listed), copy.deepcopy(listed), pickle.loads(pickle.dumps(listed))):
+        assert type(duplicate) is LazyInvoice
+        assert duplicate == listed
+        assert duplicate.created_date == listed.created_date
+        assert not duplicate.items_loaded
+    
+    duplicate = copy.deepcopy(listed)
+    duplicate.notes = "Changed"
+    assert listed.notes == "Thanks"
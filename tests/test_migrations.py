@@ -0,0 +1,78 @@
+# File: test_migrations.py
+# Location: InvoiceGeneratorPro/tests/test_migrations.py
+
+import json
+import sqlite3
+
+from database import migrations
+
+def test_json_items_move_to_rows(tmp_path, monkeypatch):
+    conn = sqlite3.connect(str(tmp_path / "legacy.db"))
+    
+    # A database from before line items had their own table
+    with monkeypatch.context() as patch:
+        patch.setattr(migrations, 'MIGRATIONS', migrations.MIGRATIONS[:3])
+        patch.setattr(migrations, 'SCHEMA_VERSION', 3)
+        migrations.migrate(conn)
+    conn.execute("INSERT INTO clients (name) VALUES ('Acme')")
+    conn.execute("INSERT INTO invoices (invoice_number, client_id, items) VALUES ('INV-0001', 1, ?)", (json.dumps([
+        {'description': 'Design', 'quantity': 3, 'rate': 1.005},
+        {'description': 'Hosting', 'quantity': 0.5, 'rate': 2.675},
+        {'quantity': 1.5, 'rate_cents': 999},
+    ]),))
+    conn.commit()
+    
+    migrations.migrate(conn)
+    
+    assert migrations.schema_version(conn) == migrations.SCHEMA_VERSION
+    rows = conn.execute("""
+        SELECT position, description, quantity, rate_cents, amount_cents
+        FROM invoice_items ORDER BY position
+    """).fetchall()
+    assert rows == [
+        (0, 'Design', 3.0, 101, 303),  # Legacy rates round half-up to the cent
+        (1, 'Hosting', 0.5, 268, 134),
+        (2, '', 1.5, 999, 1499),  # Amounts round half-up too
+    ]
+    assert conn.execute("SELECT items FROM invoices").fetchone() == (None,)
+    conn.close()
+
+def test_legacy_totals_are_recomputed_from_converted_items(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "legacy.db"))
+    
+    # Tables as the app created them before versioning, with REAL money and JSON items
+    conn.execute("""
+        CREATE TABLE clients (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE, email TEXT, phone TEXT,
+            address TEXT, city TEXT, state TEXT, zip_code TEXT, country TEXT, created_date TEXT, notes TEXT
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE invoices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, invoice_number TEXT UNIQUE NOT NULL,
+            client_id INTEGER NOT NULL, invoice_date TEXT, due_date TEXT, status TEXT DEFAULT 'Draft',
+            items TEXT, subtotal REAL DEFAULT 0.0, tax_rate REAL DEFAULT 0.0, tax_amount REAL DEFAULT 0.0,
+            total REAL DEFAULT 0.0, notes TEXT, payment_terms TEXT DEFAULT 'Net 30', currency TEXT DEFAULT 'USD',
+            created_date TEXT, updated_date TEXT, company_name TEXT, company_address TEXT, company_phone TEXT,
+            company_email TEXT, company_website TEXT, FOREIGN KEY (client_id) REFERENCES clients (id)
+        )
+    """)
+    conn.execute("INSERT INTO clients (name) VALUES ('Acme')")
+    # The old float totals: 100.005 + 59.965 = 159.97, and 10% tax on that
+    conn.execute("""
+        INSERT INTO invoices (invoice_number, client_id, items, subtotal, tax_rate, tax_amount, total)
+        VALUES ('INV-0001', 1, ?, 159.97, 0.1, 16.0, 175.97)
+    """, (json.dumps([
+        {'description': 'Design', 'quantity': 1, 'rate': 100.005},
+        {'description': 'Hosting', 'quantity': 1, 'rate': 59.965},
+    ]),))
+    conn.execute("INSERT INTO invoices (invoice_number, client_id, subtotal, total) VALUES ('INV-0002', 1, 5.0, 5.0)")
+    conn.commit()
+    
+    migrations.migrate(conn)
+    
+    assert conn.execute("SELECT rate_cents FROM invoice_items ORDER BY position").fetchall() == [(10001,), (5997,)]
+    assert conn.execute("""
+        SELECT subtotal_cents, tax_amount_cents, total_cents FROM invoices ORDER BY id
+    """).fetchall() == [(15998, 1600, 17598), (500, 0, 500)]  # Invoices without items keep their totals
+    conn.close()
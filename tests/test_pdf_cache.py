@@ -0,0 +1,159 @@
+# File: test_pdf_cache.py
+# Location: InvoiceGeneratorPro/tests/test_pdf_cache.py
+
+import os
+from datetime import datetime
+
+import pytest
+
+from database.models import Client, Invoice, InvoiceItem
+from pdf_generator.cache import PDFCache, pdf_cache_key
+
+def _invoice(**changes):
+    invoice = Invoice(
+        id=7, invoice_number="INV-0007", client_id=3, tax_rate=0.1,
+        invoice_date=datetime(2025, 1, 2), due_date=datetime(2025, 2, 1),
+        client=Client(id=3, name="Acme", email="billing@acme.test", notes="Internal"),
+        items=[InvoiceItem(id=1, description="Design", quantity=2, rate_cents=5000)],
+    )
+    for name, value in changes.items():
+        setattr(invoice, name, value)
+    return invoice
+
+def _key(invoice, template='default', version='1'):
+    return pdf_cache_key(invoice, template, version)
+
+def _set_last_used(cache, key, timestamp):
+    os.utime(os.path.join(cache.cache_dir, f"{key}.pdf"), (timestamp, timestamp))
+
+def test_same_invoice_gives_same_key():
+    first, second = _invoice(), _invoice()
+    # Bookkeeping fields do not show on the PDF
+    second.id = 8
+    second.created_date = datetime(2020, 1, 1)
+    second.updated_date = datetime(2020, 1, 1)
+    second.client.notes = "Changed"
+    second.items[0].id = 99
+    assert _key(first) == _key(second)
+
+@pytest.mark.parametrize("change", [
+    lambda invoice: setattr(invoice, 'invoice_number', "INV-0008"),
+    lambda invoice: setattr(invoice, 'status', "Paid"),
+    lambda invoice: setattr(invoice, 'notes', "Thanks"),
+    lambda invoice: setattr(invoice, 'due_date', datetime(2025, 3, 1)),
+    lambda invoice: setattr(invoice, 'company_name', "Initech"),
+    lambda invoice: setattr(invoice.client, 'email', "ap@acme.test"),
+    lambda invoice: setattr(invoice, 'client', None),
+    lambda invoice: setattr(invoice.items[0], 'description', "Hosting"),
+    lambda invoice: invoice.add_item(InvoiceItem(description="Hosting", rate_cents=1250)),
+])
+def test_visible_field_change_changes_key(change):
+    invoice = _invoice()
+    change(invoice)
+    assert _key(invoice) != _key(_invoice())
+
+def test_template_and_version_change_key():
+    invoice = _invoice()
+    assert len({_key(invoice), _key(invoice, template='modern'), _key(invoice, version='2')}) == 3
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = PDFCache(str(tmp_path), max_bytes=1000)
+    assert cache.get('a') is None
+    cache.put('a', b'%PDF-a')
+    assert cache.get('a') == b'%PDF-a'
+    assert cache.fetch('a', lambda: pytest.fail("rendered a cached PDF")) == b'%PDF-a'
+    assert cache.fetch('b', lambda: b'%PDF-b') == b'%PDF-b'
+    assert cache.total_bytes == 12
+
+def test_evicts_least_recently_used_beyond_max_bytes(tmp_path):
+    cache = PDFCache(str(tmp_path), max_bytes=30)
+    for key in 'abc':
+        cache.put(key, key.encode() * 10)
+    _set_last_used(cache, 'a', 1000)
+    _set_last_used(cache, 'b', 2000)
+    _set_last_used(cache, 'c', 3000)
+    
+    # Using a makes b the least recently used
+    assert cache.get('a') == b'a' * 10
+    cache.put('d', b'd' * 10)
+    
+    assert cache.get('b') is None
+    assert [cache.get(key) is not None for key in 'acd'] == [True, True, True]
+    assert cache.total_bytes == 30
+
+def test_puts_under_the_limit_scan_the_directory_once(tmp_path, monkeypatch):
+    cache = PDFCache(str(tmp_path), max_bytes=1000)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path: scans.append(path) or scandir(path))
+    for n in range(20):
+        cache.put(f"key{n}", b'x' * 10)
+    assert len(scans) == 1
+    assert cache.total_bytes == 200
+
+def test_lru_order_survives_restart(tmp_path):
+    cache = PDFCache(str(tmp_path), max_bytes=30)
+    for key, last_used in (('a', 3000), ('b', 1000), ('c', 2000)):
+        cache.put(key, key.encode() * 10)
+        _set_last_used(cache, key, last_used)
+    
+    restarted = PDFCache(str(tmp_path), max_bytes=30)
+    assert restarted.total_bytes == 30
+    restarted.put('d', b'd' * 10)
+    assert sorted(name[:-4] for name in os.listdir(tmp_path)) == ['a', 'c', 'd']
+
+def test_eviction_counts_pdfs_from_other_processes(tmp_path):
+    # Two caches on one directory stand in for two batch workers
+    first = PDFCache(str(tmp_path), max_bytes=30)
+    second = PDFCache(str(tmp_path), max_bytes=30)
+    first.put('a', b'a' * 10)
+    second.put('b', b'b' * 10)
+    _set_last_used(first, 'a', 1000)
+    _set_last_used(second, 'b', 2000)
+    
+    # first only knows a, c and d; going over the limit rescans and finds b too
+    first.put('c', b'c' * 10)
+    first.put('d', b'd' * 10)
+    assert len(os.listdir(tmp_path)) == 4
+    first.put('e', b'e' * 10)
+    
+    assert sorted(name[:-4] for name in os.listdir(tmp_path)) == ['c', 'd', 'e']
+    assert first.total_bytes == 30
+    assert second.get('a') is None and second.get('b') is None
+
+def test_get_and_copy_to_treat_removed_file_as_miss(tmp_path):
+    cache = PDFCache(str(tmp_path / "cache"), max_bytes=1000)
+    cache.put('a', b'%PDF-a')
+    cache.put('b', b'%PDF-b')
+    output_path = str(tmp_path / "out.pdf")
+    assert cache.copy_to('a', output_path)
+    with open(output_path, 'rb') as f:
+        assert f.read() == b'%PDF-a'
+    
+    # Another process evicts both
+    os.remove(os.path.join(cache.cache_dir, "a.pdf"))
+    os.remove(os.path.join(cache.cache_dir, "b.pdf"))
+    
+    assert not cache.copy_to('a', str(tmp_path / "missing.pdf"))
+    assert not os.path.exists(tmp_path / "missing.pdf")
+    assert cache.get('b') is None
+    assert cache.total_bytes == 0
+
+def test_generator_version_follows_the_decoded_logo(tmp_path, monkeypatch):
+    pytest.importorskip("reportlab")
+    image = pytest.importorskip("PIL.Image")
+    from pdf_generator import invoice_pdf
+    
+    logo_path = str(tmp_path / "logo.png")
+    image.new('RGB', (4, 2)).save(logo_path)
+    monkeypatch.setattr(invoice_pdf, 'DEFAULT_LOGO_PATH', logo_path)
+    generator = invoice_pdf.InvoicePDFGenerator()
+    version = generator.cache_version()
+    assert version != generator.version
+    
+    # Renders keep using the logo decoded at startup, whatever happens to the file
+    image.new('RGB', (8, 8)).save(logo_path)
+    assert generator.cache_version() == version
+    os.remove(logo_path)
+    assert generator.cache_version() == version
+    assert invoice_pdf.InvoicePDFGenerator().cache_version() == generator.version
@@ -0,0 +1,92 @@
+# File: test_search.py
+# Location: InvoiceGeneratorPro/tests/test_search.py
+
+from database.models import Client, Invoice, InvoiceItem
+from config import SEARCH_RESULT_LIMIT
+
+def _invoice_ids(db, term):
+    return [invoice.id for invoice in db.search(term)['invoices']]
+
+def _client_names(db, term):
+    return [client.name for client in db.search_clients(term)]
+
+def _check_indexes(db):
+    """Both FTS tables agree with the base tables"""
+    with db.get_connection() as conn:
+        conn.execute("INSERT INTO clients_fts (clients_fts) VALUES ('integrity-check')")
+        indexed = conn.execute("SELECT rowid, invoice_number, notes, items FROM invoices_fts ORDER BY rowid").fetchall()
+        stored = conn.execute("""
+            SELECT i.id, i.invoice_number, i.notes,
+                   (SELECT group_concat(description, ' ') FROM invoice_items WHERE invoice_id = i.id)
+            FROM invoices i ORDER BY i.id
+        """).fetchall()
+    assert [tuple(row) for row in indexed] == [tuple(row) for row in stored]
+
+def test_client_edits_and_deletes_reach_the_index(db):
+    client = db.save_client(Client(name="Acme Widgets", email="billing@acme.test", city="Springfield"))
+    assert _client_names(db, "widg") == ["Acme Widgets"]
+    assert _client_names(db, "springf") == ["Acme Widgets"]
+    
+    client.name = "Globex Gadgets"
+    client.city = "Shelbyville"
+    db.save_client(client)
+    assert _client_names(db, "widgets") == []
+    assert _client_names(db, "springfield") == []
+    assert _client_names(db, "gadg shelby") == ["Globex Gadgets"]
+    _check_indexes(db)
+    
+    db.delete_client(client.id)
+    assert _client_names(db, "globex") == []
+    _check_indexes(db)
+
+def test_item_changes_and_deletes_reach_the_index(db):
+    client = db.save_client(Client(name="Acme"))
+    invoice = db.save_invoice(Invoice(client_id=client.id, notes="quarterly", items=[
+        InvoiceItem(description="Zebra crossing", rate_cents=1000),
+    ]))
+    assert _invoice_ids(db, "zebra") == [invoice.id]
+    assert _invoice_ids(db, invoice.invoice_number) == [invoice.id]
+    
+    invoice.add_item(InvoiceItem(description="Yak shaving", rate_cents=500))
+    db.save_invoice(invoice)
+    assert _invoice_ids(db, "yak") == [invoice.id]
+    
+    invoice.items[0].description = "Pelican crossing"
+    invoice.notes = "annual"
+    db.save_invoice(invoice)
+    assert _invoice_ids(db, "zebra") == []
+    assert _invoice_ids(db, "quarterly") == []
+    assert _invoice_ids(db, "pelican annual") == [invoice.id]
+    _check_indexes(db)
+    
+    invoice.remove_item(1)
+    db.save_invoice(invoice)
+    assert _invoice_ids(db, "yak") == []
+    _check_indexes(db)
+    
+    db.delete_invoice(invoice.id)
+    assert _invoice_ids(db, "pelican") == []
+    _check_indexes(db)
+
+def test_search_clients_returns_every_match_unless_limited(db):
+    db.import_clients([{'name': f"Acme {n:03d}"} for n in range(SEARCH_RESULT_LIMIT + 5)])
+    
+    assert len(db.search_clients("acme")) == SEARCH_RESULT_LIMIT + 5
+    assert len(db.search_clients("acme", limit=3)) == 3
+    assert len(db.search("acme")['clients']) == SEARCH_RESULT_LIMIT
+    assert db.search_clients("!!!") == []
+
+def test_client_search_pages_cover_every_match_once(db):
+    count = SEARCH_RESULT_LIMIT + 5
+    db.import_clients([{'name': f"Acme {n:03d}"} for n in range(count)] + [{'name': "Globex"}])
+    
+    ids, after = [], None
+    while True:
+        page, after = db.search_clients_with_stats_page("acme", after, limit=20)
+        ids.extend(stats.client.id for stats in page)
+        if after is None:
+            break
+    
+    assert len(ids) == len(set(ids)) == count
+    assert sorted(ids) == sorted(client.id for client in db.search_clients("acme"))
+    assert db.search_clients_with_stats_page("!!!") == ([], None)
@@ -0,0 +1,90 @@
+# File: test_template_registry.py
+# Location: InvoiceGeneratorPro/tests/test_template_registry.py
+
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from pdf_generator import registry
+from pdf_generator.registry import ENTRY_POINT_GROUP, FALLBACK_TEMPLATE, TemplateRegistry
+
+class FancyTemplate:
+    """Stands in for a template shipped by another package"""
+    instances = 0
+    
+    def __init__(self):
+        FancyTemplate.instances += 1
+        self.description = "Fancy"
+
+def _counting_factory(name, built):
+    def factory():
+        built.append(name)
+        return f"{name} template"
+    return factory
+
+@pytest.fixture
+def plugins(monkeypatch):
+    """Entry points as installed packages would declare them"""
+    FancyTemplate.instances = 0
+    installed = [
+        EntryPoint('fancy', f'{__name__}:FancyTemplate', ENTRY_POINT_GROUP),
+        EntryPoint('broken', 'no_such_template_package:Template', ENTRY_POINT_GROUP),
+    ]
+    looked_up = []
+    
+    def entry_points(group):
+        looked_up.append(group)
+        return [entry_point for entry_point in installed if entry_point.group == group]
+    monkeypatch.setattr(registry, 'entry_points', entry_points)
+    return looked_up
+
+def test_templates_are_built_once_on_first_use(plugins):
+    built = []
+    templates = TemplateRegistry({name: _counting_factory(name, built) for name in ('modern', 'classic')})
+    
+    assert templates.names() == ['modern', 'classic', 'fancy', 'broken']
+    assert built == [] and FancyTemplate.instances == 0
+    
+    assert templates.get('classic') == "classic template"
+    assert templates.get('classic') == "classic template"
+    assert built == ['classic']
+    
+    fancy = templates.get('fancy')
+    assert isinstance(fancy, FancyTemplate)
+    assert templates.get('fancy') is fancy and FancyTemplate.instances == 1
+    assert plugins == [ENTRY_POINT_GROUP]
+
+def test_unknown_and_broken_templates_fall_back(plugins):
+    built = []
+    templates = TemplateRegistry({FALLBACK_TEMPLATE: _counting_factory(FALLBACK_TEMPLATE, built)})
+    
+    assert templates.get('no-such-template') == f"{FALLBACK_TEMPLATE} template"
+    assert templates.get('broken') == f"{FALLBACK_TEMPLATE} template"
+    assert 'broken' not in templates
+    assert isinstance(templates.get('fancy'), FancyTemplate)
+    assert built == [FALLBACK_TEMPLATE]
+
+def test_registered_templates_win_over_entry_points(plugins):
+    templates = TemplateRegistry({})
+    templates.register('fancy', lambda: "registered")
+    assert templates.get('fancy') == "registered"
+    assert FancyTemplate.instances == 0
+    
+    # Registering again replaces the built instance
+    templates.register('fancy', lambda: "replaced")
+    assert templates.get('fancy') == "replaced"
+
+def test_get_template_uses_the_shared_registry(plugins, monkeypatch):
+    pytest.importorskip("reportlab")
+    from pdf_generator import templates
+    
+    monkeypatch.setattr(templates, 'template_registry', TemplateRegistry())
+    available = templates.get_available_templates()
+    assert list(available) == ['modern', 'classic', 'minimal', 'fancy']
+    assert available['fancy'] == "Fancy"
+    
+    modern = templates.get_template('modern')
+    assert type(modern).__name__ == 'ModernTemplate'
+    assert templates.get_template('no-such-template') is modern
+    assert templates.get_template('broken') is modern
+    assert isinstance(templates.get_template('fancy'), FancyTemplate)
@@ -2,26 +2,82 @@
 # Location: InvoiceGeneratorPro/utils/calculations.py
 
 import re
-from decimal import Decimal, ROUND_HALF_UP
-from typing import Union, List, Optional
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Union, List, Optional, Sequence
 from datetime import datetime, timedelta
 
 from config import CURRENCY_SYMBOLS, DEFAULT_TAX_RATES, MIN_AMOUNT, MAX_AMOUNT
 
+# Money is held as integer cents. Quantities and tax rates are scaled to integers
+# before multiplying, so line and tax rounding is exact integer arithmetic.
+QUANTITY_SCALE = 10000  # Quantities keep 4 decimal places
+TAX_RATE_SCALE = 10000  # Tax rates keep 4 decimal places (0.01%)
+
+def to_cents(amount: Union[int, float, str, Decimal]) -> int:
+    """Convert a money amount to integer cents, rounding half-up"""
+    if isinstance(amount, int):
+        return amount * 100
+    
+    try:
+        if isinstance(amount, float):
+            scaled = amount * 100
+            cents = round(scaled)
+            # Only values sitting on a half cent need exact decimal rounding
+            if abs(abs(scaled - cents) - 0.5) > 1e-6:
+                return int(cents)
+        
+        cents_decimal = Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP) * 100
+        return int(cents_decimal)
+    except (InvalidOperation, ValueError, TypeError):
+        return 0
+
+def from_cents(cents: int) -> float:
+    """Convert integer cents to a float amount for display"""
+    return cents / 100
+
+def _divide_half_up(numerator: int, denominator: int) -> int:
+    """Integer division rounding halves away from zero (ROUND_HALF_UP)"""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+# Largest intermediate product the NumPy batch path trusts to int64
+_INT64_SAFE_LIMIT = 2 ** 62
+
+_numpy_module = None
+
+def _load_numpy():
+    """Import NumPy on first use; returns None when it is not installed"""
+    global _numpy_module
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+    return _numpy_module or None
+
 class CalculationEngine:
     """Handles all financial calculations for invoices"""
     
+    @staticmethod
+    def calculate_line_total_cents(quantity: float, rate_cents: int) -> int:
+        """Calculate a line item total in cents"""
+        quantity_units = round(quantity * QUANTITY_SCALE)
+        return _divide_half_up(quantity_units * rate_cents, QUANTITY_SCALE)
+    
+    @staticmethod
+    def calculate_tax_amount_cents(subtotal_cents: int, tax_rate: float) -> int:
+        """Calculate tax in cents from a subtotal in cents and a decimal tax rate"""
+        rate_units = round(tax_rate * TAX_RATE_SCALE)
+        return _divide_half_up(subtotal_cents * rate_units, TAX_RATE_SCALE)
+    
     @staticmethod
     def calculate_line_total(quantity: float, rate: float) -> float:
         """Calculate total for a single line item"""
         try:
-            # Use Decimal for precise financial calculations
-            qty_decimal = Decimal(str(quantity))
-            rate_decimal = Decimal(str(rate))
-            total = qty_decimal * rate_decimal
-            
-            # Round to 2 decimal places
-            return float(total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            return from_cents(CalculationEngine.calculate_line_total_cents(quantity, to_cents(rate)))
         except (ValueError, TypeError):
             return 0.0
     
@@ -29,11 +85,7 @@ class CalculationEngine:
     def calculate_subtotal(line_totals: List[float]) -> float:
         """Calculate subtotal from list of line item totals"""
         try:
-            subtotal = Decimal('0.00')
-            for total in line_totals:
-                subtotal += Decimal(str(total))
-            
-            return float(subtotal.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            return from_cents(sum(to_cents(total) for total in line_totals))
         except (ValueError, TypeError):
             return 0.0
     
@@ -41,11 +93,7 @@ class CalculationEngine:
     def calculate_tax_amount(subtotal: float, tax_rate: float) -> float:
         """Calculate tax amount from subtotal and tax rate"""
         try:
-            subtotal_decimal = Decimal(str(subtotal))
-            tax_rate_decimal = Decimal(str(tax_rate))
-            tax_amount = subtotal_decimal * tax_rate_decimal
-            
-            return float(tax_amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            return from_cents(CalculationEngine.calculate_tax_amount_cents(to_cents(subtotal), tax_rate))
         except (ValueError, TypeError):
             return 0.0
     
@@ -53,31 +101,140 @@ class CalculationEngine:
     def calculate_total(subtotal: float, tax_amount: float) -> float:
         """Calculate final total"""
         try:
-            subtotal_decimal = Decimal(str(subtotal))
-            tax_decimal = Decimal(str(tax_amount))
-            total = subtotal_decimal + tax_decimal
-            
-            return float(total.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            return from_cents(to_cents(subtotal) + to_cents(tax_amount))
         except (ValueError, TypeError):
             return 0.0
     
     @staticmethod
-    def calculate_invoice_totals(items: List[dict]) -> dict:
-        """Calculate all totals for an invoice given list of items"""
-        line_totals = []
+    def calculate_invoice_totals(items: List[dict], tax_rate: float = 0.0) -> dict:
+        """Calculate all totals for an invoice given list of items
+        
+        Items carry 'quantity' and either 'rate_cents' or a decimal 'rate'. Amounts
+        are returned both in cents and as floats.
+        """
+        line_totals_cents = []
         
         for item in items:
             quantity = item.get('quantity', 0)
-            rate = item.get('rate', 0)
-            line_total = CalculationEngine.calculate_line_total(quantity, rate)
-            line_totals.append(line_total)
+            rate_cents = item['rate_cents'] if 'rate_cents' in item else to_cents(item.get('rate', 0))
+            line_totals_cents.append(CalculationEngine.calculate_line_total_cents(quantity, rate_cents))
         
-        subtotal = CalculationEngine.calculate_subtotal(line_totals)
+        subtotal_cents = sum(line_totals_cents)
+        tax_amount_cents = CalculationEngine.calculate_tax_amount_cents(subtotal_cents, tax_rate)
+        total_cents = subtotal_cents + tax_amount_cents
         
         return {
-            'line_totals': line_totals,
-            'subtotal': subtotal
+            'line_totals': [from_cents(cents) for cents in line_totals_cents],
+            'subtotal': from_cents(subtotal_cents),
+            'tax_amount': from_cents(tax_amount_cents),
+            'total': from_cents(total_cents),
+            'line_totals_cents': line_totals_cents,
+            'subtotal_cents': subtotal_cents,
+            'tax_amount_cents': tax_amount_cents,
+            'total_cents': total_cents
         }
+    
+    @staticmethod
+    def calculate_batch_totals(quantities: Sequence[float], rates_cents: Sequence[int],
+                               offsets: Sequence[int], tax_rates: Union[float, Sequence[float]] = 0.0,
+                               use_numpy: Optional[bool] = None) -> dict:
+        """Calculate totals for many invoices in one pass
+        
+        Line items are given column-wise: quantities[i] and rates_cents[i] describe
+        item i, and the items of invoice n are offsets[n]:offsets[n + 1]. tax_rates
+        is one rate per invoice or a single rate for all of them. Results are lists
+        of cents matching calculate_invoice_totals() exactly. NumPy is used when
+        available unless use_numpy is False.
+        """
+        invoice_count = len(offsets) - 1
+        if invoice_count < 0:
+            raise ValueError("offsets must contain at least one entry")
+        if len(quantities) != len(rates_cents) or offsets[-1] != len(quantities):
+            raise ValueError("quantities, rates_cents and offsets do not line up")
+        
+        if isinstance(tax_rates, (int, float)):
+            tax_rates = [tax_rates] * invoice_count
+        elif len(tax_rates) != invoice_count:
+            raise ValueError("tax_rates must have one entry per invoice")
+        
+        np = _load_numpy() if use_numpy is not False else None
+        if use_numpy and np is None:
+            raise ImportError("NumPy is required for use_numpy=True")
+        
+        if np is not None:
+            totals = CalculationEngine._batch_totals_numpy(np, quantities, rates_cents, offsets, tax_rates)
+            if totals is not None:
+                return totals
+        return CalculationEngine._batch_totals_python(quantities, rates_cents, offsets, tax_rates)
+    
+    @staticmethod
+    def _batch_totals_python(quantities, rates_cents, offsets, tax_rates) -> dict:
+        """Pure-Python batch path using the same integer rounding as the scalar API"""
+        line_totals_cents = [
+            _divide_half_up(round(quantity * QUANTITY_SCALE) * rate_cents, QUANTITY_SCALE)
+            for quantity, rate_cents in zip(quantities, rates_cents)
+        ]
+        
+        subtotals_cents = []
+        tax_amounts_cents = []
+        totals_cents = []
+        for n, tax_rate in enumerate(tax_rates):
+            subtotal_cents = sum(line_totals_cents[offsets[n]:offsets[n + 1]])
+            tax_amount_cents = _divide_half_up(subtotal_cents * round(tax_rate * TAX_RATE_SCALE),
+                                               TAX_RATE_SCALE)
+            subtotals_cents.append(subtotal_cents)
+            tax_amounts_cents.append(tax_amount_cents)
+            totals_cents.append(subtotal_cents + tax_amount_cents)
+        
+        return {
+            'line_totals_cents': line_totals_cents,
+            'subtotal_cents': subtotals_cents,
+            'tax_amount_cents': tax_amounts_cents,
+            'total_cents': totals_cents
+        }
+    
+    @staticmethod
+    def _batch_totals_numpy(np, quantities, rates_cents, offsets, tax_rates) -> Optional[dict]:
+        """NumPy batch path; returns None if the amounts could overflow int64"""
+        # np.rint rounds half to even on the same float product as round() does
+        quantity_units = np.rint(np.asarray(quantities, dtype=np.float64) * QUANTITY_SCALE).astype(np.int64)
+        rates = np.asarray(rates_cents, dtype=np.int64)
+        rate_units = np.rint(np.asarray(tax_rates, dtype=np.float64) * TAX_RATE_SCALE).astype(np.int64)
+        bounds = np.asarray(offsets, dtype=np.int64)
+        
+        # Estimate magnitudes in floating point; huge inputs go to exact Python ints
+        line_magnitudes = np.abs(quantity_units * rates.astype(np.float64))
+        running_magnitudes = np.zeros(len(line_magnitudes) + 1, dtype=np.float64)
+        np.cumsum(line_magnitudes / QUANTITY_SCALE, out=running_magnitudes[1:])
+        subtotal_magnitudes = running_magnitudes[bounds[1:]] - running_magnitudes[bounds[:-1]]
+        tax_magnitudes = subtotal_magnitudes * np.abs(rate_units)
+        if (running_magnitudes[-1] >= _INT64_SAFE_LIMIT
+                or (len(line_magnitudes) and line_magnitudes.max() >= _INT64_SAFE_LIMIT)
+                or (len(tax_magnitudes) and tax_magnitudes.max() >= _INT64_SAFE_LIMIT)):
+            return None
+        
+        line_totals = CalculationEngine._divide_half_up_array(np, quantity_units * rates, QUANTITY_SCALE)
+        
+        # Subtotals are differences of a running sum, which also handles empty invoices
+        running = np.zeros(len(line_totals) + 1, dtype=np.int64)
+        np.cumsum(line_totals, out=running[1:])
+        subtotals = running[bounds[1:]] - running[bounds[:-1]]
+        
+        tax_amounts = CalculationEngine._divide_half_up_array(np, subtotals * rate_units, TAX_RATE_SCALE)
+        
+        return {
+            'line_totals_cents': line_totals.tolist(),
+            'subtotal_cents': subtotals.tolist(),
+            'tax_amount_cents': tax_amounts.tolist(),
+            'total_cents': (subtotals + tax_amounts).tolist()
+        }
+    
+    @staticmethod
+    def _divide_half_up_array(np, numerators, denominator: int):
+        """Vectorized _divide_half_up() over an int64 array"""
+        quotients, remainders = np.divmod(np.abs(numerators), denominator)
+        quotients += remainders * 2 >= denominator
+        return np.where(numerators < 0, -quotients, quotients)
 
 class CurrencyFormatter:
     """Handles currency formatting and display"""
@@ -307,14 +464,4 @@ def validate_money(amount: Union[str, float]) -> bool:
 
 def calculate_invoice_total(items: List[dict], tax_rate: float = 0.0) -> dict:
     """Quick invoice total calculation"""
-    totals = CalculationEngine.calculate_invoice_totals(items)
-    subtotal = totals['subtotal']
-    tax_amount = CalculationEngine.calculate_tax_amount(subtotal, tax_rate)
-    total = CalculationEngine.calculate_total(subtotal, tax_amount)
-    
-    return {
-        'subtotal': subtotal,
-        'tax_amount': tax_amount,
-        'total': total,
-        'line_totals': totals['line_totals']
-    }
\ No newline at end of file
+    return CalculationEngine.calculate_invoice_totals(items, tax_rate)
\ No newline at end of file
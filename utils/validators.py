@@ -2,7 +2,6 @@
 # Location: InvoiceGeneratorPro/utils/validators.py
 
 import re
-from email_validator import validate_email, EmailNotValidError
 
 from config import (
     MAX_CLIENT_NAME_LENGTH, 
@@ -48,6 +47,9 @@ class InputValidator:
                 return False, "Email address is required"
             return True, ""  # Optional field, empty is OK
         
+        # Imported here: email-validator is slow to import and only needed once a form checks an email
+        from email_validator import validate_email, EmailNotValidError
+        
         try:
             # Use email-validator library for robust validation
             validate_email(email.strip())